@@ -0,0 +1,251 @@
+"""
+Control de admisión y descarte de carga para la API.
+
+Cada solicitud a /api/ se clasifica como escritura, lectura económica
+(catálogos, detalle) o costosa (lista completa, estadísticas, cambios,
+archivo y escrituras en bloque). Cada clase tiene su propio presupuesto:
+
+- Un token bucket por cliente y clase limita la tasa (429 con Retry-After).
+- Un máximo de solicitudes en curso por clase evita que las consultas
+  costosas ocupen todos los hilos (503 con Retry-After).
+- Con el proceso saturado se descarta primero lo costoso: cada clase solo
+  se admite mientras el total en curso no supere su umbral de saturación,
+  de modo que la creación de pedidos conserva capacidad reservada.
+
+El estado es por proceso, como el resto de cachés en memoria de la API.
+Detrás de un proxy, el cliente anónimo se identifica por la cabecera
+ADMISION_CABECERA_IP en lugar de REMOTE_ADDR (la del proxy).
+"""
+
+import math
+import time
+from threading import Lock
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+
+from api_patrones.logger import Logger
+
+ESCRITURA = "escritura"
+ECONOMICA = "economica"
+COSTOSA = "costosa"
+
+CLASES_POR_DEFECTO = {
+    ESCRITURA: {"tasa": 20, "rafaga": 40, "concurrencia": 32, "umbral_saturacion": 1.0},
+    ECONOMICA: {"tasa": 50, "rafaga": 100, "concurrencia": 32, "umbral_saturacion": 0.9},
+    COSTOSA: {"tasa": 2, "rafaga": 10, "concurrencia": 4, "umbral_saturacion": 0.6},
+}
+
+ENDPOINTS_COSTOSOS_POR_DEFECTO = {
+    "pedidos-list", "pedidos-estadisticas", "pedidos-estadisticas-serie", "pedidos-cambios",
+    "pedidos-cola-preparacion", "pedidos-archivo", "pedidos-logs-sistema", "pedidos-trazas",
+}
+
+# Escrituras que recorren muchas filas y compiten con las lecturas costosas
+ESCRITURAS_COSTOSAS_POR_DEFECTO = {"pedidos-lote"}
+
+METODOS_LECTURA = {"GET", "HEAD", "OPTIONS"}
+
+# Buckets a partir de los cuales se descartan los de clientes inactivos
+MAXIMO_BUCKETS = 10000
+
+
+class TokenBucket:
+    """Cubeta de fichas que se rellena a `tasa` fichas por segundo hasta `rafaga`"""
+
+    __slots__ = ("tasa", "rafaga", "fichas", "actualizado")
+
+    def __init__(self, tasa, rafaga, ahora):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.fichas = float(rafaga)
+        self.actualizado = ahora
+
+    def tomar(self, ahora):
+        """
+        Consume una ficha si hay disponible.
+
+        Returns:
+            float: 0 si se admitió, o segundos hasta la próxima ficha
+        """
+        self.fichas = min(self.rafaga, self.fichas + (ahora - self.actualizado) * self.tasa)
+        self.actualizado = ahora
+        if self.fichas >= 1:
+            self.fichas -= 1
+            return 0.0
+        return (1 - self.fichas) / self.tasa
+
+    def llena(self, ahora):
+        """Indica si la cubeta ya se habría rellenado por completo"""
+        return self.fichas + (ahora - self.actualizado) * self.tasa >= self.rafaga
+
+
+class ControlAdmision:
+    """
+    Patrón Singleton con los buckets por cliente y los contadores de
+    solicitudes en curso por clase del proceso actual.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(ControlAdmision, cls).__new__(cls)
+                    instancia.configurar()
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def configurar(self):
+        """Lee la configuración de settings y reinicia el estado"""
+        clases = getattr(settings, "ADMISION_CLASES", {})
+        self.clases = {nombre: dict(base, **clases.get(nombre, {})) for nombre, base in CLASES_POR_DEFECTO.items()}
+        self.costosos = set(getattr(settings, "ADMISION_ENDPOINTS_COSTOSOS", ENDPOINTS_COSTOSOS_POR_DEFECTO))
+        self.escrituras_costosas = set(getattr(
+            settings, "ADMISION_ESCRITURAS_COSTOSAS", ESCRITURAS_COSTOSAS_POR_DEFECTO
+        ))
+        self.concurrencia_total = getattr(settings, "ADMISION_CONCURRENCIA_TOTAL", 64)
+        self.reintento = getattr(settings, "ADMISION_REINTENTO_SEGUNDOS", 1)
+        self._lock_estado = Lock()
+        self._buckets = {}
+        self.en_curso = dict.fromkeys(self.clases, 0)
+        self.admitidas = dict.fromkeys(self.clases, 0)
+        self.limitadas = dict.fromkeys(self.clases, 0)
+        self.descartadas = dict.fromkeys(self.clases, 0)
+
+    def clasificar(self, request):
+        """
+        Retorna la clase de la solicitud o None si no está sujeta a control.
+
+        Args:
+            request (HttpRequest): Solicitud entrante
+        """
+        if not request.path_info.startswith("/api/"):
+            return None
+        try:
+            nombre = resolve(request.path_info).url_name
+        except Resolver404:
+            return None if request.method in METODOS_LECTURA else ESCRITURA
+        if request.method not in METODOS_LECTURA:
+            return COSTOSA if nombre in self.escrituras_costosas else ESCRITURA
+        return COSTOSA if nombre in self.costosos else ECONOMICA
+
+    def admitir(self, clase, cliente):
+        """
+        Decide si se admite una solicitud y, en ese caso, la cuenta como en curso.
+
+        Args:
+            clase (str): Clase de la solicitud
+            cliente (str): Identificador del cliente
+
+        Returns:
+            tuple: (status, segundos de Retry-After); status es None si se
+                admitió, 429 si el cliente superó su tasa o 503 si no hay capacidad
+        """
+        config = self.clases[clase]
+        ahora = time.monotonic()
+        with self._lock_estado:
+            total = sum(self.en_curso.values())
+            if (self.en_curso[clase] >= config["concurrencia"]
+                    or total >= self.concurrencia_total * config["umbral_saturacion"]):
+                self.descartadas[clase] += 1
+                return 503, self.reintento
+
+            clave = (clase, cliente)
+            bucket = self._buckets.get(clave)
+            if bucket is None:
+                if len(self._buckets) >= MAXIMO_BUCKETS:
+                    self._purgar_buckets(ahora)
+                bucket = self._buckets[clave] = TokenBucket(config["tasa"], config["rafaga"], ahora)
+            espera = bucket.tomar(ahora)
+            if espera:
+                self.limitadas[clase] += 1
+                return 429, max(1, math.ceil(espera))
+
+            self.en_curso[clase] += 1
+            self.admitidas[clase] += 1
+        return None, 0
+
+    def liberar(self, clase):
+        """Descuenta una solicitud admitida que terminó"""
+        with self._lock_estado:
+            self.en_curso[clase] -= 1
+
+    def _purgar_buckets(self, ahora):
+        # Un bucket lleno equivale a uno nuevo: se puede descartar sin efecto
+        self._buckets = {clave: bucket for clave, bucket in self._buckets.items() if not bucket.llena(ahora)}
+
+    def estadisticas(self):
+        """Retorna los contadores por clase"""
+        return {
+            clase: {
+                "en_curso": self.en_curso[clase],
+                "admitidas": self.admitidas[clase],
+                "limitadas": self.limitadas[clase],
+                "descartadas": self.descartadas[clase],
+                **self.clases[clase],
+            }
+            for clase in self.clases
+        }
+
+
+class ControlAdmisionMiddleware:
+    """
+    Aplica el control de admisión antes de llegar a la vista.
+    Responde 429 cuando el cliente supera la tasa de su clase y 503 cuando la
+    clase o el proceso están saturados, ambos con Retry-After.
+    """
+
+    MENSAJES = {
+        429: "Demasiadas solicitudes de este tipo; reintente más tarde",
+        503: "Servicio saturado; reintente más tarde",
+    }
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "ADMISION_HABILITADA", False):
+            return self.get_response(request)
+
+        control = ControlAdmision()
+        clase = control.clasificar(request)
+        if clase is None:
+            return self.get_response(request)
+
+        status, reintento = control.admitir(clase, self._clave_cliente(request))
+        if status is not None:
+            Logger().registrar(f"Admisión: {status} para solicitud {clase} {request.method} {request.path}")
+            response = JsonResponse({"error": self.MENSAJES[status], "clase": clase}, status=status)
+            response["Retry-After"] = str(reintento)
+            return response
+
+        try:
+            return self.get_response(request)
+        finally:
+            control.liberar(clase)
+
+    @staticmethod
+    def _clave_cliente(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"usuario:{user.pk}"
+        return f"ip:{ControlAdmisionMiddleware._ip_cliente(request)}"
+
+    @staticmethod
+    def _ip_cliente(request):
+        """
+        Retorna la IP del cliente. Con ADMISION_CABECERA_IP (p. ej. "X-Forwarded-For")
+        se toma de esa cabecera la dirección que agregó el primero de los
+        ADMISION_PROXIES_CONFIABLES proxies, contando desde la derecha: las
+        anteriores las escribe el cliente y no son confiables.
+        """
+        cabecera = getattr(settings, "ADMISION_CABECERA_IP", None)
+        valor = request.headers.get(cabecera, "") if cabecera else ""
+        direcciones = [direccion.strip() for direccion in valor.split(",") if direccion.strip()]
+        if not direcciones:
+            return request.META.get("REMOTE_ADDR", "")
+        proxies = max(1, getattr(settings, "ADMISION_PROXIES_CONFIABLES", 1))
+        return direcciones[-min(proxies, len(direcciones))]
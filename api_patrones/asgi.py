@@ -13,4 +13,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_patrones.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Se importa después de inicializar Django
+from django.urls import reverse  # noqa: E402
+from pedidos_cafe.sse import FlujoEventosPedidos  # noqa: E402
+
+# Importa las vistas y compila las rutas al arrancar el worker y no en su
+# primera solicitud (los catálogos se precalientan en PedidosCafeConfig.ready())
+reverse('pedidos-list')
+
+flujo_eventos = FlujoEventosPedidos()
+
+
+async def application(scope, receive, send):
+    """Envía el flujo Server-Sent Events de pedidos a su aplicación y el resto a Django"""
+    if scope["type"] == "http" and scope["path"] == FlujoEventosPedidos.RUTA:
+        return await flujo_eventos(scope, receive, send)
+    return await django_application(scope, receive, send)
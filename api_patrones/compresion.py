@@ -0,0 +1,71 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+# Solo se comprimen las respuestas JSON de la API. Las páginas HTML (admin,
+# API navegable) llevan tokens CSRF y reflejan texto del usuario: comprimirlas
+# de forma determinista las expondría a BREACH.
+TIPOS_COMPRIMIBLES = ("application/json",)
+
+_ACEPTA_GZIP = re.compile(r"(?:^|,)\s*gzip\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*(?:,|$)", re.IGNORECASE)
+
+
+def acepta_gzip(cabecera):
+    """
+    Indica si la cabecera Accept-Encoding admite gzip (respetando q=0).
+
+    Args:
+        cabecera (str): Valor de Accept-Encoding
+
+    Returns:
+        bool: True si el cliente acepta gzip
+    """
+    coincidencia = _ACEPTA_GZIP.search(cabecera or "")
+    if coincidencia is None:
+        return False
+    calidad = coincidencia.group(1)
+    try:
+        return calidad is None or float(calidad) > 0
+    except ValueError:
+        return False
+
+
+class CompresionGzipMiddleware:
+    """
+    Comprime con gzip las respuestas JSON cuando el cliente lo
+    acepta y el cuerpo supera GZIP_MINIMO_BYTES. El nivel (GZIP_NIVEL, 1-9)
+    equilibra CPU y bytes enviados. Las respuestas en streaming, las ya
+    codificadas y las que no se reducen se envían sin cambios.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(TIPOS_COMPRIMIBLES):
+            return response
+        if len(response.content) < getattr(settings, "GZIP_MINIMO_BYTES", 1024):
+            return response
+
+        # A partir de aquí la respuesta depende de Accept-Encoding
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not acepta_gzip(request.META.get("HTTP_ACCEPT_ENCODING")):
+            return response
+
+        comprimido = gzip.compress(response.content, compresslevel=getattr(settings, "GZIP_NIVEL", 6), mtime=0)
+        if len(comprimido) >= len(response.content):
+            return response
+
+        response.content = comprimido
+        response["Content-Length"] = str(len(comprimido))
+        response["Content-Encoding"] = "gzip"
+        # El cuerpo transmitido cambia: un ETag fuerte pasa a ser débil (RFC 9110)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,80 @@
+"""
+Renderizado JSON de las respuestas de la API.
+
+Usa orjson (fijado en requirements.txt; varias veces más rápido que el
+codificador de la biblioteca estándar). Si no está instalado recurre al
+JSONRenderer de DRF, sin la mejora. Las respuestas
+constantes (catálogos) pueden entregarse como FragmentoJSON: se codifican
+una sola vez y el renderizador escribe los bytes guardados directamente.
+"""
+
+import json
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+if orjson is not None:
+    # Fechas con "Z" como DRF y claves no textuales convertidas a texto
+    OPCIONES_ORJSON = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def codificar_json(datos):
+    """
+    Codifica datos como JSON compacto en UTF-8, con el mismo tratamiento de
+    tipos que DRF (fechas, decimales, cadenas diferidas).
+
+    Args:
+        datos: Estructura a codificar
+
+    Returns:
+        bytes: JSON codificado
+    """
+    codificador = encoders.JSONEncoder()
+    if orjson is not None:
+        return orjson.dumps(datos, default=codificador.default, option=OPCIONES_ORJSON)
+    return json.dumps(
+        datos, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FragmentoJSON:
+    """
+    Datos constantes junto con su codificación JSON precalculada.
+    Se pasan como Response(FragmentoJSON(...)); el API navegable sigue
+    recibiendo los datos originales para mostrarlos con sangría.
+    """
+
+    __slots__ = ("datos", "contenido")
+
+    def __init__(self, datos):
+        """
+        Args:
+            datos: Estructura a codificar una sola vez
+        """
+        self.datos = datos
+        self.contenido = codificar_json(datos)
+
+
+class RenderizadorJSONRapido(renderers.JSONRenderer):
+    """
+    JSONRenderer que codifica con orjson cuando está disponible y escribe
+    directamente los fragmentos precodificados. Si se pide sangría (API
+    navegable o ?indent) delega en el renderizador de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        sangria = self.get_indent(accepted_media_type, renderer_context or {})
+        if isinstance(data, FragmentoJSON):
+            if sangria is None:
+                return data.contenido
+            data = data.datos
+        if data is None:
+            return b""
+        if sangria is None:
+            return codificar_json(data)
+        return super().render(data, accepted_media_type, renderer_context)
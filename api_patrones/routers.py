@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+
+# Indica si las lecturas del contexto actual pueden servirse desde la réplica
+_lecturas_en_replica = ContextVar("lecturas_en_replica", default=False)
+
+# Indica si el cliente actual escribió recientemente y debe leer de la primaria
+_forzar_primaria = ContextVar("forzar_primaria", default=False)
+
+
+def alias_replica():
+    """Retorna el alias de la réplica configurada o None si no existe"""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def lecturas_en_replica():
+    """
+    Marca las consultas de lectura del bloque como aptas para la réplica.
+    Se usa en acciones de solo lectura y consultas de reportes.
+    """
+    token = _lecturas_en_replica.set(True)
+    try:
+        yield
+    finally:
+        _lecturas_en_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Router de base de datos que envía las lecturas marcadas a la réplica.
+    Las escrituras y las lecturas no marcadas siempre van a la base primaria.
+    """
+    # Modelos que se leen siempre de la primaria, donde se escriben: una
+    # réplica atrasada serviría cubetas de la serie ya invalidadas
+    MODELOS_PRIMARIA = {'pedidos_cafe.cubetaserie'}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in self.MODELOS_PRIMARIA:
+            return None
+        if _lecturas_en_replica.get() and not _forzar_primaria.get():
+            return alias_replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica es una copia de la primaria, los objetos pueden relacionarse
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema al sincronizarse desde la primaria
+        if db == alias_replica():
+            return False
+        return None
+
+
+class LecturaPropiaMiddleware:
+    """
+    Garantiza lectura de las propias escrituras (read-your-writes).
+    Tras una escritura exitosa, las lecturas del mismo cliente se sirven desde
+    la primaria durante REPLICA_LECTURA_PROPIA_SEGUNDOS.
+
+    La marca viaja con el cliente y no cuesta lecturas ni escrituras en el
+    servidor: es un valor firmado con fecha que se envía en la cookie
+    "lectura_propia" y en la cabecera X-Lectura-Propia (los clientes sin
+    cookies pueden reenviarla en esa misma cabecera). Cualquier worker la
+    verifica con SECRET_KEY.
+    """
+    METODOS_ESCRITURA = {'POST', 'PUT', 'PATCH', 'DELETE'}
+    COOKIE = 'lectura_propia'
+    CABECERA = 'X-Lectura-Propia'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.firmador = signing.TimestampSigner(salt='api_patrones.routers.LecturaPropiaMiddleware')
+
+    def __call__(self, request):
+        if alias_replica() is None:
+            return self.get_response(request)
+
+        segundos = getattr(settings, 'REPLICA_LECTURA_PROPIA_SEGUNDOS', 5)
+        token = _forzar_primaria.set(self._escribio_hace_poco(request, segundos))
+        try:
+            response = self.get_response(request)
+        finally:
+            _forzar_primaria.reset(token)
+
+        if request.method in self.METODOS_ESCRITURA and response.status_code < 400:
+            marca = self.firmador.sign('1')
+            response.set_cookie(
+                self.COOKIE, marca, max_age=segundos, httponly=True, samesite='Lax', secure=request.is_secure()
+            )
+            response[self.CABECERA] = marca
+        return response
+
+    def _escribio_hace_poco(self, request, segundos):
+        """Indica si la solicitud trae una marca de escritura válida y vigente"""
+        marca = request.COOKIES.get(self.COOKIE) or request.headers.get(self.CABECERA)
+        if not marca:
+            return False
+        try:
+            self.firmador.unsign(marca, max_age=segundos)
+        except signing.BadSignature:
+            return False
+        return True
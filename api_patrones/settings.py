@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,16 +45,33 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_patrones.compresion.CompresionGzipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api_patrones.admision.ControlAdmisionMiddleware',
+    'api_patrones.routers.LecturaPropiaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'api_patrones.urls'
 
+# Respuestas de la API: JSON con orjson si está instalado (api_patrones/renderers.py)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api_patrones.renderers.RenderizadorJSONRapido',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Compresión gzip negociada con Accept-Encoding (api_patrones/compresion.py):
+# nivel 1-9 (más alto: menos bytes, más CPU) y tamaño mínimo del cuerpo
+GZIP_NIVEL = 6
+
+GZIP_MINIMO_BYTES = 1024
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -82,6 +100,59 @@ DATABASES = {
     }
 }
 
+# Réplica de lectura para reportes y acciones de solo lectura.
+# Se activa con API_PATRONES_REPLICA=1 y se sincroniza con
+# `python manage.py sincronizar_replica`.
+
+DATABASE_REPLICA_ALIAS = 'replica'
+
+if os.environ.get('API_PATRONES_REPLICA'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api_patrones.routers.ReplicaRouter']
+
+# Segundos durante los que un cliente lee de la primaria tras escribir
+REPLICA_LECTURA_PROPIA_SEGUNDOS = 5
+
+
+# Control de admisión (api_patrones/admision.py): límites por cliente (tasa
+# en solicitudes/s y ráfaga) y solicitudes en curso por proceso para cada clase.
+# Una clase se descarta con 503 cuando el total en curso supera
+# umbral_saturacion * ADMISION_CONCURRENCIA_TOTAL; las escrituras usan 1.0
+# para conservar capacidad para crear pedidos. Se habilita en producción.
+
+ADMISION_HABILITADA = False
+
+ADMISION_CONCURRENCIA_TOTAL = 64
+
+ADMISION_CLASES = {
+    'escritura': {'tasa': 20, 'rafaga': 40, 'concurrencia': 32, 'umbral_saturacion': 1.0},
+    'economica': {'tasa': 50, 'rafaga': 100, 'concurrencia': 32, 'umbral_saturacion': 0.9},
+    'costosa': {'tasa': 2, 'rafaga': 10, 'concurrencia': 4, 'umbral_saturacion': 0.6},
+}
+
+# Lecturas costosas por nombre de URL del router; las demás lecturas son económicas
+ADMISION_ENDPOINTS_COSTOSOS = [
+    'pedidos-list', 'pedidos-estadisticas', 'pedidos-estadisticas-serie', 'pedidos-cambios',
+    'pedidos-cola-preparacion', 'pedidos-archivo', 'pedidos-logs-sistema', 'pedidos-trazas',
+]
+
+# Escrituras que cuentan como costosas (recorren muchas filas)
+ADMISION_ESCRITURAS_COSTOSAS = ['pedidos-lote']
+
+ADMISION_REINTENTO_SEGUNDOS = 1
+
+# Detrás de un proxy inverso: cabecera con la IP del cliente (p. ej.
+# 'X-Forwarded-For') y número de proxies confiables que la completan. Sin
+# cabecera se usa REMOTE_ADDR. Los usuarios autenticados se identifican por id.
+ADMISION_CABECERA_IP = None
+
+ADMISION_PROXIES_CONFIABLES = 1
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -123,3 +194,157 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Tracing de operaciones (Factory, Builder, Director, Serializer y ViewSet)
+
+TRAZAS_HABILITADAS = True
+
+TRAZAS_CAPACIDAD = 100
+
+# Fracción de solicitudes trazadas (muestreo en la raíz, de 0 a 1)
+TRAZAS_MUESTREO = 1.0
+
+# Spans registrados por traza; los siguientes se descartan y se cuentan
+TRAZAS_MAX_SPANS = 200
+
+# Spans por fila del Serializer (y el Factory/Builder que usan) en los listados
+TRAZAS_DETALLADAS = False
+
+
+# Ingesta diferida de pedidos (POST /api/pedidos/ responde 202 con un ticket)
+
+INGESTA_ASINCRONA = False
+
+INGESTA_TAMANIO_LOTE = 100
+
+INGESTA_INTERVALO_SEGUNDOS = 0.5
+
+# Segundos que se conserva el estado de un ticket
+INGESTA_TICKET_TTL_SEGUNDOS = 24 * 3600
+
+# Al apagar, cada worker guarda sus pendientes en ingesta_pendientes.<pid>.json
+INGESTA_ARCHIVO_PENDIENTES = BASE_DIR / 'ingesta_pendientes.json'
+
+
+# Idempotencia de creación de pedidos (cabecera Idempotency-Key)
+
+# Las claves se guardan en la base de datos (modelo ClaveIdempotencia) y son
+# válidas para todos los workers durante este tiempo
+IDEMPOTENCIA_TTL_SEGUNDOS = 24 * 3600
+
+# Máximo de claves guardadas; la purga elimina las más antiguas por encima
+IDEMPOTENCIA_MAX_ENTRADAS = 10000
+
+# La purga corre en una de cada N reservas (en promedio), no en cada POST
+IDEMPOTENCIA_PURGA_CADA = 100
+
+# Una reserva sin respuesta más antigua que esto (el worker terminó a mitad de
+# la solicitud) puede tomarla un reintento
+IDEMPOTENCIA_RESERVA_MAXIMA_SEGUNDOS = 60
+
+# Tiempo máximo que un duplicado espera a la solicitud original en curso
+IDEMPOTENCIA_ESPERA_SEGUNDOS = 10
+
+
+# Caché en memoria de representaciones de pedidos (GET /api/pedidos/{id}/ y calcular_precio)
+
+CACHE_REPRESENTACIONES_MAX_BYTES = 16 * 1024 * 1024
+
+
+# Registro de cambios para sincronización incremental (GET /api/pedidos/cambios/)
+
+CAMBIOS_MAX_LIMITE = 1000
+
+# Antigüedad a partir de la cual `python manage.py purgar_cambios` elimina cambios
+CAMBIOS_RETENCION_DIAS = 30
+
+
+# Flujo Server-Sent Events de pedidos (GET /api/pedidos/eventos/, solo con ASGI)
+
+# Eventos pendientes por cliente antes de desconectarlo por lento
+EVENTOS_BUFFER_MAXIMO = 256
+
+EVENTOS_LATIDO_SEGUNDOS = 15
+
+EVENTOS_REINTENTO_MS = 3000
+
+
+# Planificación de la cola de preparación (GET /api/pedidos/cola_preparacion/)
+
+PLANIFICADOR_ESTACIONES = 2
+
+# "fifo", "sjf" (trabajo más corto primero) o "lotes" (recetas idénticas juntas)
+PLANIFICADOR_POLITICA = "fifo"
+
+PLANIFICADOR_VENTANA_MINUTOS = 30
+
+PLANIFICADOR_MAX_PEDIDOS = 500
+
+# Límites de ?estaciones= (se recorta) y ?minutos= (fuera de rango responde 400)
+PLANIFICADOR_MAX_ESTACIONES = 32
+
+PLANIFICADOR_MAX_VENTANA_MINUTOS = 1440
+
+
+# Segundos que los clientes pueden reutilizar GET /api/pedidos/paquetes/ sin revalidar
+
+PAQUETES_MAX_AGE = 300
+
+# Construye precios, recetas y respuestas de catálogo al arrancar cada proceso
+# (pedidos_cafe/catalogo.py) en lugar de en su primera solicitud
+
+PRECALENTAR_CATALOGOS = True
+
+# Máximo de pedidos por página en GET /api/clientes/{cliente}/pedidos/
+
+CLIENTES_MAX_LIMITE = 200
+
+
+# Archivo frío de pedidos antiguos (`python manage.py archivar_pedidos`)
+
+ARCHIVO_PEDIDOS_DIR = BASE_DIR / 'archivo_pedidos'
+
+# Máximo de pedidos por consulta de GET /api/pedidos/archivo/
+ARCHIVO_MAX_LIMITE = 1000
+
+
+# Snapshot columnar para análisis (`python manage.py exportar_snapshot`)
+
+SNAPSHOT_PEDIDOS_DIR = BASE_DIR / 'snapshot_pedidos'
+
+
+# Admin de pedidos para tablas grandes: conteos estimados/cacheados,
+# jerarquía de fechas cacheada y carga diferida de columnas
+
+ADMIN_MODO_TABLA_GRANDE = False
+
+ADMIN_CACHE_CONTEO_SEGUNDOS = 60
+
+ADMIN_CACHE_JERARQUIA_SEGUNDOS = 300
+
+
+# Caché de GET /api/pedidos/estadisticas/: segundos de vigencia (0 lo desactiva),
+# segundos en que se sirve el valor vencido mientras una sola solicitud recalcula
+# y refresco en segundo plano antes del vencimiento (0 lo desactiva)
+
+ESTADISTICAS_CACHE_TTL = 5
+
+ESTADISTICAS_CACHE_GRACIA = 60
+
+ESTADISTICAS_REFRESCO_ANTICIPADO = 0
+
+# Alias de settings.CACHES (memoria local o archivos)
+ESTADISTICAS_CACHE_ALIAS = 'default'
+
+
+# Serie temporal de estadísticas (GET /api/pedidos/estadisticas/serie/)
+
+SERIE_MAX_CUBETAS = 2000
+
+# Una cubeta se considera cerrada (y se cachea) pasado este margen
+SERIE_MARGEN_CIERRE_SEGUNDOS = 60
+
+# Las escrituras de pedidos invalidan las cubetas cerradas afectadas; el TTL
+# solo acota la desactualización por cambios hechos fuera del ORM
+SERIE_CACHE_TTL = 86400
@@ -0,0 +1,84 @@
+"""
+Perfil de producción para api_patrones.
+
+Extiende la configuración base con una base de datos SQLite ajustada para
+concurrencia (WAL, pragmas aplicados al abrir cada conexión) y conexiones
+persistentes entre solicitudes. Además quita las aplicaciones y
+renderizadores que solo se usan en desarrollo para acortar el arranque de
+cada worker.
+
+Uso:
+    DJANGO_SETTINGS_MODULE=api_patrones.settings_produccion
+"""
+
+import copy
+import os
+
+from api_patrones.settings import *  # noqa: F401,F403
+from api_patrones import settings as _base
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+# Descarta carga antes de que las consultas costosas saturen los hilos
+ADMISION_HABILITADA = True
+
+# Cabecera con la IP del cliente que agrega el proxy inverso (X-Forwarded-For)
+ADMISION_CABECERA_IP = os.environ.get('ADMISION_CABECERA_IP') or None
+
+# Traza una de cada cien solicitudes
+TRAZAS_MUESTREO = 0.01
+
+
+# Arranque de workers
+# django_extensions solo aporta comandos de desarrollo (shell_plus,
+# runserver_plus) y se cargaría en cada worker. La API navegable importa
+# plantillas y formularios en la primera solicitud; en producción se sirve
+# solo JSON. Medir con `python benchmarks/bench_arranque.py`.
+
+APPS_SOLO_DESARROLLO = {'django_extensions'}
+
+INSTALLED_APPS = [app for app in _base.INSTALLED_APPS if app not in APPS_SOLO_DESARROLLO]
+
+REST_FRAMEWORK = dict(
+    _base.REST_FRAMEWORK,
+    DEFAULT_RENDERER_CLASSES=['api_patrones.renderers.RenderizadorJSONRapido'],
+)
+
+# Precios, recetas y respuestas de catálogo construidos en AppConfig.ready()
+PRECALENTAR_CATALOGOS = True
+
+
+# Database
+# WAL permite que los lectores no bloqueen al escritor. synchronous=NORMAL es
+# seguro con WAL y evita un fsync por transacción.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,  # Negativo: tamaño en KiB (~64 MB)
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_init_command(pragmas):
+    """Construye el init_command de SQLite a partir de un diccionario de pragmas"""
+    return ''.join(f'PRAGMA {nombre}={valor};' for nombre, valor in pragmas.items())
+
+
+DATABASES = copy.deepcopy(_base.DATABASES)
+for _config in DATABASES.values():
+    _config.update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': sqlite_init_command(SQLITE_PRAGMAS),
+            # Toma el bloqueo de escritura al iniciar la transacción para que
+            # busy_timeout se respete en lugar de fallar al promover el bloqueo.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+    })
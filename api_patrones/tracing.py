@@ -0,0 +1,253 @@
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+
+# Span activo en el contexto actual (hilo o tarea asyncio)
+_span_actual = ContextVar("span_actual", default=None)
+
+# Marca el contexto como no registrado: traza no muestreada o llamada de detalle
+_OMITIDO = object()
+
+
+class Span:
+    """
+    Unidad de trabajo medida dentro de una traza.
+    Guarda el tiempo de inicio y fin, los atributos y la relación con su span padre.
+    """
+
+    def __init__(self, nombre, traza, padre=None, atributos=None):
+        self.nombre = nombre
+        self.traza = traza
+        self.span_id = uuid.uuid4().hex[:16]
+        self.padre_id = padre.span_id if padre else None
+        self.atributos = dict(atributos or {})
+        self.estado = "ok"
+        self.inicio = time.time()
+        self._inicio_perf = time.perf_counter()
+        self.duracion_ms = None
+
+    def establecer_atributo(self, clave, valor):
+        """Agrega o reemplaza un atributo del span"""
+        self.atributos[clave] = valor
+
+    def finalizar(self):
+        """Cierra el span y calcula su duración"""
+        self.duracion_ms = round((time.perf_counter() - self._inicio_perf) * 1000, 3)
+
+    def a_dict(self):
+        """Retorna una representación serializable del span"""
+        return {
+            "nombre": self.nombre,
+            "span_id": self.span_id,
+            "padre_id": self.padre_id,
+            "inicio": self.inicio,
+            "duracion_ms": self.duracion_ms,
+            "estado": self.estado,
+            "atributos": self.atributos,
+        }
+
+
+class Traza:
+    """Conjunto de spans que comparten un mismo span raíz"""
+
+    def __init__(self):
+        self.traza_id = uuid.uuid4().hex
+        self.spans = []
+        # Spans abiertos (registrados) y descartados por superar el máximo
+        self.iniciados = 0
+        self.descartados = 0
+
+    def a_dict(self):
+        """Retorna la traza con sus spans ordenados por inicio"""
+        spans = sorted(self.spans, key=lambda span: span.inicio)
+        raiz = spans[0] if spans else None
+        return {
+            "traza_id": self.traza_id,
+            "raiz": raiz.nombre if raiz else None,
+            "duracion_ms": raiz.duracion_ms if raiz else None,
+            "total_spans": len(spans),
+            "spans_descartados": self.descartados,
+            "spans": [span.a_dict() for span in spans],
+        }
+
+
+class ExportadorMemoria:
+    """
+    Exportador en memoria con buffer circular.
+    Conserva únicamente las últimas trazas completadas.
+    """
+
+    def __init__(self, capacidad=100):
+        self._trazas = deque(maxlen=capacidad)
+        self._lock = Lock()
+
+    def exportar(self, traza):
+        """Almacena una traza completada"""
+        with self._lock:
+            self._trazas.append(traza.a_dict())
+
+    def obtener_trazas(self, limite=None):
+        """Retorna las trazas más recientes primero"""
+        with self._lock:
+            trazas = list(reversed(self._trazas))
+        return trazas if limite is None else trazas[:max(limite, 0)]
+
+    def limpiar(self):
+        """Elimina todas las trazas almacenadas"""
+        with self._lock:
+            self._trazas.clear()
+
+    def redimensionar(self, capacidad):
+        """Cambia la capacidad del buffer conservando las trazas más recientes"""
+        with self._lock:
+            self._trazas = deque(self._trazas, maxlen=capacidad)
+
+
+class Tracer:
+    """
+    Patrón Singleton para el trazado de operaciones con spans anidados.
+    Complementa al Logger mostrando la relación y el coste de cada llamada.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    cls._instancia = super(Tracer, cls).__new__(cls)
+                    cls._instancia.habilitado = True
+                    cls._instancia.muestreo = 1.0
+                    cls._instancia.max_spans = 200
+                    cls._instancia.detallado = False
+                    cls._instancia.exportador = ExportadorMemoria()
+        return cls._instancia
+
+    def configurar(self, habilitado=None, capacidad=None, muestreo=None, max_spans=None, detallado=None):
+        """
+        Ajusta la configuración del tracer.
+
+        Args:
+            habilitado (bool): Activa o desactiva el trazado
+            capacidad (int): Número máximo de trazas conservadas
+            muestreo (float): Fracción (0 a 1) de trazas raíz que se registran
+            max_spans (int): Spans registrados por traza; los demás se descartan y cuentan
+            detallado (bool): Registra también los spans de detalle (p. ej. por fila)
+        """
+        if habilitado is not None:
+            self.habilitado = habilitado
+        if capacidad is not None:
+            self.exportador.redimensionar(capacidad)
+        if muestreo is not None:
+            self.muestreo = muestreo
+        if max_spans is not None:
+            self.max_spans = max_spans
+        if detallado is not None:
+            self.detallado = detallado
+
+    @contextmanager
+    def span(self, nombre, **atributos):
+        """
+        Abre un span anidado bajo el span activo.
+
+        Args:
+            nombre (str): Nombre de la operación
+            **atributos: Atributos iniciales del span
+
+        Yields:
+            Span: El span abierto, o None si no se registra (trazado deshabilitado,
+                traza no muestreada o máximo de spans alcanzado)
+        """
+        if not self.habilitado:
+            yield None
+            return
+
+        padre = _span_actual.get()
+        if padre is _OMITIDO:
+            yield None
+            return
+        if padre is None and self.muestreo < 1 and random.random() >= self.muestreo:
+            # Muestreo en la raíz: la traza completa queda sin registrar
+            with self.omitir():
+                yield None
+            return
+
+        traza = padre.traza if padre else Traza()
+        if traza.iniciados >= self.max_spans:
+            traza.descartados += 1
+            yield None
+            return
+        traza.iniciados += 1
+        span = Span(nombre, traza, padre, atributos)
+        token = _span_actual.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.estado = "error"
+            span.establecer_atributo("error", str(e))
+            raise
+        finally:
+            span.finalizar()
+            _span_actual.reset(token)
+            traza.spans.append(span)
+            if padre is None:
+                self.exportador.exportar(traza)
+
+    @contextmanager
+    def omitir(self):
+        """Deja sin registrar los spans y anotaciones abiertos dentro del bloque"""
+        token = _span_actual.set(_OMITIDO)
+        try:
+            yield
+        finally:
+            _span_actual.reset(token)
+
+    def span_actual(self):
+        """Retorna el span activo o None"""
+        span = _span_actual.get()
+        return span if isinstance(span, Span) else None
+
+    def obtener_trazas(self, limite=None):
+        """Retorna las trazas recientes del exportador"""
+        return self.exportador.obtener_trazas(limite)
+
+    def limpiar_trazas(self):
+        """Elimina las trazas almacenadas"""
+        self.exportador.limpiar()
+
+
+def anotar(**atributos):
+    """Agrega atributos al span activo, si existe"""
+    span = _span_actual.get()
+    if isinstance(span, Span):
+        span.atributos.update(atributos)
+
+
+def trazar(nombre, detalle=False):
+    """
+    Decorador que envuelve una función en un span.
+
+    Args:
+        nombre (str): Nombre del span
+        detalle (bool): Span de detalle (p. ej. uno por fila de un listado):
+            solo se registra, junto con lo que ocurre dentro, si el tracer
+            está configurado como detallado
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            tracer = Tracer()
+            if detalle and not tracer.detallado:
+                if not tracer.habilitado:
+                    return funcion(*args, **kwargs)
+                with tracer.omitir():
+                    return funcion(*args, **kwargs)
+            with tracer.span(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
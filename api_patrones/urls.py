@@ -29,7 +29,8 @@ def api_root(request):
             "ingredientes": "/api/pedidos/ingredientes_disponibles/",
             "tamanios": "/api/pedidos/tamanios_disponibles/",
             "logs": "/api/pedidos/logs_sistema/",
-            "estadisticas": "/api/pedidos/estadisticas/"
+            "estadisticas": "/api/pedidos/estadisticas/",
+            "trazas": "/api/pedidos/trazas/"
         },
         "patrones_implementados": [
             "Factory Pattern",
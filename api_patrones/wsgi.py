@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_patrones.settings')
 
 application = get_wsgi_application()
+
+# Importa las vistas y compila las rutas al arrancar el worker y no en su
+# primera solicitud (los catálogos se precalientan en PedidosCafeConfig.ready())
+from django.urls import reverse  # noqa: E402
+
+reverse('pedidos-list')
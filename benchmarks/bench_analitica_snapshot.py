@@ -0,0 +1,82 @@
+"""
+Benchmark de agregados sobre el snapshot columnar de pedidos.
+
+Genera un snapshot sintético (sin base de datos) y mide los agregados de
+pedidos_cafe.analitica.SnapshotPedidos con memoria mapeada.
+
+Uso:
+    python benchmarks/bench_analitica_snapshot.py --filas 10000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from entorno import RAIZ  # noqa: F401  (agrega la raíz del proyecto al path)
+
+from pedidos_cafe import analitica
+from pedidos_cafe.analitica import EscritorSnapshot, SnapshotPedidos
+from pedidos_cafe.codificacion import INGREDIENTES, TAMANIOS, TIPOS, calcular_precio, decodificar_ingredientes
+
+
+def generar(directorio, filas, lote=1_000_000):
+    aleatorio = random.Random(7)
+    inicio_epoch = int(time.time()) - 365 * 24 * 3600
+    escritor = EscritorSnapshot(directorio)
+    siguiente_id = 1
+    for desde in range(0, filas, lote):
+        n = min(lote, filas - desde)
+        tipos = [aleatorio.randrange(len(TIPOS)) for _ in range(n)]
+        tamanios = [aleatorio.randrange(len(TAMANIOS)) for _ in range(n)]
+        mascaras = [aleatorio.randrange(1 << len(INGREDIENTES)) for _ in range(n)]
+        escritor.agregar_bloque({
+            "id": range(siguiente_id, siguiente_id + n),
+            "tipo": tipos,
+            "tamanio": tamanios,
+            "ingredientes": mascaras,
+            "fecha": sorted(aleatorio.randrange(inicio_epoch, inicio_epoch + 365 * 24 * 3600) for _ in range(n)),
+            "precio": [
+                calcular_precio(TIPOS[t], decodificar_ingredientes(m), TAMANIOS[s])
+                for t, s, m in zip(tipos, tamanios, mascaras)
+            ],
+        })
+        siguiente_id += n
+    escritor.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        directorio = os.path.join(temporal, "snapshot")
+        inicio = time.perf_counter()
+        generar(directorio, args.filas)
+        print(f"Snapshot de {args.filas} filas generado en {time.perf_counter() - inicio:.1f} s "
+              f"(numpy: {'sí' if analitica.np is not None else 'no'})")
+
+        snapshot = SnapshotPedidos(directorio)
+        operaciones = [
+            ("ingresos totales", snapshot.ingresos_totales),
+            ("mezcla por tipo", lambda: snapshot.mezcla("tipo")),
+            ("mezcla por tamaño", lambda: snapshot.mezcla("tamanio")),
+            ("tipo x tamaño", snapshot.mezcla_tipo_tamanio),
+            ("ingredientes", snapshot.frecuencia_ingredientes),
+            ("serie diaria", lambda: snapshot.serie(24 * 3600)),
+        ]
+        total = 0.0
+        for nombre, operacion in operaciones:
+            inicio = time.perf_counter()
+            operacion()
+            duracion = (time.perf_counter() - inicio) * 1000
+            total += duracion
+            print(f"{nombre:<20} {duracion:>10.1f} ms")
+        print(f"{'total':<20} {total:>10.1f} ms")
+        snapshot.cerrar()
+
+
+if __name__ == "__main__":
+    main()
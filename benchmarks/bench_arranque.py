@@ -0,0 +1,133 @@
+"""
+Benchmark del arranque en frío de un worker: tiempo hasta tener la
+aplicación WSGI lista, latencia de la primera y la segunda solicitud a
+cada endpoint y tiempo de importación por módulo (python -X importtime).
+Cada medición corre en un intérprete nuevo, como un worker recién creado.
+
+Uso:
+    python benchmarks/bench_arranque.py --settings api_patrones.settings,api_patrones.settings_produccion
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+INICIO = time.perf_counter()
+
+RUTAS = [
+    "/api/pedidos/tipos_cafe/",
+    "/api/pedidos/ingredientes_disponibles/",
+    "/api/pedidos/paquetes/",
+    "/api/pedidos/estadisticas/",
+]
+
+
+def medir_worker(settings_module, ruta_db):
+    """
+    Mide el arranque en el proceso actual (ejecutado como hijo).
+
+    Returns:
+        dict: Milisegundos hasta la aplicación lista y por solicitud
+    """
+    import importlib
+    from io import BytesIO
+    from wsgiref.util import setup_testing_defaults
+
+    import entorno  # noqa: F401 (agrega la raíz del proyecto a sys.path)
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    importlib.import_module(settings_module).DATABASES["default"]["NAME"] = ruta_db
+
+    # Mismo punto de entrada que usa el servidor WSGI (gunicorn api_patrones.wsgi)
+    from api_patrones.wsgi import application
+    resultado = {"aplicacion_lista_ms": (time.perf_counter() - INICIO) * 1000}
+
+    def solicitar(ruta):
+        environ = {"PATH_INFO": ruta, "REQUEST_METHOD": "GET", "wsgi.input": BytesIO()}
+        setup_testing_defaults(environ)
+        estado = []
+        inicio = time.perf_counter()
+        cuerpo = b"".join(application(environ, lambda status, cabeceras: estado.append(status)))
+        duracion = (time.perf_counter() - inicio) * 1000
+        if not estado[0].startswith("200"):
+            raise RuntimeError(f"{ruta}: {estado[0]} {cuerpo[:200]!r}")
+        return duracion
+
+    resultado["primera_ms"] = {ruta: solicitar(ruta) for ruta in RUTAS}
+    resultado["segunda_ms"] = {ruta: solicitar(ruta) for ruta in RUTAS}
+    return resultado
+
+
+def leer_importtime(salida):
+    """
+    Interpreta la salida de -X importtime.
+
+    Returns:
+        dict: Microsegundos de importación propios (sin dependencias) por
+            paquete de primer nivel; la suma es el tiempo total de importación
+    """
+    por_paquete = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        propio, _, nombre = linea[len("import time:"):].split("|")
+        if not propio.strip().isdigit():
+            continue
+        paquete = nombre.strip().split(".")[0]
+        por_paquete[paquete] = por_paquete.get(paquete, 0) + int(propio)
+    return por_paquete
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--settings", default="api_patrones.settings,api_patrones.settings_produccion",
+                        help="Módulos de configuración a comparar, separados por coma")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Workers arrancados por configuración")
+    parser.add_argument("--modulos", type=int, default=12, help="Paquetes a mostrar por tiempo de importación")
+    parser.add_argument("--hijo", nargs=2, metavar=("SETTINGS", "DB"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        print(json.dumps(medir_worker(*args.hijo)))
+        return
+
+    from entorno import preparar_django
+
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.sqlite3")
+        preparar_django(ruta_db)
+
+        for settings_module in args.settings.split(","):
+            mediciones = []
+            importaciones = {}
+            for _ in range(args.repeticiones):
+                proceso = subprocess.run(
+                    [sys.executable, "-X", "importtime", script, "--hijo", settings_module, ruta_db],
+                    capture_output=True, text=True, check=True,
+                )
+                mediciones.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+                for paquete, micro in leer_importtime(proceso.stderr).items():
+                    importaciones.setdefault(paquete, []).append(micro)
+
+            print(f"\n== {settings_module} (mediana de {args.repeticiones} workers)")
+            print(f"aplicación WSGI lista: {statistics.median(m['aplicacion_lista_ms'] for m in mediciones):.1f} ms")
+            print(f"{'endpoint':<42} {'1ª ms':>9} {'2ª ms':>9}")
+            for ruta in RUTAS:
+                primera = statistics.median(m["primera_ms"][ruta] for m in mediciones)
+                segunda = statistics.median(m["segunda_ms"][ruta] for m in mediciones)
+                print(f"{ruta:<42} {primera:>9.2f} {segunda:>9.2f}")
+
+            print(f"{'paquete':<24} {'importación ms':>15} (propia, incluye las que ocurren en la 1ª solicitud)")
+            medianas = {paquete: statistics.median(valores) / 1000 for paquete, valores in importaciones.items()}
+            for paquete, ms in sorted(medianas.items(), key=lambda item: -item[1])[:args.modulos]:
+                print(f"{paquete:<24} {ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
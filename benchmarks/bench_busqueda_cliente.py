@@ -0,0 +1,59 @@
+"""
+Benchmark de búsqueda de clientes: LIKE (icontains) frente a la búsqueda
+indexada por prefijo de palabra de PedidoCafe.objects.buscar_cliente().
+
+Uso:
+    python benchmarks/bench_busqueda_cliente.py --filas 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+
+from entorno import medir, preparar_django
+
+NOMBRES = ["José", "María", "Lucía", "Andrés", "Martín", "Sofía", "Iñaki", "Ramón", "Elena", "Tomás"]
+APELLIDOS = ["García", "Pérez", "López", "Núñez", "Gómez", "Fernández", "Díaz", "Muñoz", "Ruiz", "Álvarez"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--clientes", type=int, default=50_000, help="Clientes distintos")
+    parser.add_argument("--lote", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        preparar_django(os.path.join(directorio, "bench.sqlite3"))
+        from pedidos_cafe.models import PedidoCafe
+
+        aleatorio = random.Random(42)
+        clientes = [
+            f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)} {numero}"
+            for numero in range(args.clientes)
+        ]
+        print(f"Insertando {args.filas} pedidos...")
+        for inicio in range(0, args.filas, args.lote):
+            PedidoCafe.objects.bulk_create([
+                PedidoCafe(cliente=aleatorio.choice(clientes), tipo_base="latte",
+                           ingredientes=[], tamanio="mediano")
+                for _ in range(min(args.lote, args.filas - inicio))
+            ], batch_size=args.lote)
+
+        consultas = [
+            ("prefijo de nombre", clientes[12][:-1], clientes[12][:-1]),
+            ("palabra (apellido)", clientes[4217].split(" ", 1)[1], clientes[4217].split(" ", 1)[1]),
+            ("cliente exacto", clientes[777], clientes[777]),
+        ]
+        print(f"{'consulta':<20} {'LIKE ms':>10} {'índice ms':>10} {'filas LIKE':>11} {'filas índice':>13}")
+        for nombre, texto_like, texto_indice in consultas:
+            like_ms, filas_like = medir(
+                lambda: PedidoCafe.objects.filter(cliente__icontains=texto_like).count())
+            indice_ms, filas_indice = medir(
+                lambda: PedidoCafe.objects.buscar_cliente(texto_indice).count())
+            print(f"{nombre:<20} {like_ms:>10.2f} {indice_ms:>10.2f} {filas_like:>11} {filas_indice:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Simulación de la cola de preparación con distintas políticas de planificación.
+
+Genera una jornada sintética de pedidos (llegadas de Poisson con encargos de
+oficina: varios grandes idénticos a la vez) y compara FIFO, trabajo más corto
+primero y lotes de recetas idénticas en rendimiento y percentiles de espera.
+
+Uso:
+    python benchmarks/bench_planificador.py --pedidos 3000 --estaciones 2 3
+"""
+
+import argparse
+import random
+
+from entorno import RAIZ  # noqa: F401  (agrega la raíz del proyecto al path)
+
+from pedidos_cafe.codificacion import INGREDIENTES, TAMANIOS, TIPOS
+from pedidos_cafe.planificador import Planificador, TrabajoPreparacion
+
+
+def generar_pedidos(total, por_minuto, probabilidad_encargo, semilla=11):
+    """Retorna tuplas (llegada en segundos, tipo, tamaño, ingredientes)"""
+    aleatorio = random.Random(semilla)
+    pedidos = []
+    reloj = 0.0
+    while len(pedidos) < total:
+        reloj += aleatorio.expovariate(por_minuto / 60)
+        if aleatorio.random() < probabilidad_encargo:
+            # Encargo de oficina: varios cafés grandes con la misma receta que llegan juntos
+            tipo = aleatorio.choice(TIPOS)
+            ingredientes = aleatorio.sample(INGREDIENTES, aleatorio.randint(1, 2))
+            pedidos.extend((reloj, tipo, "grande", ingredientes) for _ in range(aleatorio.randint(4, 10)))
+        else:
+            pedidos.append((
+                reloj,
+                aleatorio.choice(TIPOS),
+                aleatorio.choice(TAMANIOS),
+                aleatorio.sample(INGREDIENTES, aleatorio.randint(0, 2)),
+            ))
+    return pedidos[:total]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pedidos", type=int, default=3000)
+    parser.add_argument("--por-minuto", type=float, default=0.8, help="Llegadas (pedidos o encargos) por minuto")
+    parser.add_argument("--encargos", type=float, default=0.08, help="Probabilidad de que una llegada sea un encargo")
+    parser.add_argument("--estaciones", type=int, nargs="+", default=[2, 3])
+    args = parser.parse_args()
+
+    pedidos = generar_pedidos(args.pedidos, args.por_minuto, args.encargos)
+    print(f"{len(pedidos)} pedidos, {args.por_minuto} llegadas/min, {args.encargos:.0%} encargos de oficina\n")
+    print(f"{'estaciones':>10} {'política':<8} {'ped/h':>8} {'ocup.':>6} "
+          f"{'media':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'máx':>8}  (espera en s)")
+
+    for estaciones in args.estaciones:
+        for politica in Planificador.politicas_disponibles():
+            trabajos = [
+                TrabajoPreparacion(pedido_id, llegada, tipo, tamanio, ingredientes)
+                for pedido_id, (llegada, tipo, tamanio, ingredientes) in enumerate(pedidos, start=1)
+            ]
+            metricas = Planificador(estaciones, politica).planificar(trabajos).metricas()
+            print(f"{estaciones:>10} {politica:<8} {metricas['pedidos_por_hora']:>8} {metricas['ocupacion']:>6} "
+                  f"{metricas['espera_media']:>8} {metricas['espera_p50']:>8} {metricas['espera_p95']:>8} "
+                  f"{metricas['espera_p99']:>8} {metricas['espera_maxima']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark del renderizado y la compresión de respuestas: bytes enviados y
+CPU por respuesta de la lista de pedidos y de logs_sistema con el
+JSONRenderer de DRF frente a RenderizadorJSONRapido, sin compresión y con
+gzip a distintos niveles. La ventaja de RenderizadorJSONRapido requiere
+orjson (requirements.txt); sin él ambos renderizadores cuestan lo mismo.
+
+Uso:
+    python benchmarks/bench_respuestas.py --filas 2000 --logs 20000 --niveles 1,6,9
+"""
+
+import argparse
+import gzip
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from entorno import preparar_django
+
+
+def medir_cpu(funcion, repeticiones):
+    """Retorna la mediana de CPU en milisegundos y el último resultado"""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.process_time()
+        resultado = funcion()
+        tiempos.append((time.process_time() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=2000, help="Pedidos en la lista")
+    parser.add_argument("--logs", type=int, default=20000, help="Mensajes en el logger")
+    parser.add_argument("--niveles", default="1,6,9", help="Niveles de gzip a comparar")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+    niveles = [int(nivel) for nivel in args.niveles.split(",")]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        preparar_django(os.path.join(directorio, "bench.sqlite3"))
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.test import Client
+        from rest_framework.renderers import JSONRenderer
+
+        from api_patrones.logger import Logger
+        from api_patrones.renderers import RenderizadorJSONRapido, orjson
+        from pedidos_cafe.views import PedidoCafeViewSet
+
+        call_command("sembrar_pedidos", cantidad=args.filas, semilla=7, stdout=io.StringIO())
+        settings.ALLOWED_HOSTS = ["*"]
+        settings.GZIP_MINIMO_BYTES = 0
+        cliente = Client()
+        logger = Logger()
+
+        def preparar_logs():
+            logger.limpiar_logs()
+            for numero in range(args.logs):
+                logger.registrar(f"API: Pedido creado exitosamente ID: {numero}")
+
+        endpoints = [
+            ("lista", "/api/pedidos/", None),
+            ("logs_sistema", "/api/pedidos/logs_sistema/", preparar_logs),
+        ]
+        renderizadores = [("drf", JSONRenderer), ("rapido", RenderizadorJSONRapido)]
+        compresiones = [None] + niveles
+
+        print(f"orjson: {'sí' if orjson is not None else 'no: RenderizadorJSONRapido usa la biblioteca estándar y no hay ganancia (pip install -r requirements.txt)'}")
+        print(f"{'endpoint':<14} {'renderer':<8} {'gzip':>5} {'bytes':>10} {'ratio':>7} "
+              f"{'CPU ms/resp':>12} {'render ms':>10} {'gzip ms':>8}")
+        for nombre, ruta, preparar in endpoints:
+            for nombre_renderer, renderer in renderizadores:
+                PedidoCafeViewSet.renderer_classes = [renderer]
+                sin_comprimir = None
+                for nivel in compresiones:
+                    if preparar:
+                        preparar()
+                    cabeceras = {"HTTP_ACCEPT_ENCODING": "gzip"} if nivel else {}
+                    settings.GZIP_NIVEL = nivel or 6
+                    cpu_ms, respuesta = medir_cpu(lambda: cliente.get(ruta, **cabeceras), args.repeticiones)
+                    cuerpo = gzip.decompress(respuesta.content) if nivel else respuesta.content
+                    sin_comprimir = sin_comprimir or len(cuerpo)
+
+                    # Costo aislado de codificar y comprimir los mismos datos
+                    datos = respuesta.data
+                    render_ms, contenido = medir_cpu(lambda: renderer().render(datos), args.repeticiones)
+                    gzip_ms = medir_cpu(lambda: gzip.compress(contenido, nivel), args.repeticiones)[0] if nivel else 0.0
+
+                    print(f"{nombre:<14} {nombre_renderer:<8} {nivel or '-':>5} {len(respuesta.content):>10} "
+                          f"{len(respuesta.content) / sin_comprimir:>7.3f} {cpu_ms:>12.2f} "
+                          f"{render_ms:>10.2f} {gzip_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark de lectura/escritura concurrente sobre SQLite.
+
+Compara la configuración por defecto (journal en modo rollback y una conexión
+nueva por operación, como CONN_MAX_AGE=0) con el perfil de producción
+(WAL, pragmas de api_patrones.settings_produccion y conexiones persistentes).
+
+Uso:
+    python benchmarks/bench_sqlite_concurrencia.py --lectores 4 --escritores 2 --segundos 5
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_patrones.settings_produccion import SQLITE_PRAGMAS  # noqa: E402
+from entorno import percentil  # noqa: E402
+
+ESQUEMA = """
+CREATE TABLE pedidos_cafe_pedidocafe (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cliente VARCHAR(100) NOT NULL,
+    tipo_base VARCHAR(20) NOT NULL,
+    ingredientes TEXT NOT NULL,
+    tamanio VARCHAR(10) NOT NULL,
+    fecha DATETIME NOT NULL
+)
+"""
+
+INSERT = (
+    "INSERT INTO pedidos_cafe_pedidocafe (cliente, tipo_base, ingredientes, tamanio, fecha) "
+    "VALUES (?, 'latte', '[\"canela\"]', 'mediano', datetime('now'))"
+)
+
+SELECT = "SELECT id, cliente, tipo_base, tamanio FROM pedidos_cafe_pedidocafe ORDER BY id DESC LIMIT 50"
+
+
+class Perfil:
+    """Describe cómo se abren y reutilizan las conexiones en un escenario"""
+
+    def __init__(self, nombre, pragmas, persistente):
+        self.nombre = nombre
+        self.pragmas = pragmas
+        self.persistente = persistente
+
+    def conectar(self, ruta):
+        conexion = sqlite3.connect(ruta, timeout=5, isolation_level=None, check_same_thread=False)
+        for nombre, valor in self.pragmas.items():
+            conexion.execute(f"PRAGMA {nombre}={valor}")
+        return conexion
+
+
+def trabajador(perfil, ruta, operacion, fin, latencias, errores):
+    conexion = perfil.conectar(ruta) if perfil.persistente else None
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        actual = conexion or perfil.conectar(ruta)
+        try:
+            operacion(actual)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        except sqlite3.OperationalError:
+            errores.append(1)
+        finally:
+            if conexion is None:
+                actual.close()
+    if conexion is not None:
+        conexion.close()
+
+
+def escribir(conexion):
+    conexion.execute("BEGIN IMMEDIATE")
+    conexion.execute(INSERT, ("benchmark",))
+    conexion.execute("COMMIT")
+
+
+def leer(conexion):
+    conexion.execute(SELECT).fetchall()
+
+
+def ejecutar(perfil, lectores, escritores, segundos, filas_iniciales):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench.sqlite3")
+        conexion = perfil.conectar(ruta)
+        conexion.execute(ESQUEMA)
+        conexion.execute("BEGIN")
+        conexion.executemany(INSERT, [("semilla",)] * filas_iniciales)
+        conexion.execute("COMMIT")
+        conexion.close()
+
+        lecturas, escrituras, errores = [], [], []
+        fin = time.perf_counter() + segundos
+        hilos = [
+            threading.Thread(target=trabajador, args=(perfil, ruta, leer, fin, lecturas, errores))
+            for _ in range(lectores)
+        ] + [
+            threading.Thread(target=trabajador, args=(perfil, ruta, escribir, fin, escrituras, errores))
+            for _ in range(escritores)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    return {
+        "perfil": perfil.nombre,
+        "lecturas_s": len(lecturas) / segundos,
+        "escrituras_s": len(escrituras) / segundos,
+        "lectura_p50": statistics.median(lecturas) if lecturas else 0.0,
+        "lectura_p99": percentil(lecturas, 99),
+        "escritura_p50": statistics.median(escrituras) if escrituras else 0.0,
+        "escritura_p99": percentil(escrituras, 99),
+        "errores": len(errores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--escritores", type=int, default=2)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--filas", type=int, default=10000)
+    args = parser.parse_args()
+
+    perfiles = [
+        Perfil("por defecto", {}, persistente=False),
+        Perfil("produccion", SQLITE_PRAGMAS, persistente=True),
+    ]
+
+    print(f"{'perfil':<12} {'lect/s':>9} {'escr/s':>9} {'lect p50':>9} {'lect p99':>9} "
+          f"{'escr p50':>9} {'escr p99':>9} {'errores':>8}")
+    for perfil in perfiles:
+        r = ejecutar(perfil, args.lectores, args.escritores, args.segundos, args.filas)
+        print(f"{r['perfil']:<12} {r['lecturas_s']:>9.0f} {r['escrituras_s']:>9.0f} "
+              f"{r['lectura_p50']:>8.2f}ms {r['lectura_p99']:>7.2f}ms "
+              f"{r['escritura_p50']:>7.2f}ms {r['escritura_p99']:>7.2f}ms {r['errores']:>8}")
+
+
+if __name__ == "__main__":
+    main()
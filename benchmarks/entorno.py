@@ -0,0 +1,52 @@
+"""
+Utilidades compartidas por los benchmarks: preparan Django sobre una base
+SQLite temporal para no tocar db.sqlite3.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Los benchmarks usan el mismo percentil que la cola de preparación
+from pedidos_cafe.planificador import percentil  # noqa: E402,F401
+
+
+def preparar_django(ruta_db, settings_module='api_patrones.settings'):
+    """
+    Configura Django sobre la base SQLite indicada y aplica las migraciones.
+
+    Args:
+        ruta_db (str): Ruta del archivo SQLite a usar
+        settings_module (str): Módulo de configuración de Django
+    """
+    import importlib
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    modulo = importlib.import_module(settings_module)
+    modulo.DATABASES['default']['NAME'] = ruta_db
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def medir(funcion, repeticiones=5):
+    """
+    Ejecuta una función varias veces y retorna la mediana en milisegundos.
+
+    Returns:
+        tuple: (mediana_ms, resultado de la última ejecución)
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
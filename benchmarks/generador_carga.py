@@ -0,0 +1,131 @@
+"""
+Generador de carga local contra un servidor en ejecución.
+
+Lanza varios procesos que repiten una mezcla de lecturas y escrituras sobre
+la API de pedidos durante un tiempo fijo y reporta el rendimiento y los
+percentiles de latencia por operación. Solo usa la biblioteca estándar.
+
+Uso:
+    python manage.py sembrar_pedidos --cantidad 1000000
+    python manage.py runserver --noreload   # u otro servidor
+    python benchmarks/generador_carga.py --url http://127.0.0.1:8000 --procesos 8 --segundos 30
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import time
+import urllib.error
+import urllib.request
+
+from entorno import percentil
+
+TIPOS = ["espresso", "americano", "latte"]
+TAMANIOS = ["pequeño", "mediano", "grande"]
+INGREDIENTES = ["canela", "chocolate", "vainilla", "azucar", "leche extra"]
+PREFIJOS_CLIENTE = ["jos", "mar", "luc", "and", "mart", "sof", "gar", "per", "lop", "ruiz"]
+
+MEZCLA_POR_DEFECTO = "detalle=45,buscar=20,precio=10,estadisticas=5,crear=20"
+
+
+def solicitar(url, metodo="GET", datos=None):
+    """Ejecuta una solicitud HTTP y retorna (status, cuerpo)"""
+    cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else None
+    solicitud = urllib.request.Request(url, data=cuerpo, method=metodo)
+    if cuerpo is not None:
+        solicitud.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(solicitud, timeout=30) as respuesta:
+            return respuesta.status, respuesta.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def obtener_ids(base, maximo=2000):
+    """Obtiene ids de pedidos existentes desde el registro de cambios"""
+    status, cuerpo = solicitar(f"{base}/api/pedidos/cambios/?cursor=0&limite={maximo}")
+    if status != 200:
+        return []
+    return [cambio["pedido_id"] for cambio in json.loads(cuerpo)["cambios"] if cambio["pedido"]]
+
+
+def operacion(nombre, base, ids, aleatorio):
+    """Ejecuta una operación de la mezcla y retorna el status HTTP"""
+    if nombre == "detalle":
+        return solicitar(f"{base}/api/pedidos/{aleatorio.choice(ids)}/")[0]
+    if nombre == "precio":
+        return solicitar(f"{base}/api/pedidos/{aleatorio.choice(ids)}/calcular_precio/")[0]
+    if nombre == "buscar":
+        prefijo = aleatorio.choice(PREFIJOS_CLIENTE)
+        return solicitar(f"{base}/api/pedidos/?cliente={prefijo}+{aleatorio.randint(0, 9999)}")[0]
+    if nombre == "estadisticas":
+        return solicitar(f"{base}/api/pedidos/estadisticas/")[0]
+    status, cuerpo = solicitar(f"{base}/api/pedidos/", "POST", {
+        "cliente": f"Carga {aleatorio.randint(0, 9999)}",
+        "tipo_base": aleatorio.choice(TIPOS),
+        "tamanio": aleatorio.choice(TAMANIOS),
+        "ingredientes": aleatorio.sample(INGREDIENTES, aleatorio.randint(0, 2)),
+    })
+    if status == 201:
+        ids.append(json.loads(cuerpo)["id"])
+    return status
+
+
+def trabajador(numero, base, ids, mezcla, segundos, resultados):
+    aleatorio = random.Random(numero)
+    nombres, pesos = list(mezcla), list(mezcla.values())
+    medidas = []
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        nombre = aleatorio.choices(nombres, weights=pesos)[0]
+        inicio = time.perf_counter()
+        try:
+            status = operacion(nombre, base, ids, aleatorio)
+        except OSError:
+            status = 0
+        medidas.append((nombre, (time.perf_counter() - inicio) * 1000, status))
+    resultados.put(medidas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--procesos", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=20)
+    parser.add_argument("--mezcla", default=MEZCLA_POR_DEFECTO, help="Operaciones y pesos (nombre=peso,...)")
+    args = parser.parse_args()
+
+    base = args.url.rstrip("/")
+    mezcla = {nombre: float(peso) for nombre, _, peso in (p.partition("=") for p in args.mezcla.split(","))}
+    ids = obtener_ids(base)
+    if not ids:
+        mezcla = {nombre: peso for nombre, peso in mezcla.items() if nombre not in ("detalle", "precio")}
+        print("Sin pedidos existentes: se omiten las operaciones de detalle y precio")
+
+    resultados = multiprocessing.Queue()
+    procesos = [
+        multiprocessing.Process(target=trabajador, args=(numero, base, list(ids), mezcla, args.segundos, resultados))
+        for numero in range(args.procesos)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    medidas = [medida for _ in procesos for medida in resultados.get()]
+    for proceso in procesos:
+        proceso.join()
+
+    print(f"{args.procesos} procesos, {args.segundos:.0f} s, {len(medidas)} solicitudes "
+          f"({len(medidas) / args.segundos:.1f} sol/s)\n")
+    print(f"{'operación':<14} {'total':>7} {'sol/s':>7} {'errores':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for nombre in list(mezcla) + ["total"]:
+        propias = [m for m in medidas if nombre in (m[0], "total")]
+        if not propias:
+            continue
+        latencias = [m[1] for m in propias]
+        errores = sum(1 for m in propias if not 200 <= m[2] < 300)
+        print(f"{nombre:<14} {len(propias):>7} {len(propias) / args.segundos:>7.1f} {errores:>8} "
+              f"{percentil(latencias, 50):>8.1f} {percentil(latencias, 95):>8.1f} {percentil(latencias, 99):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,71 @@
+from django.conf import settings
 from django.contrib import admin
-from pedidos_cafe.models import PedidoCafe
+from django.contrib.admin.options import ShowFacets
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from pedidos_cafe.codificacion import INGREDIENTES
+from pedidos_cafe.models import PedidoCafe, PedidoCafeQuerySet
+from pedidos_cafe.representaciones import CacheRepresentaciones
+from pedidos_cafe.paginacion import PaginadorConteoEstimado, clave_consulta
+from api_patrones.routers import lecturas_en_replica
+
+
+def modo_tabla_grande():
+    """Indica si el admin de pedidos funciona en modo de tabla grande"""
+    return getattr(settings, 'ADMIN_MODO_TABLA_GRANDE', False)
+
+
+class JerarquiaFechasCacheadaQuerySet(PedidoCafeQuerySet):
+    """
+    QuerySet del listado que cachea las consultas de date_hierarchy
+    (rango MIN/MAX de fecha y años, meses o días disponibles).
+    """
+
+    def _cacheado(self, etiqueta, calcular):
+        clave = clave_consulta('admin:jerarquia', self, etiqueta)
+        valor = cache.get(clave)
+        if valor is None:
+            valor = calcular()
+            cache.set(clave, valor, getattr(settings, 'ADMIN_CACHE_JERARQUIA_SEGUNDOS', 300))
+        return valor
+
+    def aggregate(self, *args, **kwargs):
+        return self._cacheado(
+            ('aggregate', args, sorted(kwargs.items())),
+            lambda: super(JerarquiaFechasCacheadaQuerySet, self).aggregate(*args, **kwargs),
+        )
+
+    def datetimes(self, field_name, kind, *args, **kwargs):
+        return self._cacheado(
+            ('datetimes', field_name, kind),
+            lambda: list(super(JerarquiaFechasCacheadaQuerySet, self).datetimes(field_name, kind, *args, **kwargs)),
+        )
+
+
+class ChangeListTablaGrande(ChangeList):
+    """
+    ChangeList para tablas grandes: carga solo las columnas mostradas y
+    cachea los agrupamientos de la jerarquía de fechas.
+    """
+    campos_listado = ('id', 'cliente', 'tipo_base', 'tamanio', 'fecha', 'ingredientes')
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # root_queryset ya es un JerarquiaFechasCacheadaQuerySet (PedidoCafeAdmin.get_queryset)
+        return super().get_queryset(request, exclude_parameters).only(*self.campos_listado)
+
+class FiltroIngrediente(admin.SimpleListFilter):
+    """Filtro del listado por ingrediente, resuelto con la máscara indexada"""
+    title = 'ingrediente'
+    parameter_name = 'ingrediente'
+
+    def lookups(self, request, model_admin):
+        return [(ingrediente, ingrediente.capitalize()) for ingrediente in INGREDIENTES]
+
+    def queryset(self, request, queryset):
+        if self.value() in INGREDIENTES:
+            return queryset.con_ingredientes([self.value()])
+        return queryset
+
 
 @admin.register(PedidoCafe)
 class PedidoCafeAdmin(admin.ModelAdmin):
@@ -8,11 +74,20 @@ class PedidoCafeAdmin(admin.ModelAdmin):
     Muestra información relevante y permite filtrar por diferentes campos.
     """
     list_display = ('id', 'cliente', 'tipo_base', 'tamanio', 'fecha', 'mostrar_ingredientes')
-    list_filter = ('tipo_base', 'tamanio', 'fecha')
+    list_filter = ('tipo_base', 'tamanio', FiltroIngrediente, 'fecha')
     search_fields = ('cliente', 'tipo_base')
     readonly_fields = ('fecha',)
     date_hierarchy = 'fecha'
     
+    @property
+    def show_full_result_count(self):
+        # En modo tabla grande no se cuenta el total sin filtros en cada listado
+        return not modo_tabla_grande()
+    
+    @property
+    def show_facets(self):
+        return ShowFacets.NEVER if modo_tabla_grande() else ShowFacets.ALLOW
+    
     fieldsets = (
         ('Información del Cliente', {
             'fields': ('cliente',)
@@ -34,9 +109,47 @@ class PedidoCafeAdmin(admin.ModelAdmin):
     
     mostrar_ingredientes.short_description = 'Ingredientes'
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Reemplaza la búsqueda icontains por la búsqueda indexada de clientes
+        (prefijo de palabra, sin mayúsculas ni acentos) y la coincidencia exacta de tipo.
+        """
+        if not search_term.strip():
+            return queryset, False
+        
+        resultados = queryset.buscar_cliente(search_term)
+        tipo = search_term.strip().lower()
+        if tipo in dict(PedidoCafe._meta.get_field('tipo_base').choices):
+            resultados = resultados | queryset.filter(tipo_base=tipo)
+        return resultados, False
+    
     def get_queryset(self, request):
-        """Optimiza las consultas del admin"""
-        return super().get_queryset(request)
+        """En modo tabla grande parte del QuerySet que cachea la jerarquía de fechas"""
+        if not modo_tabla_grande():
+            return super().get_queryset(request)
+        queryset = JerarquiaFechasCacheadaQuerySet(self.model)
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+    
+    def get_changelist(self, request, **kwargs):
+        """Usa el ChangeList optimizado en modo tabla grande"""
+        if modo_tabla_grande():
+            return ChangeListTablaGrande
+        return super().get_changelist(request, **kwargs)
+    
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        """Usa conteos estimados o cacheados en modo tabla grande"""
+        paginador = PaginadorConteoEstimado if modo_tabla_grande() else self.paginator
+        return paginador(queryset, per_page, orphans, allow_empty_first_page)
+    
+    def changelist_view(self, request, extra_context=None):
+        """Sirve el listado del admin desde la réplica de lectura"""
+        if request.method != 'GET':
+            return super().changelist_view(request, extra_context)
+        with lecturas_en_replica():
+            return super().changelist_view(request, extra_context)
     
     def save_model(self, request, obj, form, change):
         """Personaliza el guardado desde el admin"""
@@ -49,6 +162,7 @@ class PedidoCafeAdmin(admin.ModelAdmin):
             logger.registrar(f"Admin: Creado nuevo pedido por usuario {request.user.username}")
         
         super().save_model(request, obj, form, change)
+        CacheRepresentaciones().invalidar(obj.id)
     
     def delete_model(self, request, obj):
         """Personaliza la eliminación desde el admin"""
@@ -57,7 +171,15 @@ class PedidoCafeAdmin(admin.ModelAdmin):
         logger = Logger()
         logger.registrar(f"Admin: Eliminado pedido {obj.id} por usuario {request.user.username}")
         
+        pedido_id = obj.id
         super().delete_model(request, obj)
+        CacheRepresentaciones().invalidar(pedido_id)
+    
+    def delete_queryset(self, request, queryset):
+        """Invalida la caché de representaciones al eliminar pedidos en bloque"""
+        pedido_ids = list(queryset.values_list('id', flat=True))
+        super().delete_queryset(request, queryset)
+        CacheRepresentaciones().invalidar(*pedido_ids)
 
 # Personalizar el admin site
 admin.site.site_header = "Administración de Pedidos de Café"
@@ -0,0 +1,260 @@
+"""
+Snapshot columnar de pedidos para análisis.
+
+Cada columna se guarda como un archivo binario de ancho fijo (orden de bytes
+nativo) y se lee con memoria mapeada, de modo que los agregados recorren
+arreglos contiguos en lugar de filas del ORM. Si numpy está instalado los
+cálculos se vectorizan; en caso contrario se usa una implementación en Python puro.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+from pedidos_cafe.codificacion import INGREDIENTES, TAMANIOS, TIPOS
+
+# Columnas del snapshot: nombre -> código de tipo de array/numpy
+COLUMNAS = {
+    "id": "q",            # int64
+    "tipo": "B",          # uint8, código de TIPOS
+    "tamanio": "B",       # uint8, código de TAMANIOS
+    "ingredientes": "B",  # uint8, máscara de bits de INGREDIENTES
+    "fecha": "q",         # int64, segundos desde epoch (UTC)
+    "precio": "d",        # float64
+}
+
+DTYPES_NUMPY = {"q": "int64", "B": "uint8", "d": "float64"}
+
+NOMBRE_META = "meta.json"
+
+
+class EscritorSnapshot:
+    """
+    Escribe un snapshot columnar por bloques, con memoria constante.
+    Los archivos se generan en un directorio temporal que reemplaza al destino al cerrar.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        self.temporal = self.directorio.with_name(self.directorio.name + ".tmp")
+        if self.temporal.exists():
+            shutil.rmtree(self.temporal)
+        self.temporal.mkdir(parents=True)
+        self._archivos = {
+            nombre: open(self.temporal / f"{nombre}.bin", "wb") for nombre in COLUMNAS
+        }
+        self.filas = 0
+
+    def agregar_bloque(self, columnas):
+        """
+        Agrega un bloque de filas.
+
+        Args:
+            columnas (dict): Nombre de columna -> secuencia de valores (todas del mismo largo)
+        """
+        largo = len(columnas["id"])
+        for nombre, codigo in COLUMNAS.items():
+            datos = columnas[nombre]
+            if len(datos) != largo:
+                raise ValueError(f"La columna '{nombre}' tiene {len(datos)} valores; se esperaban {largo}")
+            array(codigo, datos).tofile(self._archivos[nombre])
+        self.filas += largo
+
+    def cerrar(self):
+        """
+        Cierra los archivos, escribe meta.json y publica el snapshot.
+
+        Returns:
+            dict: Metadatos del snapshot
+        """
+        for archivo in self._archivos.values():
+            archivo.close()
+        meta = {
+            "filas": self.filas,
+            "generado": time.time(),
+            "orden_bytes": sys.byteorder,
+            "columnas": COLUMNAS,
+            "tipos": list(TIPOS),
+            "tamanios": list(TAMANIOS),
+            "ingredientes": list(INGREDIENTES),
+        }
+        (self.temporal / NOMBRE_META).write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+
+        if self.directorio.exists():
+            shutil.rmtree(self.directorio)
+        os.replace(self.temporal, self.directorio)
+        return meta
+
+
+class SnapshotPedidos:
+    """
+    Lectura de un snapshot columnar con memoria mapeada y agregados de análisis:
+    ingresos, mezcla por tipo y tamaño, frecuencia de ingredientes y series temporales.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        self.meta = json.loads((self.directorio / NOMBRE_META).read_text(encoding="utf-8"))
+        if self.meta["orden_bytes"] != sys.byteorder:
+            raise ValueError("El snapshot se generó con otro orden de bytes")
+        self.filas = self.meta["filas"]
+        self._mapas = []
+        self._columnas = {}
+
+    def columna(self, nombre):
+        """
+        Retorna una columna mapeada en memoria (numpy.memmap o memoryview).
+
+        Args:
+            nombre (str): Nombre de la columna
+        """
+        if nombre not in self._columnas:
+            codigo = self.meta["columnas"][nombre]
+            ruta = self.directorio / f"{nombre}.bin"
+            if np is not None:
+                if self.filas == 0:
+                    self._columnas[nombre] = np.zeros(0, dtype=DTYPES_NUMPY[codigo])
+                else:
+                    self._columnas[nombre] = np.memmap(ruta, dtype=DTYPES_NUMPY[codigo], mode="r")
+            else:
+                self._columnas[nombre] = self._mapear(ruta, codigo)
+        return self._columnas[nombre]
+
+    def ingresos_totales(self):
+        """Retorna la suma de precios de todos los pedidos"""
+        precio = self.columna("precio")
+        if np is not None:
+            return round(float(precio.sum()), 2)
+        return round(sum(precio), 2)
+
+    def mezcla(self, por="tipo"):
+        """
+        Retorna pedidos e ingresos agrupados por tipo o tamaño.
+
+        Args:
+            por (str): "tipo" o "tamanio"
+
+        Returns:
+            dict: Valor -> {"pedidos": int, "ingresos": float}
+        """
+        etiquetas = self.meta["tipos"] if por == "tipo" else self.meta["tamanios"]
+        codigos = self.columna(por)
+        precio = self.columna("precio")
+        if np is not None:
+            conteos = np.bincount(codigos, minlength=len(etiquetas))
+            ingresos = np.bincount(codigos, weights=precio, minlength=len(etiquetas))
+        else:
+            conteos = [0] * len(etiquetas)
+            ingresos = [0.0] * len(etiquetas)
+            for codigo, valor in zip(codigos, precio):
+                conteos[codigo] += 1
+                ingresos[codigo] += valor
+        return {
+            etiqueta: {"pedidos": int(conteos[i]), "ingresos": round(float(ingresos[i]), 2)}
+            for i, etiqueta in enumerate(etiquetas)
+        }
+
+    def mezcla_tipo_tamanio(self):
+        """Retorna el número de pedidos por combinación de tipo y tamaño"""
+        tipos, tamanios = self.meta["tipos"], self.meta["tamanios"]
+        tipo, tamanio = self.columna("tipo"), self.columna("tamanio")
+        if np is not None:
+            combinado = tipo.astype(np.int64) * len(tamanios) + tamanio
+            conteos = np.bincount(combinado, minlength=len(tipos) * len(tamanios))
+        else:
+            conteos = [0] * (len(tipos) * len(tamanios))
+            for a, b in zip(tipo, tamanio):
+                conteos[a * len(tamanios) + b] += 1
+        return {
+            f"{nombre_tipo}/{nombre_tamanio}": int(conteos[i * len(tamanios) + j])
+            for i, nombre_tipo in enumerate(tipos)
+            for j, nombre_tamanio in enumerate(tamanios)
+        }
+
+    def frecuencia_ingredientes(self):
+        """Retorna cuántos pedidos incluyen cada ingrediente"""
+        mascaras = self.columna("ingredientes")
+        if np is not None:
+            return {
+                ingrediente: int(np.count_nonzero(mascaras & (1 << bit)))
+                for bit, ingrediente in enumerate(self.meta["ingredientes"])
+            }
+        por_mascara = Counter(mascaras)
+        return {
+            ingrediente: sum(total for mascara, total in por_mascara.items() if mascara & (1 << bit))
+            for bit, ingrediente in enumerate(self.meta["ingredientes"])
+        }
+
+    def serie(self, segundos=3600):
+        """
+        Agrupa pedidos e ingresos en cubetas de tiempo.
+
+        Args:
+            segundos (int): Tamaño de la cubeta en segundos (3600 = hora)
+
+        Returns:
+            list: Cubetas {"inicio": epoch, "pedidos": int, "ingresos": float} con pedidos
+        """
+        fecha, precio = self.columna("fecha"), self.columna("precio")
+        if self.filas == 0:
+            return []
+        if np is not None:
+            inicio = int(fecha.min()) // segundos * segundos
+            cubetas = (fecha - inicio) // segundos
+            conteos = np.bincount(cubetas)
+            ingresos = np.bincount(cubetas, weights=precio)
+            indices = np.nonzero(conteos)[0]
+            return [
+                {"inicio": inicio + int(i) * segundos, "pedidos": int(conteos[i]),
+                 "ingresos": round(float(ingresos[i]), 2)}
+                for i in indices
+            ]
+        acumulado = {}
+        for valor_fecha, valor_precio in zip(fecha, precio):
+            clave = valor_fecha // segundos * segundos
+            pedidos, ingresos = acumulado.get(clave, (0, 0.0))
+            acumulado[clave] = (pedidos + 1, ingresos + valor_precio)
+        return [
+            {"inicio": clave, "pedidos": pedidos, "ingresos": round(ingresos, 2)}
+            for clave, (pedidos, ingresos) in sorted(acumulado.items())
+        ]
+
+    def resumen(self):
+        """Retorna los agregados principales del snapshot"""
+        return {
+            "filas": self.filas,
+            "ingresos_totales": self.ingresos_totales(),
+            "por_tipo": self.mezcla("tipo"),
+            "por_tamanio": self.mezcla("tamanio"),
+            "ingredientes": self.frecuencia_ingredientes(),
+        }
+
+    def cerrar(self):
+        """Libera los mapas de memoria"""
+        self._columnas.clear()
+        for mapa, vistas in self._mapas:
+            for vista in vistas:
+                vista.release()
+            mapa.close()
+        self._mapas.clear()
+
+    def _mapear(self, ruta, codigo):
+        if self.filas == 0:
+            return memoryview(array(codigo))
+        with open(ruta, "rb") as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        base = memoryview(mapa)
+        vista = base.cast(codigo)
+        self._mapas.append((mapa, (vista, base)))
+        return vista
@@ -4,3 +4,28 @@ from django.apps import AppConfig
 class PedidosCafeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pedidos_cafe'
+
+    def ready(self):
+        from django.conf import settings
+        from api_patrones.tracing import Tracer
+
+        Tracer().configurar(
+            habilitado=getattr(settings, 'TRAZAS_HABILITADAS', True),
+            capacidad=getattr(settings, 'TRAZAS_CAPACIDAD', 100),
+            muestreo=getattr(settings, 'TRAZAS_MUESTREO', 1.0),
+            max_spans=getattr(settings, 'TRAZAS_MAX_SPANS', 200),
+            detallado=getattr(settings, 'TRAZAS_DETALLADAS', False),
+        )
+
+        if getattr(settings, 'PRECALENTAR_CATALOGOS', True):
+            from pedidos_cafe.catalogo import precalentar_catalogos
+
+            # Precios, paquetes del Director y catálogos se construyen una sola
+            # vez al arrancar y no en la primera solicitud de cada proceso
+            precalentar_catalogos()
+
+        if getattr(settings, 'INGESTA_ASINCRONA', False):
+            from pedidos_cafe.ingesta import ColaIngesta
+
+            # Recupera los pedidos pendientes guardados en el último apagado
+            ColaIngesta()
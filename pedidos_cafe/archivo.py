@@ -0,0 +1,186 @@
+import gzip
+import json
+import os
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def interpretar_fecha(valor, fin_de_dia=False):
+    """
+    Convierte un texto ISO (fecha o fecha-hora) en un datetime con zona horaria UTC.
+
+    Args:
+        valor (str): Fecha "AAAA-MM-DD" o fecha-hora ISO 8601
+        fin_de_dia (bool): Si solo hay fecha, usa el final del día en lugar del inicio
+
+    Returns:
+        datetime: Fecha-hora con zona horaria, o None si valor está vacío
+
+    Raises:
+        ValueError: Si el texto no es una fecha válida
+    """
+    if not valor:
+        return None
+    fecha = parse_date(valor)
+    if fecha is not None:
+        fecha_hora = datetime.combine(fecha, dt_time.max if fin_de_dia else dt_time.min)
+    else:
+        fecha_hora = parse_datetime(valor)
+        if fecha_hora is None:
+            raise ValueError(f"Fecha '{valor}' no válida. Use AAAA-MM-DD o formato ISO 8601")
+    if fecha_hora.tzinfo is None:
+        fecha_hora = fecha_hora.replace(tzinfo=dt_timezone.utc)
+    return fecha_hora
+
+
+def _iso_utc(fecha):
+    # Formato fijo para que la comparación de textos equivalga a la de fechas
+    return fecha.astimezone(dt_timezone.utc).isoformat(timespec="microseconds")
+
+
+class ArchivoPedidos:
+    """
+    Archivo frío de pedidos en segmentos NDJSON comprimidos con gzip,
+    particionados por día (AAAA/MM/AAAA-MM-DD.ndjson.gz).
+    Un índice pequeño (indice.json) guarda el rango de ids y fechas de cada
+    segmento para leer solo los segmentos necesarios.
+    """
+    NOMBRE_INDICE = "indice.json"
+
+    _lock = Lock()
+
+    def __init__(self, directorio=None):
+        self.directorio = Path(directorio or getattr(
+            settings, 'ARCHIVO_PEDIDOS_DIR', settings.BASE_DIR / 'archivo_pedidos'
+        ))
+
+    @staticmethod
+    def pedido_a_registro(pedido):
+        """Convierte un PedidoCafe en el diccionario almacenado en el segmento"""
+        return {
+            "id": pedido.id,
+            "cliente": pedido.cliente,
+            "tipo_base": pedido.tipo_base,
+            "ingredientes": pedido.ingredientes,
+            "tamanio": pedido.tamanio,
+            "fecha": _iso_utc(pedido.fecha),
+        }
+
+    def leer_indice(self):
+        """Retorna la lista de segmentos registrados en el índice"""
+        ruta = self.directorio / self.NOMBRE_INDICE
+        if not ruta.exists():
+            return []
+        return json.loads(ruta.read_text(encoding="utf-8"))["segmentos"]
+
+    def escribir_segmento(self, dia, registros):
+        """
+        Escribe un segmento comprimido con los pedidos de un día y lo registra en el índice.
+        Si el índice ya tiene un segmento del mismo día con el mismo rango de ids
+        y número de pedidos (un archivado anterior falló antes de borrarlos),
+        lo retorna sin escribir otro.
+
+        Args:
+            dia (date): Día al que pertenecen los pedidos
+            registros (list): Diccionarios generados por pedido_a_registro()
+
+        Returns:
+            dict: Entrada del índice del nuevo segmento
+        """
+        carpeta = self.directorio / f"{dia:%Y}" / f"{dia:%m}"
+        carpeta.mkdir(parents=True, exist_ok=True)
+
+        clave = (dia.isoformat(), min(r["id"] for r in registros), max(r["id"] for r in registros), len(registros))
+        with self._lock:
+            for existente in self.leer_indice():
+                if (existente["dia"], existente["min_id"], existente["max_id"], existente["total"]) == clave:
+                    return existente
+
+            ruta = carpeta / f"{dia:%Y-%m-%d}.ndjson.gz"
+            numero = 1
+            while ruta.exists():
+                numero += 1
+                ruta = carpeta / f"{dia:%Y-%m-%d}-{numero}.ndjson.gz"
+
+            temporal = ruta.with_suffix(".tmp")
+            with gzip.open(temporal, "wt", encoding="utf-8") as archivo:
+                for registro in registros:
+                    archivo.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")))
+                    archivo.write("\n")
+            os.replace(temporal, ruta)
+
+            segmento = {
+                "archivo": ruta.relative_to(self.directorio).as_posix(),
+                "dia": clave[0],
+                "min_id": clave[1],
+                "max_id": clave[2],
+                "desde": min(r["fecha"] for r in registros),
+                "hasta": max(r["fecha"] for r in registros),
+                "total": len(registros),
+            }
+            segmentos = self.leer_indice()
+            segmentos.append(segmento)
+            segmentos.sort(key=lambda s: (s["dia"], s["min_id"]))
+            self._guardar_indice(segmentos)
+        return segmento
+
+    def buscar_por_id(self, pedido_id):
+        """
+        Busca un pedido archivado por id leyendo solo los segmentos cuyo rango lo contiene.
+
+        Returns:
+            dict: Registro del pedido o None si no está archivado
+        """
+        for segmento in self.leer_indice():
+            if segmento["min_id"] <= pedido_id <= segmento["max_id"]:
+                for registro in self._leer_segmento(segmento):
+                    if registro["id"] == pedido_id:
+                        return registro
+        return None
+
+    def buscar_por_rango(self, desde=None, hasta=None, limite=None):
+        """
+        Genera los pedidos archivados con fecha dentro de [desde, hasta].
+
+        Args:
+            desde (datetime): Fecha mínima (inclusive) o None
+            hasta (datetime): Fecha máxima (inclusive) o None
+            limite (int): Número máximo de registros
+
+        Yields:
+            dict: Registros en orden de fecha
+        """
+        desde_iso = _iso_utc(desde) if desde else None
+        hasta_iso = _iso_utc(hasta) if hasta else None
+        if limite is not None and limite <= 0:
+            return
+        entregados = 0
+        for segmento in self.leer_indice():
+            if desde_iso and segmento["hasta"] < desde_iso:
+                continue
+            if hasta_iso and segmento["desde"] > hasta_iso:
+                continue
+            for registro in self._leer_segmento(segmento):
+                if desde_iso and registro["fecha"] < desde_iso:
+                    continue
+                if hasta_iso and registro["fecha"] > hasta_iso:
+                    continue
+                yield registro
+                entregados += 1
+                if limite is not None and entregados >= limite:
+                    return
+
+    def _leer_segmento(self, segmento):
+        with gzip.open(self.directorio / segmento["archivo"], "rt", encoding="utf-8") as archivo:
+            for linea in archivo:
+                yield json.loads(linea)
+
+    def _guardar_indice(self, segmentos):
+        ruta = self.directorio / self.NOMBRE_INDICE
+        temporal = ruta.with_suffix(".tmp")
+        temporal.write_text(json.dumps({"segmentos": segmentos}, indent=1), encoding="utf-8")
+        os.replace(temporal, ruta)
@@ -1,4 +1,5 @@
 from api_patrones.logger import Logger
+from api_patrones.tracing import trazar, anotar
 
 class CafePersonalizadoBuilder:
     """
@@ -6,6 +7,66 @@ class CafePersonalizadoBuilder:
     Permite agregar ingredientes y ajustar el tamaño de manera fluida.
     """
     
+    # Precios de ingredientes adicionales
+    PRECIOS_INGREDIENTES = {
+        "canela": 1.0,
+        "chocolate": 2.0,
+        "vainilla": 1.5,
+        "azucar": 0.5,
+        "leche extra": 2.0,
+    }
+    
+    # Multiplicadores por tamaño
+    MULTIPLICADORES_TAMANIO = {
+        "pequeño": 1.0,
+        "mediano": 1.25,
+        "grande": 1.5,
+    }
+    
+    @classmethod
+    def codificar_ingredientes(cls, ingredientes):
+        """
+        Convierte una lista de ingredientes adicionales en una máscara de bits.
+        Cada ingrediente ocupa el bit de su posición en PRECIOS_INGREDIENTES.
+        
+        Args:
+            ingredientes (list): Ingredientes adicionales
+            
+        Returns:
+            int: Máscara con un bit por ingrediente presente
+            
+        Raises:
+            ValueError: Si algún ingrediente no es válido
+        """
+        bits = {ingrediente: 1 << bit for bit, ingrediente in enumerate(cls.PRECIOS_INGREDIENTES)}
+        mascara = 0
+        for ingrediente in ingredientes or ():
+            if ingrediente not in bits:
+                raise ValueError(
+                    f"Ingrediente '{ingrediente}' no válido. "
+                    f"Ingredientes válidos: {list(cls.PRECIOS_INGREDIENTES)}"
+                )
+            mascara |= bits[ingrediente]
+        return mascara
+
+    @classmethod
+    def decodificar_ingredientes(cls, mascara):
+        """
+        Convierte una máscara de bits en la lista de ingredientes, en orden de catálogo.
+        
+        Args:
+            mascara (int): Máscara generada por codificar_ingredientes()
+            
+        Returns:
+            list: Ingredientes presentes en la máscara
+        """
+        return [
+            ingrediente
+            for bit, ingrediente in enumerate(cls.PRECIOS_INGREDIENTES)
+            if mascara & (1 << bit)
+        ]
+
+    @trazar("Builder.__init__")
     def __init__(self, cafe_base):
         """
         Inicializa el builder con un café base.
@@ -18,25 +79,14 @@ class CafePersonalizadoBuilder:
         self.ingredientes = list(cafe_base.obtener_ingredientes_base())
         self.tamanio_aplicado = "pequeño"  # Tamaño por defecto
         
-        # Precios de ingredientes adicionales
-        self.precios_ingredientes = {
-            "canela": 1.0,
-            "chocolate": 2.0,
-            "vainilla": 1.5,
-            "azucar": 0.5,
-            "leche extra": 2.0,
-        }
-        
-        # Multiplicadores por tamaño
-        self.multiplicadores_tamanio = {
-            "pequeño": 1.0,
-            "mediano": 1.25,
-            "grande": 1.5,
-        }
+        # Copias por instancia de las tablas de precios y multiplicadores
+        self.precios_ingredientes = dict(self.PRECIOS_INGREDIENTES)
+        self.multiplicadores_tamanio = dict(self.MULTIPLICADORES_TAMANIO)
         
         logger = Logger()
         logger.registrar(f"Builder: Iniciado con café base '{cafe_base.obtener_nombre()}'")
 
+    @trazar("Builder.agregar_ingrediente")
     def agregar_ingrediente(self, ingrediente):
         """
         Agrega un ingrediente al café.
@@ -50,6 +100,7 @@ class CafePersonalizadoBuilder:
         Raises:
             ValueError: Si el ingrediente no es válido
         """
+        anotar(ingrediente=ingrediente)
         logger = Logger()
         
         if ingrediente not in self.precios_ingredientes:
@@ -65,6 +116,7 @@ class CafePersonalizadoBuilder:
         logger.registrar(f"Builder: Agregado ingrediente '{ingrediente}' (+${precio_ingrediente})")
         return self
 
+    @trazar("Builder.ajustar_tamanio")
     def ajustar_tamanio(self, tamanio):
         """
         Ajusta el tamaño del café y recalcula el precio.
@@ -78,6 +130,7 @@ class CafePersonalizadoBuilder:
         Raises:
             ValueError: Si el tamaño no es válido
         """
+        anotar(tamanio=tamanio)
         logger = Logger()
         
         if tamanio not in self.multiplicadores_tamanio:
@@ -146,6 +199,7 @@ class CafeDirector:
         logger = Logger()
         logger.registrar("Director: Inicializado con builder")
 
+    @trazar("Director.construir")
     def construir(self, ingredientes, tamanio):
         """
         Construye un café personalizado con ingredientes y tamaño específicos.
@@ -164,8 +218,10 @@ class CafeDirector:
         # Ajustar tamaño
         self.builder.ajustar_tamanio(tamanio)
         
+        anotar(precio=self.builder.obtener_precio())
         logger.registrar(f"Director: Construcción completada - Precio final: ${self.builder.obtener_precio()}")
 
+    @trazar("Director.construir_paquete_1")
     def construir_paquete_1(self):
         """Construye el paquete especial 1: Canela + Chocolate + Mediano"""
         logger = Logger()
@@ -176,6 +232,7 @@ class CafeDirector:
                 .agregar_ingrediente("chocolate")
                 .ajustar_tamanio("mediano"))
 
+    @trazar("Director.construir_paquete_2")
     def construir_paquete_2(self):
         """Construye el paquete especial 2: Vainilla + Azúcar + Grande"""
         logger = Logger()
@@ -186,6 +243,7 @@ class CafeDirector:
                 .agregar_ingrediente("azucar")
                 .ajustar_tamanio("grande"))
 
+    @trazar("Director.construir_paquete_3")
     def construir_paquete_3(self):
         """Construye el paquete especial 3: Leche Extra + Canela + Pequeño"""
         logger = Logger()
@@ -196,6 +254,7 @@ class CafeDirector:
                 .agregar_ingrediente("canela")
                 .ajustar_tamanio("pequeño"))
 
+    @trazar("Director.construir_cafe_premium")
     def construir_cafe_premium(self):
         """Construye un café premium con todos los ingredientes"""
         logger = Logger()
@@ -0,0 +1,155 @@
+"""
+Caché de TTL corto con protección contra estampidas sobre el caché de Django.
+
+Cada entrada guarda el valor junto con el instante en que se calculó y su
+vencimiento, y se conserva un periodo de gracia adicional después de vencer.
+Cuando vence, solo la solicitud que obtiene el bloqueo recalcula; las demás
+responden con el valor anterior. El bloqueo es cache.add, atómico en el backend
+de memoria local; en el de archivos add() consulta y luego escribe, así que
+ahí el bloqueo es un archivo creado con O_CREAT | O_EXCL junto al caché. Opcionalmente se refresca en segundo plano
+poco antes del vencimiento para que nadie espere el recálculo.
+"""
+
+import contextvars
+import os
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connections
+
+from api_patrones.logger import Logger
+
+
+class CacheConTTL:
+    """Valor calculado compartido entre solicitudes con vencimiento corto"""
+
+    # Vigencia máxima del bloqueo si quien recalcula falla sin liberarlo
+    BLOQUEO_SEGUNDOS = 30
+
+    # Intervalo de sondeo mientras otra solicitud calcula el primer valor
+    INTERVALO_ESPERA = 0.05
+
+    def __init__(self, clave, ttl, gracia=60, anticipacion=0, alias='default'):
+        """
+        Args:
+            clave (str): Clave de la entrada en el caché
+            ttl (float): Segundos en que el valor se considera fresco
+            gracia (float): Segundos adicionales en que se sirve el valor vencido
+            anticipacion (float): Segundos antes del vencimiento en que se
+                refresca en segundo plano (0 lo desactiva)
+            alias (str): Alias del caché de Django (settings.CACHES)
+        """
+        self.clave = clave
+        self.clave_bloqueo = f"{clave}:bloqueo"
+        self.ttl = ttl
+        self.gracia = gracia
+        self.anticipacion = anticipacion
+        self.cache = caches[alias]
+
+    def obtener(self, calcular):
+        """
+        Retorna el valor cacheado o lo calcula si corresponde.
+
+        Args:
+            calcular (callable): Función sin argumentos que calcula el valor
+
+        Returns:
+            tuple: (valor, edad en segundos, estado) donde estado es "fresco",
+                "vencido" (se sirvió el anterior mientras otro recalcula) o
+                "calculado"
+        """
+        if self.ttl <= 0:
+            return calcular(), 0.0, "calculado"
+
+        entrada = self.cache.get(self.clave)
+        ahora = time.time()
+        if entrada is not None and ahora < entrada["expira"]:
+            if self.anticipacion > 0 and ahora >= entrada["expira"] - self.anticipacion:
+                self._refrescar_en_segundo_plano(calcular)
+            return entrada["valor"], ahora - entrada["calculado"], "fresco"
+
+        if self._tomar_bloqueo():
+            try:
+                return self._recalcular(calcular), 0.0, "calculado"
+            finally:
+                self._liberar_bloqueo()
+
+        if entrada is not None:
+            return entrada["valor"], ahora - entrada["calculado"], "vencido"
+
+        # Nadie tiene todavía un valor: se espera al que está calculando
+        limite = ahora + self.BLOQUEO_SEGUNDOS
+        while time.time() < limite:
+            time.sleep(self.INTERVALO_ESPERA)
+            entrada = self.cache.get(self.clave)
+            if entrada is not None:
+                return entrada["valor"], time.time() - entrada["calculado"], "fresco"
+        return self._recalcular(calcular), 0.0, "calculado"
+
+    def invalidar(self):
+        """Descarta el valor cacheado"""
+        self.cache.delete(self.clave)
+
+    def _tomar_bloqueo(self):
+        """Retorna True si esta solicitud obtuvo el bloqueo de recálculo"""
+        if not isinstance(self.cache, FileBasedCache):
+            return self.cache.add(self.clave_bloqueo, 1, self.BLOQUEO_SEGUNDOS)
+
+        ruta = self._ruta_bloqueo()
+        for _ in range(2):
+            try:
+                os.close(os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                # Un bloqueo vencido (quien recalculaba terminó sin liberarlo) se descarta una vez
+                try:
+                    if time.time() - os.path.getmtime(ruta) < self.BLOQUEO_SEGUNDOS:
+                        return False
+                    os.unlink(ruta)
+                except FileNotFoundError:
+                    pass
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        return False
+
+    def _liberar_bloqueo(self):
+        if not isinstance(self.cache, FileBasedCache):
+            self.cache.delete(self.clave_bloqueo)
+            return
+        try:
+            os.unlink(self._ruta_bloqueo())
+        except FileNotFoundError:
+            pass
+
+    def _ruta_bloqueo(self):
+        # Fuera de los *.djcache para que el backend no lo cuente ni lo descarte
+        return self.cache._key_to_file(self.clave_bloqueo) + ".bloqueo"
+
+    def _recalcular(self, calcular):
+        valor = calcular()
+        calculado = time.time()
+        self.cache.set(
+            self.clave,
+            {"valor": valor, "calculado": calculado, "expira": calculado + self.ttl},
+            self.ttl + self.gracia,
+        )
+        return valor
+
+    def _refrescar_en_segundo_plano(self, calcular):
+        if not self._tomar_bloqueo():
+            return
+        # Conserva el contexto (p. ej. lecturas en réplica) de la solicitud actual
+        contexto = contextvars.copy_context()
+
+        def refrescar():
+            try:
+                contexto.run(self._recalcular, calcular)
+            except Exception as e:
+                Logger().registrar(f"ERROR en refresco anticipado de '{self.clave}': {e}")
+            finally:
+                self._liberar_bloqueo()
+                connections.close_all()
+
+        threading.Thread(target=refrescar, name=f"refresco-{self.clave}", daemon=True).start()
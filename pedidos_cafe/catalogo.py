@@ -0,0 +1,136 @@
+"""
+Respuestas precompiladas de los catálogos de la API (tipos de café,
+ingredientes y tamaños) y precalentamiento de los catálogos al arrancar.
+
+Los catálogos solo cambian si se registra un tipo nuevo en el Factory, así
+que se construyen una vez (en PedidosCafeConfig.ready()) y se sirven como
+FragmentoJSON ya codificado. Así la primera solicitud de un proceso nuevo
+no paga la construcción del catálogo.
+"""
+
+import time
+from threading import Lock
+
+from api_patrones.logger import Logger
+from api_patrones.renderers import FragmentoJSON
+from pedidos_cafe.builder import CafePersonalizadoBuilder
+from pedidos_cafe.codificacion import TIPOS, precio_base
+from pedidos_cafe.factory import CafeFactory
+from pedidos_cafe.recetas import CatalogoRecetas
+
+
+class CatalogoRespuestas:
+    """
+    Patrón Singleton con las respuestas de los endpoints de catálogo
+    precodificadas, recompiladas si cambian los tipos del Factory.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(CatalogoRespuestas, cls).__new__(cls)
+                    instancia._compilado = None
+                    instancia._lock_compilacion = Lock()
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def precompilar(self):
+        """
+        Construye las respuestas de los catálogos.
+
+        Returns:
+            dict: FragmentoJSON por endpoint ("tipos_cafe", "ingredientes_disponibles",
+                "tamanios_disponibles") y los tipos con que se compilaron ("tipos")
+        """
+        tipos = tuple(CafeFactory.obtener_tipos_disponibles())
+        compilado = self._compilado
+        if compilado is not None and compilado["tipos"] == tipos:
+            return compilado
+
+        with self._lock_compilacion:
+            if self._compilado is not None and self._compilado["tipos"] == tipos:
+                return self._compilado
+            self._compilado = {
+                "tipos": tipos,
+                "tipos_cafe": FragmentoJSON(self._tipos_cafe(tipos)),
+                "ingredientes_disponibles": FragmentoJSON(self._ingredientes()),
+                "tamanios_disponibles": FragmentoJSON(self._tamanios()),
+            }
+        Logger().registrar(f"Catálogo: Precompiladas las respuestas para {len(tipos)} tipos de café")
+        return self._compilado
+
+    def obtener(self, nombre):
+        """
+        Retorna la respuesta precompilada de un catálogo.
+
+        Args:
+            nombre (str): Nombre del endpoint de catálogo
+
+        Returns:
+            FragmentoJSON: Cuerpo de la respuesta
+        """
+        return self.precompilar()[nombre]
+
+    @staticmethod
+    def _tipos_cafe(tipos):
+        logger = Logger()
+        tipos_detallados = []
+        for tipo in tipos:
+            try:
+                cafe_base = CafeFactory.obtener_base(tipo)
+                tipos_detallados.append({
+                    "nombre": tipo,
+                    "nombre_display": cafe_base.obtener_nombre(),
+                    "precio_base": cafe_base.precio_base(),
+                    "ingredientes_base": cafe_base.obtener_ingredientes_base()
+                })
+            except Exception as e:
+                logger.registrar(f"ERROR al obtener info de {tipo}: {str(e)}")
+        return {
+            "tipos_disponibles": tipos_detallados,
+            "total_tipos": len(tipos_detallados)
+        }
+
+    @staticmethod
+    def _ingredientes():
+        ingredientes = [
+            {"nombre": ingrediente, "precio_adicional": precio}
+            for ingrediente, precio in CafePersonalizadoBuilder.PRECIOS_INGREDIENTES.items()
+        ]
+        return {
+            "ingredientes_disponibles": ingredientes,
+            "total_ingredientes": len(ingredientes)
+        }
+
+    @staticmethod
+    def _tamanios():
+        tamanios = [
+            {"nombre": tamanio, "multiplicador": multiplicador}
+            for tamanio, multiplicador in CafePersonalizadoBuilder.MULTIPLICADORES_TAMANIO.items()
+        ]
+        return {
+            "tamanios_disponibles": tamanios,
+            "total_tamanios": len(tamanios)
+        }
+
+
+def precalentar_catalogos():
+    """
+    Prepara lo que necesita la primera solicitud de un proceso nuevo: la
+    tabla de precios base de codificacion, las recetas del Director y las
+    respuestas de los catálogos.
+
+    Returns:
+        float: Milisegundos empleados
+    """
+    inicio = time.perf_counter()
+    for tipo in TIPOS:
+        precio_base(tipo)
+    CatalogoRecetas().precompilar()
+    CatalogoRespuestas().precompilar()
+    duracion = (time.perf_counter() - inicio) * 1000
+    Logger().registrar(f"Arranque: Catálogos precalentados en {duracion:.1f} ms")
+    return duracion
@@ -0,0 +1,71 @@
+"""
+Codificación compacta del catálogo de pedidos.
+
+Asigna códigos enteros estables a tipos de café y tamaños, y un bit a cada
+ingrediente adicional. La usan la columna indexada de ingredientes del modelo,
+el snapshot columnar y los cálculos de precio que no necesitan recorrer el
+Builder paso a paso.
+"""
+
+from functools import lru_cache
+
+from pedidos_cafe.builder import CafePersonalizadoBuilder
+
+# El orden define el código: no reordenar, solo agregar al final
+TIPOS = ("espresso", "americano", "latte")
+TAMANIOS = ("pequeño", "mediano", "grande")
+INGREDIENTES = tuple(CafePersonalizadoBuilder.PRECIOS_INGREDIENTES)
+
+CODIGOS_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+CODIGOS_TAMANIO = {tamanio: codigo for codigo, tamanio in enumerate(TAMANIOS)}
+BITS_INGREDIENTE = {ingrediente: 1 << bit for bit, ingrediente in enumerate(INGREDIENTES)}
+
+# La máscara de ingredientes la define el Builder; se reexporta aquí
+codificar_ingredientes = CafePersonalizadoBuilder.codificar_ingredientes
+decodificar_ingredientes = CafePersonalizadoBuilder.decodificar_ingredientes
+
+
+def mascaras_con(requerida):
+    """
+    Enumera todas las máscaras que contienen los bits de `requerida`.
+    Con pocos ingredientes la lista es corta y permite filtrar con IN
+    sobre la columna indexada en lugar de una operación bit a bit.
+
+    Args:
+        requerida (int): Bits que deben estar presentes
+
+    Returns:
+        list: Máscaras posibles que incluyen todos los bits requeridos
+    """
+    return [mascara for mascara in range(1 << len(INGREDIENTES)) if mascara & requerida == requerida]
+
+
+@lru_cache(maxsize=None)
+def precio_base(tipo):
+    """Retorna el precio base de un tipo de café sin pasar por el Factory"""
+    from pedidos_cafe.factory import CafeFactory
+
+    cafe = CafeFactory._tipos_cafe[tipo]()
+    cafe.inicializar()
+    return cafe.precio_base()
+
+
+def calcular_precio(tipo, ingredientes, tamanio):
+    """
+    Calcula el precio final con las mismas reglas que CafeDirector.construir(),
+    sin crear objetos ni registrar logs.
+
+    Args:
+        tipo (str): Tipo de café base
+        ingredientes (list): Ingredientes adicionales
+        tamanio (str): Tamaño del café
+
+    Returns:
+        float: Precio final redondeado a 2 decimales
+    """
+    precios = CafePersonalizadoBuilder.PRECIOS_INGREDIENTES
+    subtotal = precio_base(tipo)
+    # Suma en el mismo orden que el Builder para obtener exactamente el mismo redondeo
+    for ingrediente in ingredientes or ():
+        subtotal += precios[ingrediente]
+    return round(subtotal * CafePersonalizadoBuilder.MULTIPLICADORES_TAMANIO[tamanio], 2)
@@ -0,0 +1,206 @@
+"""
+Publicación en proceso de los cambios de pedidos para el flujo Server-Sent Events.
+
+Los cambios se publican al confirmarse la transacción que los registra
+(CambioPedido.registrar) y se reparten a cada suscriptor en su propio buffer
+acotado. Los suscriptores viven en el event loop del servidor ASGI y los
+publicadores en cualquier hilo, por eso la entrega pasa por
+loop.call_soon_threadsafe(). El identificador de cada evento es la secuencia
+del registro de cambios, lo que permite reanudar con Last-Event-ID.
+"""
+
+import asyncio
+from collections import deque
+from threading import Lock
+
+from django.conf import settings
+
+from api_patrones.logger import Logger
+
+CAMPOS_EVENTO = ("id", "cliente", "tipo_base", "ingredientes", "tamanio", "fecha", "version")
+
+
+class Suscriptor:
+    """
+    Buffer acotado de eventos de un cliente. Si el cliente no consume a tiempo
+    y el buffer se llena, se marca como lento y se cierra: al reconectar
+    retoma desde su último evento con Last-Event-ID.
+    """
+
+    def __init__(self, loop, capacidad):
+        self.loop = loop
+        self.capacidad = capacidad
+        self.pendientes = deque()
+        self.senal = asyncio.Event()
+        self.lento = False
+        self.cerrado = False
+
+    def _entregar(self, eventos):
+        # Se ejecuta en el event loop del suscriptor
+        if self.cerrado:
+            return
+        if len(self.pendientes) + len(eventos) > self.capacidad:
+            self.lento = True
+            self.cerrado = True
+            self.pendientes.clear()
+        else:
+            self.pendientes.extend(eventos)
+        self.senal.set()
+
+    def cerrar(self):
+        """Cierra el suscriptor y despierta al consumidor"""
+        self.cerrado = True
+        self.senal.set()
+
+    async def siguientes(self, espera):
+        """
+        Espera nuevos eventos.
+
+        Args:
+            espera (float): Segundos máximos de espera
+
+        Returns:
+            list: Eventos pendientes (vacía si venció la espera o está cerrado)
+        """
+        try:
+            await asyncio.wait_for(self.senal.wait(), espera)
+        except asyncio.TimeoutError:
+            return []
+        self.senal.clear()
+        eventos = list(self.pendientes)
+        self.pendientes.clear()
+        return eventos
+
+
+class BusEventos:
+    """
+    Patrón Singleton que reparte los eventos de pedidos a los suscriptores
+    del proceso actual (fan-out en memoria).
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(BusEventos, cls).__new__(cls)
+                    instancia.capacidad = getattr(settings, 'EVENTOS_BUFFER_MAXIMO', 256)
+                    instancia._suscriptores = set()
+                    instancia._lock_suscriptores = Lock()
+                    instancia.publicados = 0
+                    instancia.desconectados_lentos = 0
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def suscribir(self, loop):
+        """
+        Registra un suscriptor que recibirá los eventos en el loop indicado.
+
+        Args:
+            loop (AbstractEventLoop): Event loop del consumidor
+
+        Returns:
+            Suscriptor: Buffer de eventos del cliente
+        """
+        suscriptor = Suscriptor(loop, self.capacidad)
+        with self._lock_suscriptores:
+            self._suscriptores.add(suscriptor)
+        return suscriptor
+
+    def cancelar(self, suscriptor):
+        """Elimina un suscriptor del reparto"""
+        with self._lock_suscriptores:
+            self._suscriptores.discard(suscriptor)
+        if suscriptor.lento:
+            self.desconectados_lentos += 1
+            Logger().registrar("Eventos: Cliente desconectado por no consumir a tiempo")
+
+    def hay_suscriptores(self):
+        """Indica si hay algún suscriptor activo"""
+        return bool(self._suscriptores)
+
+    def publicar(self, eventos):
+        """
+        Entrega una lista de eventos a todos los suscriptores.
+
+        Args:
+            eventos (list): Eventos construidos con construir_eventos()
+        """
+        if not eventos:
+            return
+        with self._lock_suscriptores:
+            suscriptores = list(self._suscriptores)
+        for suscriptor in suscriptores:
+            try:
+                suscriptor.loop.call_soon_threadsafe(suscriptor._entregar, eventos)
+            except RuntimeError:
+                # El loop del suscriptor ya se cerró
+                self.cancelar(suscriptor)
+        self.publicados += len(eventos)
+
+    def estadisticas(self):
+        """Retorna los contadores del bus"""
+        return {
+            "suscriptores": len(self._suscriptores),
+            "publicados": self.publicados,
+            "desconectados_lentos": self.desconectados_lentos,
+        }
+
+
+def construir_eventos(cambios):
+    """
+    Convierte registros de CambioPedido en eventos con los datos básicos del pedido.
+    Usa una sola consulta para todos los pedidos vigentes del lote.
+
+    Args:
+        cambios (list): Instancias de CambioPedido en orden de secuencia
+
+    Returns:
+        list: Eventos {"secuencia", "operacion", "pedido_id", "pedido"}
+    """
+    from pedidos_cafe.models import CambioPedido, PedidoCafe
+
+    pedido_ids = {cambio.pedido_id for cambio in cambios if cambio.operacion != CambioPedido.ELIMINADO}
+    vigentes = {}
+    if pedido_ids:
+        for pedido in PedidoCafe.objects.filter(id__in=pedido_ids).values(*CAMPOS_EVENTO):
+            pedido["fecha"] = pedido["fecha"].isoformat()
+            vigentes[pedido["id"]] = pedido
+
+    return [
+        {
+            "secuencia": cambio.secuencia,
+            "operacion": cambio.operacion,
+            "pedido_id": cambio.pedido_id,
+            "pedido": vigentes.get(cambio.pedido_id),
+        }
+        for cambio in cambios
+    ]
+
+
+def eventos_desde(secuencia, limite=500):
+    """
+    Lee del registro de cambios los eventos posteriores a una secuencia
+    (reanudación con Last-Event-ID).
+
+    Args:
+        secuencia (int): Último evento recibido por el cliente
+        limite (int): Máximo de eventos a leer
+
+    Returns:
+        list: Eventos en orden de secuencia
+    """
+    from pedidos_cafe.models import CambioPedido
+
+    return construir_eventos(list(CambioPedido.objects.filter(secuencia__gt=secuencia)[:limite]))
+
+
+def publicar_cambios(cambios):
+    """
+    Publica los cambios registrados. Se invoca con transaction.on_commit()
+    y no consulta la base si nadie está suscrito.
+    """
+    bus = BusEventos()
+    if bus.hay_suscriptores():
+        bus.publicar(construir_eventos(cambios))
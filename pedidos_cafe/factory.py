@@ -1,5 +1,6 @@
 from pedidos_cafe.base import Espresso, Americano, Latte, CafeBase
 from api_patrones.logger import Logger
+from api_patrones.tracing import trazar, anotar
 
 class CafeFactory:
     """
@@ -15,6 +16,7 @@ class CafeFactory:
     }
 
     @staticmethod
+    @trazar("Factory.obtener_base")
     def obtener_base(tipo):
         """
         Crea y retorna una instancia del tipo de café especificado.
@@ -28,6 +30,7 @@ class CafeFactory:
         Raises:
             ValueError: Si el tipo de café no es válido
         """
+        anotar(tipo=tipo)
         logger = Logger()
         
         # Validar tipo de café
@@ -0,0 +1,108 @@
+"""
+Filtros y ordenamiento de la lista de pedidos (GET /api/pedidos/).
+
+Solo se aceptan combinaciones de filtros que resuelve un índice de
+PedidoCafe: los filtros de igualdad forman el prefijo del índice y la
+fecha es siempre su última columna, de modo que el rango ?desde=&hasta= y
+el orden por fecha se recorren sobre el índice sin leer filas ajenas al
+resultado. Las combinaciones sin índice se rechazan en lugar de degradar
+a un recorrido completo de la tabla.
+
+?cliente= e ?ingrediente= se expanden a un IN sobre varias claves del
+índice: el rango de fechas se resuelve dentro de cada clave, pero el orden
+global exigiría ordenar en memoria, por lo que no admiten ?ordenar=.
+"""
+
+from pedidos_cafe.archivo import interpretar_fecha
+
+# Filtros de igualdad combinables -> índice que los resuelve
+INDICES_FILTROS = {
+    frozenset(): "índice de fecha",
+    frozenset({"tipo_base"}): "pedido_tipo_fecha_idx",
+    frozenset({"tamanio"}): "pedido_tamanio_fecha_idx",
+    frozenset({"tipo_base", "tamanio"}): "pedido_tipo_tam_fecha_idx",
+    frozenset({"cliente"}): "pedido_cliente_fecha_idx",
+    frozenset({"ingrediente"}): "pedido_ingred_fecha_idx",
+}
+
+# Valores de ?ordenar= admitidos y su ORDER BY (id desempata fechas iguales)
+ORDENAMIENTOS = {
+    "fecha": ("fecha", "id"),
+    "-fecha": ("-fecha", "-id"),
+    "id": ("id",),
+    "-id": ("-id",),
+}
+
+# Los índices compuestos terminan en fecha: con filtros solo se ordena por fecha
+ORDENAMIENTOS_SIN_FILTROS = {"id", "-id"}
+
+# Filtros que se resuelven con un IN sobre varias claves del índice
+FILTROS_SIN_ORDEN = {"cliente", "ingrediente"}
+
+
+def filtros_activos(parametros):
+    """Retorna los filtros de igualdad presentes en los parámetros"""
+    return frozenset(
+        nombre
+        for nombre in ("tipo_base", "tamanio", "cliente", "ingrediente")
+        if parametros.get(nombre)
+    )
+
+
+def filtrar_pedidos(queryset, parametros):
+    """
+    Aplica los filtros y el orden de la lista de pedidos.
+
+    Args:
+        queryset (PedidoCafeQuerySet): Pedidos a filtrar
+        parametros (QueryDict): Parámetros de la solicitud: tipo_base,
+            tamanio, cliente, ingrediente (repetible), desde, hasta y ordenar
+
+    Returns:
+        PedidoCafeQuerySet: Pedidos filtrados y ordenados
+
+    Raises:
+        ValueError: Si algún valor no es válido o la combinación de
+            filtros u orden no tiene un índice que la resuelva
+    """
+    activos = filtros_activos(parametros)
+    if activos not in INDICES_FILTROS:
+        combinables = ", ".join(
+            "+".join(sorted(filtros)) for filtros in INDICES_FILTROS if filtros
+        )
+        raise ValueError(
+            f"La combinación de filtros {'+'.join(sorted(activos))} no tiene índice. "
+            f"Combinaciones válidas: {combinables} (cada una con desde/hasta)"
+        )
+
+    modelo = queryset.model
+    for campo in ("tipo_base", "tamanio"):
+        if campo in activos:
+            valor = parametros.get(campo)
+            validos = [opcion for opcion, _ in modelo._meta.get_field(campo).choices]
+            if valor not in validos:
+                raise ValueError(f"{campo} '{valor}' no válido. Valores válidos: {', '.join(validos)}")
+            queryset = queryset.filter(**{campo: valor})
+
+    if "cliente" in activos:
+        queryset = queryset.buscar_cliente(parametros.get("cliente"))
+    if "ingrediente" in activos:
+        queryset = queryset.con_ingredientes(parametros.getlist("ingrediente"))
+
+    desde = interpretar_fecha(parametros.get("desde"))
+    hasta = interpretar_fecha(parametros.get("hasta"), fin_de_dia=True)
+    if desde is not None:
+        queryset = queryset.filter(fecha__gte=desde)
+    if hasta is not None:
+        queryset = queryset.filter(fecha__lte=hasta)
+
+    ordenar = parametros.get("ordenar")
+    if ordenar:
+        if ordenar not in ORDENAMIENTOS:
+            raise ValueError(f"Orden '{ordenar}' no válido. Valores válidos: {', '.join(ORDENAMIENTOS)}")
+        if ordenar in ORDENAMIENTOS_SIN_FILTROS and (activos or desde or hasta):
+            raise ValueError(f"El orden '{ordenar}' solo se admite sin filtros; use 'fecha' o '-fecha'")
+        if activos & FILTROS_SIN_ORDEN:
+            raise ValueError(f"Los filtros {', '.join(sorted(FILTROS_SIN_ORDEN))} no admiten 'ordenar'")
+        queryset = queryset.order_by(*ORDENAMIENTOS[ordenar])
+    return queryset
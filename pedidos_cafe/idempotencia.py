@@ -0,0 +1,163 @@
+import hashlib
+import json
+import random
+import time
+from datetime import timedelta
+from threading import Lock
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from pedidos_cafe.models import ClaveIdempotencia
+
+
+class AlmacenIdempotencia:
+    """
+    Patrón Singleton que almacena en la base de datos las respuestas asociadas
+    a claves Idempotency-Key, de modo que todos los workers las comparten.
+    Expira por TTL, está acotado a IDEMPOTENCIA_MAX_ENTRADAS filas y agrupa las
+    solicitudes duplicadas en curso: la fila reservada actúa como bloqueo y
+    solo su propietario ejecuta la operación.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(AlmacenIdempotencia, cls).__new__(cls)
+                    instancia.ttl = getattr(settings, 'IDEMPOTENCIA_TTL_SEGUNDOS', 24 * 3600)
+                    instancia.reserva_maxima = getattr(settings, 'IDEMPOTENCIA_RESERVA_MAXIMA_SEGUNDOS', 60)
+                    instancia.max_entradas = getattr(settings, 'IDEMPOTENCIA_MAX_ENTRADAS', 10000)
+                    instancia.purga_cada = getattr(settings, 'IDEMPOTENCIA_PURGA_CADA', 100)
+                    cls._instancia = instancia
+        return cls._instancia
+
+    @staticmethod
+    def calcular_huella(metodo, ruta, datos):
+        """
+        Calcula la huella de una solicitud para detectar claves reutilizadas
+        con un cuerpo distinto.
+
+        Args:
+            metodo (str): Método HTTP
+            ruta (str): Ruta solicitada
+            datos: Cuerpo de la solicitud ya parseado
+
+        Returns:
+            str: Hash SHA-256 de la solicitud
+        """
+        cuerpo = json.dumps(datos, sort_keys=True, default=str)
+        return hashlib.sha256(f"{metodo}\n{ruta}\n{cuerpo}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def calcular_clave(usuario, clave):
+        """Retorna la clave almacenada (de largo fijo) para un usuario y una Idempotency-Key"""
+        return hashlib.sha256(f"{usuario}\n{clave}".encode("utf-8")).hexdigest()
+
+    def reservar(self, clave, huella):
+        """
+        Obtiene la entrada de una clave o la reserva si no existe.
+        La reserva se confirma de inmediato para que los demás workers la vean.
+        Una reserva sin respuesta más antigua que IDEMPOTENCIA_RESERVA_MAXIMA_SEGUNDOS
+        (su propietario terminó sin completarla) puede tomarse de nuevo.
+        Una de cada IDEMPOTENCIA_PURGA_CADA reservas purga las claves vencidas.
+
+        Args:
+            clave (str): Clave calculada con calcular_clave()
+            huella (str): Huella de la solicitud
+
+        Returns:
+            tuple: (ClaveIdempotencia, bool) donde el bool indica si el llamador
+                   es el propietario y debe ejecutar la operación
+        """
+        ahora = timezone.now()
+        if random.random() * self.purga_cada < 1:
+            self.purgar(ahora)
+        try:
+            with transaction.atomic():
+                return ClaveIdempotencia.objects.create(clave=clave, huella=huella, creada=ahora), True
+        except IntegrityError:
+            pass
+
+        entrada = ClaveIdempotencia.objects.get(clave=clave)
+        vencida = ahora - timedelta(seconds=self.reserva_maxima)
+        if entrada.status is None and entrada.huella == huella and entrada.creada < vencida:
+            tomada = ClaveIdempotencia.objects.filter(
+                pk=entrada.pk, status__isnull=True, creada=entrada.creada
+            ).update(creada=ahora)
+            if tomada:
+                entrada.creada = ahora
+                return entrada, True
+        return entrada, False
+
+    def purgar(self, ahora=None):
+        """
+        Elimina las claves vencidas por TTL y, si quedan más de
+        IDEMPOTENCIA_MAX_ENTRADAS, las más antiguas. Las reservas todavía en
+        curso se conservan para no permitir una segunda ejecución.
+
+        Args:
+            ahora (datetime, optional): Instante de referencia
+
+        Returns:
+            int: Número de claves eliminadas
+        """
+        ahora = ahora or timezone.now()
+        eliminadas, _ = ClaveIdempotencia.objects.filter(
+            creada__lt=ahora - timedelta(seconds=self.ttl)
+        ).delete()
+
+        corte = (
+            ClaveIdempotencia.objects.order_by('-creada')
+            .values_list('creada', flat=True)[self.max_entradas:self.max_entradas + 1].first()
+        )
+        if corte is not None:
+            en_curso = Q(status__isnull=True, creada__gte=ahora - timedelta(seconds=self.reserva_maxima))
+            excedentes, _ = ClaveIdempotencia.objects.filter(creada__lte=corte).exclude(en_curso).delete()
+            eliminadas += excedentes
+        return eliminadas
+
+    def esperar(self, entrada, segundos):
+        """
+        Espera a que el propietario complete la respuesta de una clave.
+
+        Args:
+            entrada (ClaveIdempotencia): Entrada reservada por otra solicitud
+            segundos (float): Tiempo máximo de espera
+
+        Returns:
+            ClaveIdempotencia: Entrada actualizada (status None si sigue en curso
+                o si el propietario la abandonó)
+        """
+        limite = time.monotonic() + segundos
+        pausa = 0.01
+        while entrada.status is None and time.monotonic() < limite:
+            time.sleep(pausa)
+            pausa = min(pausa * 2, 0.2)
+            actual = ClaveIdempotencia.objects.filter(pk=entrada.pk).first()
+            if actual is None:
+                break
+            entrada = actual
+        return entrada
+
+    def completar(self, clave, status, datos, headers=None):
+        """
+        Guarda la respuesta de una clave. Se llama en la misma transacción que
+        la operación, para que la respuesta quede registrada si y solo si la
+        operación se confirma.
+        """
+        ClaveIdempotencia.objects.filter(clave=clave).update(
+            status=status, respuesta=datos, cabeceras=dict(headers or {})
+        )
+
+    def abandonar(self, clave):
+        """Descarta una clave cuya ejecución falló para permitir reintentos"""
+        ClaveIdempotencia.objects.filter(clave=clave, status__isnull=True).delete()
+
+    def total_entradas(self):
+        """Retorna el número de claves almacenadas"""
+        return ClaveIdempotencia.objects.count()
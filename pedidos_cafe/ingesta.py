@@ -0,0 +1,318 @@
+import atexit
+import json
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from threading import Condition, Lock, Thread
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from api_patrones.logger import Logger
+from api_patrones.tracing import Tracer
+
+
+class ColaIngesta:
+    """
+    Cola de ingesta con escritura diferida (write-behind) para pedidos validados.
+    Acumula pedidos en memoria y un hilo en segundo plano los confirma en lotes
+    con bulk_create, al alcanzar el tamaño de lote o el intervalo de tiempo.
+    Implementada como Singleton para compartir la cola en todo el proceso.
+
+    Cada worker tiene su propia cola, pero el estado de los tickets se guarda
+    en la base de datos (TicketIngesta), así que cualquier worker puede
+    responder por un ticket emitido por otro.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    ESTADO_EN_COLA = "en_cola"
+    ESTADO_CONFIRMADO = "confirmado"
+    ESTADO_ERROR = "error"
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(ColaIngesta, cls).__new__(cls)
+                    instancia._inicializar()
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def _inicializar(self):
+        self.tamanio_lote = getattr(settings, 'INGESTA_TAMANIO_LOTE', 100)
+        self.intervalo = getattr(settings, 'INGESTA_INTERVALO_SEGUNDOS', 0.5)
+        self.ttl_tickets = getattr(settings, 'INGESTA_TICKET_TTL_SEGUNDOS', 24 * 3600)
+        self.archivo_pendientes = Path(getattr(
+            settings, 'INGESTA_ARCHIVO_PENDIENTES', settings.BASE_DIR / 'ingesta_pendientes.json'
+        ))
+        self._pendientes = []
+        # Archivo .recuperando -> tickets suyos aún sin confirmar
+        self._recuperados = {}
+        self._condicion = Condition()
+        self._hilo = None
+        self._detenida = False
+        self._recuperar_pendientes()
+        atexit.register(self.detener)
+
+    def encolar(self, datos):
+        """
+        Agrega un pedido ya validado a la cola de ingesta.
+
+        Args:
+            datos (dict): Datos validados por PedidoCafeSerializer
+
+        Returns:
+            str: Ticket para consultar el estado del pedido
+        """
+        from pedidos_cafe.models import TicketIngesta
+
+        ticket = uuid.uuid4().hex
+        # Se registra antes de encolarlo, para que el hilo de vaciado no pueda confirmarlo antes
+        TicketIngesta.objects.create(ticket=ticket, estado=self.ESTADO_EN_COLA, actualizado=timezone.now())
+        with self._condicion:
+            if self._detenida:
+                raise RuntimeError("La cola de ingesta está detenida")
+            self._pendientes.append((ticket, dict(datos)))
+            if len(self._pendientes) >= self.tamanio_lote:
+                self._condicion.notify()
+        self._asegurar_hilo()
+
+        Logger().registrar(f"Ingesta: Pedido encolado con ticket {ticket}")
+        return ticket
+
+    def obtener_estado(self, ticket):
+        """
+        Retorna el estado de un ticket o None si no existe.
+
+        Args:
+            ticket (str): Ticket devuelto por encolar()
+
+        Returns:
+            dict: Estado del ticket
+        """
+        from pedidos_cafe.models import TicketIngesta
+
+        fila = TicketIngesta.objects.filter(ticket=ticket).first()
+        if fila is None:
+            return None
+        estado = {
+            "ticket": fila.ticket,
+            "estado": fila.estado,
+            "pedido_id": fila.pedido_id,
+            "actualizado": fila.actualizado.timestamp(),
+        }
+        if fila.estado == self.ESTADO_ERROR:
+            estado["error"] = fila.error
+        return estado
+
+    def pendientes(self):
+        """Retorna el número de pedidos pendientes de confirmar"""
+        with self._condicion:
+            return len(self._pendientes)
+
+    def vaciar(self):
+        """
+        Confirma inmediatamente todos los pedidos pendientes.
+
+        Returns:
+            int: Número de pedidos confirmados
+        """
+        total = 0
+        while True:
+            with self._condicion:
+                lote = self._pendientes[:self.tamanio_lote]
+                del self._pendientes[:self.tamanio_lote]
+            if not lote:
+                return total
+            confirmados = self._confirmar_lote(lote)
+            if confirmados is None:
+                return total
+            total += confirmados
+
+    def detener(self):
+        """
+        Detiene el hilo de vaciado y confirma los pedidos pendientes.
+        Si la base de datos no está disponible, los pendientes se guardan en disco
+        y se recuperan en el siguiente arranque.
+        """
+        with self._condicion:
+            if self._detenida:
+                return
+            self._detenida = True
+            self._condicion.notify_all()
+        if self._hilo is not None:
+            self._hilo.join(timeout=self.intervalo * 10)
+
+        try:
+            self.vaciar()
+        finally:
+            self._guardar_pendientes()
+            # Lo que quedaba de los archivos recuperados ya está en el archivo nuevo
+            for archivo in list(self._recuperados):
+                archivo.unlink(missing_ok=True)
+            self._recuperados.clear()
+
+    def _asegurar_hilo(self):
+        with self._condicion:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._hilo = Thread(target=self._bucle_vaciado, name="ingesta-pedidos", daemon=True)
+            self._hilo.start()
+
+    def _bucle_vaciado(self):
+        while True:
+            with self._condicion:
+                if not self._detenida and len(self._pendientes) < self.tamanio_lote:
+                    self._condicion.wait(timeout=self.intervalo)
+                if self._detenida:
+                    return
+                lote = self._pendientes[:self.tamanio_lote]
+                del self._pendientes[:self.tamanio_lote]
+            if lote:
+                self._confirmar_lote(lote)
+                close_old_connections()
+
+    def _confirmar_lote(self, lote):
+        from pedidos_cafe.models import PedidoCafe, TicketIngesta
+
+        logger = Logger()
+        with Tracer().span("Ingesta.confirmar_lote", tamanio=len(lote)):
+            try:
+                with transaction.atomic():
+                    lote_nuevo = self._sin_confirmados(lote)
+                    pedidos = PedidoCafe.objects.bulk_create(
+                        [PedidoCafe(**datos) for _, datos in lote_nuevo]
+                    )
+                    ahora = timezone.now()
+                    self._registrar_tickets([
+                        TicketIngesta(ticket=ticket, estado=self.ESTADO_CONFIRMADO, pedido_id=pedido.id, actualizado=ahora)
+                        for (ticket, _), pedido in zip(lote_nuevo, pedidos)
+                    ])
+                    TicketIngesta.objects.filter(actualizado__lt=ahora - timedelta(seconds=self.ttl_tickets)).delete()
+            except Exception as e:
+                logger.registrar(f"ERROR en ingesta de lote de {len(lote)} pedidos: {str(e)}")
+                with self._condicion:
+                    if self._detenida:
+                        # Durante el apagado el lote vuelve a la cola para guardarse en disco
+                        self._pendientes[:0] = lote
+                        return None
+                try:
+                    self._registrar_tickets([
+                        TicketIngesta(ticket=ticket, estado=self.ESTADO_ERROR, error=str(e), actualizado=timezone.now())
+                        for ticket, _ in lote
+                    ])
+                except Exception as e:
+                    # El hilo de vaciado no debe detenerse si la base de datos no responde
+                    logger.registrar(f"ERROR al registrar el estado de {len(lote)} tickets de ingesta: {str(e)}")
+                self._liberar_recuperados(lote)
+                return 0
+
+        self._liberar_recuperados(lote)
+        logger.registrar(f"Ingesta: Confirmado lote de {len(pedidos)} pedidos")
+        return len(pedidos)
+
+    @staticmethod
+    def _registrar_tickets(tickets):
+        """
+        Guarda el estado de varios tickets con una sola sentencia, creando
+        los que no existan (p. ej. los recuperados de un apagado).
+
+        Args:
+            tickets (list): Instancias de TicketIngesta
+        """
+        from pedidos_cafe.models import TicketIngesta
+
+        TicketIngesta.objects.bulk_create(
+            tickets,
+            update_conflicts=True,
+            unique_fields=["ticket"],
+            update_fields=["estado", "pedido_id", "error", "actualizado"],
+        )
+
+    def _sin_confirmados(self, lote):
+        """
+        Quita del lote los pedidos recuperados de disco que ya se confirmaron
+        (el worker anterior terminó antes de eliminar su archivo).
+        """
+        from pedidos_cafe.models import TicketIngesta
+
+        with self._condicion:
+            recuperados = {ticket for ticket, _ in lote if any(ticket in t for t in self._recuperados.values())}
+        if not recuperados:
+            return lote
+        confirmados = set(
+            TicketIngesta.objects.filter(ticket__in=recuperados, estado=self.ESTADO_CONFIRMADO)
+            .values_list("ticket", flat=True)
+        )
+        return [(ticket, datos) for ticket, datos in lote if ticket not in confirmados]
+
+    def _liberar_recuperados(self, lote):
+        """Elimina los archivos recuperados cuyos pedidos ya se procesaron todos"""
+        with self._condicion:
+            for archivo, tickets in list(self._recuperados.items()):
+                tickets.difference_update(ticket for ticket, _ in lote)
+                if not tickets:
+                    archivo.unlink(missing_ok=True)
+                    del self._recuperados[archivo]
+
+    def _guardar_pendientes(self):
+        with self._condicion:
+            pendientes = list(self._pendientes)
+        if not pendientes:
+            return
+        # Un archivo por proceso, para que los workers no se sobrescriban entre sí
+        archivo = self.archivo_pendientes.with_name(
+            f"{self.archivo_pendientes.stem}.{os.getpid()}{self.archivo_pendientes.suffix}"
+        )
+        archivo.write_text(
+            json.dumps([{"ticket": ticket, "datos": datos} for ticket, datos in pendientes]),
+            encoding="utf-8",
+        )
+        Logger().registrar(f"Ingesta: Guardados {len(pendientes)} pedidos pendientes en {archivo.name}")
+
+    def _recuperar_pendientes(self):
+        """
+        Toma los archivos de pendientes guardados al apagar y los que otro
+        worker estaba recuperando cuando terminó. El archivo se conserva como
+        .recuperando hasta que sus pedidos se confirman.
+        """
+        directorio = self.archivo_pendientes.parent
+        nombre = self.archivo_pendientes.stem
+        candidatos = list(directorio.glob(f"{nombre}*{self.archivo_pendientes.suffix}"))
+        candidatos += [
+            archivo for archivo in directorio.glob(f"{nombre}*.recuperando")
+            if not _proceso_vivo(archivo.name.rsplit(".", 2)[-2].split("-")[0])
+        ]
+        vistos = set()
+        for indice, archivo in enumerate(sorted(candidatos)):
+            # Renombrar es atómico: si otro worker ya tomó el archivo, se omite
+            tomado = directorio / f"{nombre}.{os.getpid()}-{indice}.recuperando"
+            try:
+                archivo.rename(tomado)
+            except FileNotFoundError:
+                continue
+            entradas = json.loads(tomado.read_text(encoding="utf-8"))
+            nuevas = [(entrada["ticket"], entrada["datos"]) for entrada in entradas if entrada["ticket"] not in vistos]
+            vistos.update(ticket for ticket, _ in nuevas)
+            self._pendientes.extend(nuevas)
+            self._recuperados[tomado] = {ticket for ticket, _ in nuevas}
+            if not nuevas:
+                tomado.unlink()
+                del self._recuperados[tomado]
+        if self._pendientes:
+            Logger().registrar(f"Ingesta: Recuperados {len(self._pendientes)} pedidos pendientes")
+            self._asegurar_hilo()
+
+
+def _proceso_vivo(pid):
+    """Indica si existe un proceso con ese pid en esta máquina"""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
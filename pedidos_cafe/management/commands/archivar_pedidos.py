@@ -0,0 +1,78 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api_patrones.logger import Logger
+from pedidos_cafe.archivo import ArchivoPedidos, interpretar_fecha
+from pedidos_cafe.models import PedidoCafe
+
+
+class Command(BaseCommand):
+    """
+    Mueve los pedidos anteriores a una fecha de corte a segmentos NDJSON
+    comprimidos y particionados por día, y los elimina de la tabla activa.
+    Archivar no es una baja: los resúmenes por cliente y el registro de
+    cambios no se modifican.
+    """
+    help = "Archiva en frío los pedidos anteriores a una fecha de corte"
+
+    def add_arguments(self, parser):
+        corte = parser.add_mutually_exclusive_group(required=True)
+        corte.add_argument('--antes-de', help="Fecha de corte (AAAA-MM-DD o ISO 8601)")
+        corte.add_argument('--dias', type=int, help="Archiva los pedidos con más de N días")
+        parser.add_argument('--directorio', default=None, help="Directorio del archivo frío")
+        parser.add_argument(
+            '--lote', type=int, default=2000,
+            help="Pedidos leídos por consulta al recorrer la tabla"
+        )
+        parser.add_argument(
+            '--simular', action='store_true',
+            help="Muestra cuántos pedidos se archivarían sin modificar nada"
+        )
+
+    def handle(self, *args, **options):
+        if options['dias'] is not None:
+            corte = timezone.now() - timedelta(days=options['dias'])
+        else:
+            try:
+                corte = interpretar_fecha(options['antes_de'])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        pedidos = PedidoCafe.objects.filter(fecha__lt=corte).order_by('fecha', 'id')
+        if options['simular']:
+            self.stdout.write(f"Se archivarían {pedidos.count()} pedidos anteriores a {corte.isoformat()}")
+            return
+
+        archivo = ArchivoPedidos(options['directorio'])
+        logger = Logger()
+        total = 0
+
+        # Se procesa un día cada vez: la consulta de lectura termina antes de borrar
+        dias = pedidos.datetimes('fecha', 'day', tzinfo=dt_timezone.utc)
+        for inicio_dia in list(dias):
+            fin_dia = min(inicio_dia + timedelta(days=1), corte)
+            pedidos_dia = pedidos.filter(fecha__gte=inicio_dia, fecha__lt=fin_dia)
+            registros = [
+                ArchivoPedidos.pedido_a_registro(pedido)
+                for pedido in pedidos_dia.iterator(chunk_size=options['lote'])
+            ]
+            if registros:
+                total += self._archivar_dia(archivo, inicio_dia.date(), registros)
+
+        mensaje = f"Archivados {total} pedidos anteriores a {corte.isoformat()} en {archivo.directorio}"
+        logger.registrar(f"Comando: {mensaje}")
+        self.stdout.write(self.style.SUCCESS(mensaje))
+
+    def _archivar_dia(self, archivo, dia, registros):
+        # El segmento se escribe antes de borrar: un fallo nunca pierde pedidos,
+        # y al reintentar tras un fallo escribir_segmento() reutiliza el segmento
+        segmento = archivo.escribir_segmento(dia, registros)
+        ids = [registro["id"] for registro in registros]
+        with transaction.atomic():
+            for inicio in range(0, len(ids), 500):
+                PedidoCafe.objects.filter(id__in=ids[inicio:inicio + 500]).archivar()
+        self.stdout.write(f"  {segmento['archivo']}: {segmento['total']} pedidos")
+        return len(ids)
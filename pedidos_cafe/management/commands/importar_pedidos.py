@@ -0,0 +1,254 @@
+import csv
+import gzip
+import json
+import os
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from api_patrones.logger import Logger
+from pedidos_cafe.archivo import interpretar_fecha
+from pedidos_cafe.models import PedidoCafe, fechas_explicitas
+from pedidos_cafe.paginacion import actualizar_estadisticas
+from pedidos_cafe.serializers import PedidoCafeSerializer
+
+CAMPOS = ('cliente', 'tipo_base', 'tamanio', 'ingredientes', 'fecha')
+
+# Campos calculados que no vienen en el archivo de origen, e ingredientes, que
+# ya valida validate_ingredientes (la lista vacía es válida, como en la API)
+CAMPOS_NO_VALIDADOS = ['id', 'fecha', 'cliente_busqueda', 'ingredientes_mascara', 'version', 'ingredientes']
+
+
+def _abrir(ruta, modo):
+    if str(ruta).endswith('.gz'):
+        return gzip.open(ruta, modo + 't', encoding='utf-8', newline='')
+    return open(ruta, modo, encoding='utf-8', newline='')
+
+
+class Command(BaseCommand):
+    """
+    Importa pedidos desde un archivo CSV o NDJSON (opcionalmente .gz) en
+    streaming y con memoria constante. Valida cada fila con las mismas reglas
+    que la API (PedidoCafeSerializer.validate_tipo_base/validate_ingredientes y
+    PedidoCafe.clean), inserta por lotes transaccionales, escribe las filas
+    rechazadas en un archivo aparte y guarda un punto de control para
+    reanudar tras un fallo sin duplicar ni perder lotes.
+    """
+    help = "Importa pedidos en bloque desde CSV o NDJSON con reanudación"
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Archivo de entrada (.csv, .ndjson, .jsonl, opcionalmente .gz)")
+        parser.add_argument('--formato', choices=['csv', 'ndjson'], default=None,
+                            help="Formato de entrada (por defecto según la extensión)")
+        parser.add_argument('--lote', type=int, default=2000, help="Filas por transacción")
+        parser.add_argument('--rechazos', default=None,
+                            help="Archivo de filas rechazadas (por defecto <archivo>.rechazos.<formato>)")
+        parser.add_argument('--checkpoint', default=None,
+                            help="Archivo de punto de control (por defecto <archivo>.checkpoint.json)")
+        parser.add_argument('--reiniciar', action='store_true',
+                            help="Ignora el punto de control y empieza desde la primera fila")
+        parser.add_argument('--separador-ingredientes', default=';',
+                            help="Separador de ingredientes en CSV si no vienen como lista JSON")
+
+    def handle(self, *args, **options):
+        ruta = options['archivo']
+        if not os.path.exists(ruta):
+            raise CommandError(f"No existe el archivo '{ruta}'")
+        formato = options['formato'] or self._detectar_formato(ruta)
+        ruta_rechazos = options['rechazos'] or f"{ruta}.rechazos.{formato}"
+        ruta_checkpoint = options['checkpoint'] or f"{ruta}.checkpoint.json"
+        self.separador = options['separador_ingredientes']
+        self.serializer = PedidoCafeSerializer()
+
+        estado = self._leer_checkpoint(ruta_checkpoint, ruta, options['reiniciar'])
+        if estado['lineas']:
+            self.stdout.write(f"Reanudando después de {estado['lineas']} filas "
+                              f"({estado['importados']} importadas, {estado['rechazados']} rechazadas)")
+
+        logger = Logger()
+        comienzo = time.perf_counter()
+        with _abrir(ruta, 'r') as entrada, self._abrir_rechazos(ruta_rechazos, formato, estado) as rechazos, \
+                fechas_explicitas():
+            lote = []
+            lineas = estado['lineas']
+            for numero, (original, datos) in enumerate(self._leer_filas(entrada, formato), start=1):
+                if numero <= estado['lineas']:
+                    continue
+                lineas = numero
+                try:
+                    lote.append(self._validar(datos))
+                except ValueError as e:
+                    self._rechazar(rechazos, formato, numero, original, str(e))
+                    estado['rechazados'] += 1
+                if len(lote) >= options['lote']:
+                    self._confirmar_lote(lote, lineas, estado, rechazos, ruta_checkpoint)
+                    lote = []
+                    transcurrido = time.perf_counter() - comienzo
+                    self.stdout.write(f"  {lineas} filas ({estado['importados']} importadas, "
+                                      f"{estado['rechazados']} rechazadas, {lineas / transcurrido:.0f} filas/s)")
+            if lote or lineas > estado['lineas']:
+                self._confirmar_lote(lote, lineas, estado, rechazos, ruta_checkpoint)
+
+        if os.path.exists(ruta_checkpoint):
+            os.remove(ruta_checkpoint)
+        # Estadísticas para el conteo estimado del admin (sqlite_stat1)
+        actualizar_estadisticas(PedidoCafe)
+        if estado['rechazados'] == 0 and os.path.exists(ruta_rechazos) and os.path.getsize(ruta_rechazos) == 0:
+            os.remove(ruta_rechazos)
+
+        mensaje = (f"Importados {estado['importados']} pedidos desde {ruta} "
+                   f"({estado['rechazados']} rechazados) en {time.perf_counter() - comienzo:.1f} s")
+        logger.registrar(f"Comando: {mensaje}")
+        self.stdout.write(self.style.SUCCESS(mensaje))
+        if estado['rechazados']:
+            self.stdout.write(f"Filas rechazadas en {ruta_rechazos}")
+
+    @staticmethod
+    def _detectar_formato(ruta):
+        nombre = str(ruta).removesuffix('.gz')
+        if nombre.endswith('.csv'):
+            return 'csv'
+        if nombre.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+        raise CommandError("No se pudo detectar el formato; use --formato csv|ndjson")
+
+    def _leer_filas(self, entrada, formato):
+        """Genera (fila original, datos) sin cargar el archivo en memoria"""
+        if formato == 'csv':
+            for fila in csv.DictReader(entrada):
+                yield fila, fila
+            return
+        for linea in entrada:
+            linea = linea.rstrip('\n')
+            if not linea.strip():
+                continue
+            try:
+                datos = json.loads(linea)
+            except ValueError:
+                datos = None
+            yield linea, datos
+
+    def _validar(self, datos):
+        """
+        Convierte una fila en un PedidoCafe validado.
+
+        Raises:
+            ValueError: Con la descripción del problema si la fila no es válida
+        """
+        if not isinstance(datos, dict):
+            raise ValueError("La fila no es un objeto JSON válido")
+
+        ingredientes = datos.get('ingredientes') or []
+        if isinstance(ingredientes, str):
+            texto = ingredientes.strip()
+            if texto.startswith('['):
+                try:
+                    ingredientes = json.loads(texto)
+                except ValueError:
+                    raise ValueError("El campo 'ingredientes' no es una lista JSON válida")
+            else:
+                ingredientes = [i.strip() for i in texto.split(self.separador) if i.strip()]
+        if not isinstance(ingredientes, list):
+            raise ValueError("El campo 'ingredientes' debe ser una lista")
+
+        def texto(campo):
+            return str(datos.get(campo) or '').strip()
+
+        try:
+            fecha = interpretar_fecha(texto('fecha')) or timezone.now()
+            tipo_base = self.serializer.validate_tipo_base(texto('tipo_base'))
+            ingredientes = self.serializer.validate_ingredientes(ingredientes)
+            pedido = PedidoCafe(
+                cliente=texto('cliente'),
+                tipo_base=tipo_base,
+                tamanio=texto('tamanio'),
+                ingredientes=ingredientes,
+                fecha=fecha,
+            )
+            pedido.clean_fields(exclude=CAMPOS_NO_VALIDADOS)
+            pedido.clean()
+        except serializers.ValidationError as e:
+            raise ValueError("; ".join(str(detalle) for detalle in e.detail))
+        except ValidationError as e:
+            if hasattr(e, 'message_dict'):
+                errores = [f"{campo}: {' '.join(mensajes)}" for campo, mensajes in e.message_dict.items()]
+                raise ValueError("; ".join(errores))
+            raise ValueError("; ".join(e.messages))
+        return pedido
+
+    def _confirmar_lote(self, lote, lineas, estado, rechazos, ruta_checkpoint):
+        rechazos.flush()
+        pendiente = dict(
+            estado,
+            lineas=lineas,
+            importados=estado['importados'] + len(lote),
+            bytes_rechazos=rechazos.tell(),
+        )
+        with transaction.atomic():
+            creados = PedidoCafe.objects.bulk_create(lote) if lote else []
+            if creados:
+                pendiente['ultimo_id'] = creados[-1].pk
+                pendiente['ultimo_cliente'] = creados[-1].cliente
+            # Se anota antes de confirmar: al reanudar se comprueba si el lote llegó a la base
+            self._escribir_checkpoint(ruta_checkpoint, estado, pendiente)
+        estado.update(pendiente)
+        self._escribir_checkpoint(ruta_checkpoint, estado, None)
+
+    def _leer_checkpoint(self, ruta_checkpoint, ruta, reiniciar):
+        inicial = {
+            'archivo': os.path.abspath(ruta),
+            'lineas': 0,
+            'importados': 0,
+            'rechazados': 0,
+            'bytes_rechazos': 0,
+        }
+        if reiniciar or not os.path.exists(ruta_checkpoint):
+            return inicial
+        with open(ruta_checkpoint, encoding='utf-8') as archivo:
+            checkpoint = json.load(archivo)
+        if checkpoint['confirmado']['archivo'] != inicial['archivo']:
+            raise CommandError(f"El punto de control {ruta_checkpoint} corresponde a otro archivo; use --reiniciar")
+
+        estado = checkpoint['confirmado']
+        pendiente = checkpoint.get('pendiente')
+        if pendiente is not None:
+            ultimo_id = pendiente.get('ultimo_id')
+            confirmado = ultimo_id is None or PedidoCafe.objects.filter(
+                pk=ultimo_id, cliente=pendiente['ultimo_cliente']
+            ).exists()
+            if confirmado:
+                estado = pendiente
+        return estado
+
+    @staticmethod
+    def _escribir_checkpoint(ruta_checkpoint, confirmado, pendiente):
+        temporal = f"{ruta_checkpoint}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({'confirmado': confirmado, 'pendiente': pendiente}, archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta_checkpoint)
+
+    @staticmethod
+    def _abrir_rechazos(ruta_rechazos, formato, estado):
+        # Descarta los rechazos de un lote que no llegó a confirmarse
+        if os.path.exists(ruta_rechazos):
+            archivo = open(ruta_rechazos, 'r+', encoding='utf-8', newline='')
+            archivo.truncate(estado['bytes_rechazos'])
+            archivo.seek(estado['bytes_rechazos'])
+        else:
+            archivo = open(ruta_rechazos, 'w', encoding='utf-8', newline='')
+        return archivo
+
+    def _rechazar(self, rechazos, formato, numero, original, error):
+        if formato == 'csv':
+            if rechazos.tell() == 0:
+                csv.writer(rechazos).writerow(['fila', 'error'] + list(CAMPOS))
+            csv.writer(rechazos).writerow([numero, error] + [original.get(campo, '') for campo in CAMPOS])
+        else:
+            rechazos.write(json.dumps({'fila': numero, 'error': error, 'original': original}, ensure_ascii=False))
+            rechazos.write('\n')
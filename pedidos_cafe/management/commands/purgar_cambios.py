@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api_patrones.logger import Logger
+from pedidos_cafe.models import CambioPedido
+
+
+class Command(BaseCommand):
+    """
+    Elimina los cambios antiguos del registro de sincronización incremental.
+    Los clientes con un cursor anterior a lo retenido reciben 410 y deben
+    volver a sincronizar desde el listado completo.
+    """
+    help = "Purga los cambios de pedidos más antiguos que el período de retención"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias', type=int, default=None,
+            help="Días de cambios a conservar (por defecto CAMBIOS_RETENCION_DIAS)"
+        )
+
+    def handle(self, *args, **options):
+        dias = options['dias']
+        if dias is None:
+            dias = getattr(settings, 'CAMBIOS_RETENCION_DIAS', 30)
+        corte = timezone.now() - timedelta(days=dias)
+
+        # Se purga por secuencia para no dejar huecos dentro de lo retenido
+        ultima = (
+            CambioPedido.objects.filter(fecha__lt=corte)
+            .order_by('-secuencia').values_list('secuencia', flat=True).first()
+        )
+        eliminados = 0
+        if ultima is not None:
+            eliminados, _ = CambioPedido.objects.filter(secuencia__lte=ultima).delete()
+
+        mensaje = f"Purgados {eliminados} cambios anteriores a {corte.isoformat()}"
+        Logger().registrar(f"Comando: {mensaje}")
+        self.stdout.write(self.style.SUCCESS(mensaje))
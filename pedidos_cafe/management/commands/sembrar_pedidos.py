@@ -0,0 +1,141 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api_patrones.logger import Logger
+from pedidos_cafe.codificacion import INGREDIENTES, TAMANIOS, TIPOS
+from pedidos_cafe.models import PedidoCafe, fechas_explicitas
+from pedidos_cafe.paginacion import actualizar_estadisticas
+
+NOMBRES = ["José", "María", "Lucía", "Andrés", "Martín", "Sofía", "Iñaki", "Ramón", "Elena", "Tomás"]
+APELLIDOS = ["García", "Pérez", "López", "Núñez", "Gómez", "Fernández", "Díaz", "Muñoz", "Ruiz", "Álvarez"]
+
+# Peso relativo de cada hora del día en el perfil "cafeteria" (picos de mañana y mediodía)
+PESOS_HORA_CAFETERIA = [
+    1, 0, 0, 0, 0, 1, 4, 10, 14, 12, 8, 7,
+    9, 10, 7, 6, 6, 7, 5, 3, 2, 2, 1, 1,
+]
+
+
+def interpretar_distribucion(texto, valores):
+    """
+    Interpreta una distribución "valor=peso,valor=peso".
+
+    Args:
+        texto (str): Distribución indicada en la línea de comandos
+        valores (tuple): Valores admitidos
+
+    Returns:
+        dict: Valor -> peso
+
+    Raises:
+        CommandError: Si algún valor o peso no es válido
+    """
+    pesos = {}
+    for parte in texto.split(","):
+        valor, _, peso = parte.partition("=")
+        valor = valor.strip()
+        if valor not in valores:
+            raise CommandError(f"Valor '{valor}' no válido. Valores válidos: {list(valores)}")
+        try:
+            pesos[valor] = float(peso)
+        except ValueError:
+            raise CommandError(f"Peso no válido para '{valor}': '{peso}'")
+    return pesos
+
+
+class Command(BaseCommand):
+    """
+    Genera pedidos sintéticos en volumen para pruebas de capacidad.
+    Inserta por bloques con bulk_create, sin pasar por la API ni el Logger
+    por pedido, y con fechas repartidas en los últimos días.
+    """
+    help = "Genera pedidos sintéticos con distribuciones configurables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cantidad', type=int, default=100000, help="Pedidos a generar")
+        parser.add_argument('--lote', type=int, default=5000, help="Pedidos por bulk_create")
+        parser.add_argument('--clientes', type=int, default=10000, help="Clientes distintos")
+        parser.add_argument(
+            '--tipos', default="espresso=3,americano=3,latte=4",
+            help="Distribución de tipos de café (valor=peso,...)"
+        )
+        parser.add_argument(
+            '--tamanios', default="pequeño=3,mediano=5,grande=2",
+            help="Distribución de tamaños (valor=peso,...)"
+        )
+        parser.add_argument(
+            '--ingredientes', default="canela=0.2,chocolate=0.25,vainilla=0.15,azucar=0.4,leche extra=0.2",
+            help="Probabilidad independiente de cada ingrediente (valor=probabilidad,...)"
+        )
+        parser.add_argument('--dias', type=float, default=30, help="Reparte las fechas en los últimos N días")
+        parser.add_argument(
+            '--perfil', choices=['uniforme', 'cafeteria'], default='cafeteria',
+            help="Distribución de los pedidos a lo largo del día"
+        )
+        parser.add_argument('--semilla', type=int, default=None, help="Semilla para resultados reproducibles")
+
+    def handle(self, *args, **options):
+        aleatorio = random.Random(options['semilla'])
+        tipos = interpretar_distribucion(options['tipos'], TIPOS)
+        tamanios = interpretar_distribucion(options['tamanios'], TAMANIOS)
+        probabilidades = interpretar_distribucion(options['ingredientes'], INGREDIENTES)
+        clientes = [
+            f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)} {numero}"
+            for numero in range(options['clientes'])
+        ]
+        fin = timezone.now()
+        inicio = fin - timedelta(days=options['dias'])
+        generar_fecha = self._generador_fechas(aleatorio, inicio, fin, options['perfil'])
+
+        total = options['cantidad']
+        creados = 0
+        comienzo = time.perf_counter()
+        with fechas_explicitas():
+            while creados < total:
+                cantidad = min(options['lote'], total - creados)
+                lote_tipos = aleatorio.choices(list(tipos), weights=list(tipos.values()), k=cantidad)
+                lote_tamanios = aleatorio.choices(list(tamanios), weights=list(tamanios.values()), k=cantidad)
+                PedidoCafe.objects.bulk_create([
+                    PedidoCafe(
+                        cliente=aleatorio.choice(clientes),
+                        tipo_base=tipo,
+                        tamanio=tamanio,
+                        ingredientes=[i for i, p in probabilidades.items() if aleatorio.random() < p],
+                        fecha=generar_fecha(),
+                    )
+                    for tipo, tamanio in zip(lote_tipos, lote_tamanios)
+                ], batch_size=options['lote'])
+                creados += cantidad
+                transcurrido = time.perf_counter() - comienzo
+                self.stdout.write(f"  {creados}/{total} pedidos ({creados / transcurrido:.0f} pedidos/s)")
+
+        # Estadísticas para el conteo estimado del admin (sqlite_stat1)
+        actualizar_estadisticas(PedidoCafe)
+
+        mensaje = f"Generados {creados} pedidos sintéticos en {time.perf_counter() - comienzo:.1f} s"
+        Logger().registrar(f"Comando: {mensaje}")
+        self.stdout.write(self.style.SUCCESS(mensaje))
+
+    @staticmethod
+    def _generador_fechas(aleatorio, inicio, fin, perfil):
+        segundos = (fin - inicio).total_seconds()
+        if perfil == 'uniforme' or segundos < 24 * 3600:
+            return lambda: inicio + timedelta(seconds=aleatorio.random() * segundos)
+
+        # Elige un día al azar y una hora según el perfil de la cafetería
+        dias = int(segundos // (24 * 3600))
+        horas = list(range(24))
+        hoy = fin.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        def generar():
+            while True:
+                dia = hoy - timedelta(days=aleatorio.randrange(dias))
+                hora = aleatorio.choices(horas, weights=PESOS_HORA_CAFETERIA)[0]
+                fecha = dia + timedelta(hours=hora, seconds=aleatorio.random() * 3600)
+                if inicio <= fecha <= fin:
+                    return fecha
+        return generar
@@ -0,0 +1,64 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api_patrones.logger import Logger
+from api_patrones.routers import alias_replica
+
+
+class Command(BaseCommand):
+    """
+    Copia la base de datos primaria SQLite sobre la réplica de lectura
+    usando la API de backup en línea de SQLite.
+
+    La copia se hace en un solo paso bajo un bloqueo de lectura de la
+    primaria: un backup por pasos se reinicia cada vez que otra conexión
+    escribe en la primaria, y con escrituras constantes no terminaría.
+    Se descarta VACUUM INTO + renombrar porque los workers con conexiones
+    persistentes seguirían leyendo el archivo anterior.
+    """
+    help = "Sincroniza la réplica de lectura SQLite con la base de datos primaria"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--intervalo', type=float, default=None,
+            help="Repite la sincronización cada N segundos hasta interrumpir el comando"
+        )
+
+    def handle(self, *args, **options):
+        alias = alias_replica()
+        if alias is None:
+            raise CommandError(
+                f"No hay una réplica '{settings.DATABASE_REPLICA_ALIAS}' configurada. "
+                "Active API_PATRONES_REPLICA=1."
+            )
+
+        primaria = settings.DATABASES['default']
+        replica = settings.DATABASES[alias]
+        for nombre, config in (('default', primaria), (alias, replica)):
+            if config['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError(f"La base '{nombre}' no es SQLite; use la replicación del motor")
+
+        while True:
+            inicio = time.perf_counter()
+            self._sincronizar(primaria['NAME'], replica['NAME'])
+            duracion = (time.perf_counter() - inicio) * 1000
+
+            mensaje = f"Réplica '{alias}' sincronizada en {duracion:.1f} ms"
+            Logger().registrar(f"Comando: {mensaje}")
+            self.stdout.write(self.style.SUCCESS(mensaje))
+
+            if options['intervalo'] is None:
+                return
+            time.sleep(options['intervalo'])
+
+    def _sincronizar(self, origen, destino):
+        fuente = sqlite3.connect(str(origen))
+        copia = sqlite3.connect(str(destino))
+        try:
+            fuente.backup(copia, pages=-1)
+        finally:
+            copia.close()
+            fuente.close()
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:17
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Copia congelada de pedidos_cafe.models.normalizar_cliente a la fecha de esta
+# migración: los cambios posteriores de la función no deben alterar su resultado
+def normalizar_cliente(texto):
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.casefold().split())
+
+
+def poblar_busqueda_cliente(apps, schema_editor):
+    PedidoCafe = apps.get_model('pedidos_cafe', 'PedidoCafe')
+    TokenCliente = apps.get_model('pedidos_cafe', 'TokenCliente')
+
+    claves = set()
+    clientes = list(PedidoCafe.objects.values_list('cliente', flat=True).distinct())
+    for cliente in clientes:
+        clave = normalizar_cliente(cliente)
+        PedidoCafe.objects.filter(cliente=cliente).update(cliente_busqueda=clave)
+        claves.add(clave)
+
+    TokenCliente.objects.bulk_create(
+        [TokenCliente(token=token, clave=clave) for clave in claves for token in set(clave.split())],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedidocafe',
+            name='cliente_busqueda',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.CreateModel(
+            name='TokenCliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('clave', models.CharField(max_length=100)),
+            ],
+            options={
+                'verbose_name': 'Palabra de Cliente',
+                'verbose_name_plural': 'Palabras de Clientes',
+                'constraints': [models.UniqueConstraint(fields=('token', 'clave'), name='token_cliente_unico')],
+            },
+        ),
+        migrations.RunPython(poblar_busqueda_cliente, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0002_busqueda_cliente'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pedidocafe',
+            name='fecha',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:26
+
+from django.db import migrations, models
+
+# Copia congelada de pedidos_cafe.codificacion.BITS_INGREDIENTE a la fecha de
+# esta migración: agregar ingredientes después no debe alterar el backfill
+BITS_INGREDIENTE = {
+    "canela": 1,
+    "chocolate": 2,
+    "vainilla": 4,
+    "azucar": 8,
+    "leche extra": 16,
+}
+
+
+def poblar_mascara_ingredientes(apps, schema_editor):
+    PedidoCafe = apps.get_model('pedidos_cafe', 'PedidoCafe')
+
+    # Agrupa los ids por máscara y actualiza cada grupo en bloques
+    ids_por_mascara = {}
+    for pedido_id, ingredientes in PedidoCafe.objects.values_list('id', 'ingredientes').iterator(chunk_size=2000):
+        mascara = 0
+        for ingrediente in ingredientes or ():
+            mascara |= BITS_INGREDIENTE.get(ingrediente, 0)
+        if mascara:
+            ids_por_mascara.setdefault(mascara, []).append(pedido_id)
+
+    for mascara, ids in ids_por_mascara.items():
+        for inicio in range(0, len(ids), 500):
+            PedidoCafe.objects.filter(id__in=ids[inicio:inicio + 500]).update(ingredientes_mascara=mascara)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0003_indice_fecha'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedidocafe',
+            name='ingredientes_mascara',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_mascara_ingredientes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0004_mascara_ingredientes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pedidocafe',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:29
+
+from django.db import migrations, models
+
+
+def registrar_pedidos_existentes(apps, schema_editor):
+    # Los pedidos previos al registro entran como creados, en orden de id,
+    # para que un cliente que empieza desde el cursor 0 reciba todo
+    PedidoCafe = apps.get_model('pedidos_cafe', 'PedidoCafe')
+    CambioPedido = apps.get_model('pedidos_cafe', 'CambioPedido')
+
+    pedido_ids = PedidoCafe.objects.order_by('id').values_list('id', flat=True)
+    lote = []
+    for pedido_id in pedido_ids.iterator(chunk_size=2000):
+        lote.append(CambioPedido(pedido_id=pedido_id, operacion='creado'))
+        if len(lote) == 2000:
+            CambioPedido.objects.bulk_create(lote)
+            lote = []
+    CambioPedido.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0005_version_pedido'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioPedido',
+            fields=[
+                ('secuencia', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pedido_id', models.BigIntegerField()),
+                ('operacion', models.CharField(choices=[('creado', 'Creado'), ('actualizado', 'Actualizado'), ('eliminado', 'Eliminado')], max_length=12)),
+                ('fecha', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cambio de Pedido',
+                'verbose_name_plural': 'Cambios de Pedidos',
+                'ordering': ['secuencia'],
+            },
+        ),
+        migrations.RunPython(registrar_pedidos_existentes, migrations.RunPython.noop),
+    ]
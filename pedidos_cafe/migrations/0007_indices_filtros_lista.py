@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0006_registro_cambios'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pedidocafe',
+            name='cliente_busqueda',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='pedidocafe',
+            index=models.Index(fields=['tipo_base', 'fecha'], name='pedido_tipo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedidocafe',
+            index=models.Index(fields=['tamanio', 'fecha'], name='pedido_tamanio_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedidocafe',
+            index=models.Index(fields=['tipo_base', 'tamanio', 'fecha'], name='pedido_tipo_tam_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedidocafe',
+            index=models.Index(fields=['cliente_busqueda', 'fecha'], name='pedido_cliente_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:51
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Copia congelada de las tablas de precios y de codificacion.calcular_precio a la
+# fecha de esta migración: cambiar los precios después no debe alterar el backfill
+PRECIOS_BASE = {"espresso": 10.0, "americano": 12.0, "latte": 15.0}
+PRECIOS_INGREDIENTES = {
+    "canela": 1.0,
+    "chocolate": 2.0,
+    "vainilla": 1.5,
+    "azucar": 0.5,
+    "leche extra": 2.0,
+}
+MULTIPLICADORES_TAMANIO = {"pequeño": 1.0, "mediano": 1.25, "grande": 1.5}
+
+
+def calcular_precio(tipo, ingredientes, tamanio):
+    subtotal = PRECIOS_BASE[tipo]
+    # Suma en el mismo orden que el Builder para obtener exactamente el mismo redondeo
+    for ingrediente in ingredientes or ():
+        subtotal += PRECIOS_INGREDIENTES[ingrediente]
+    return round(subtotal * MULTIPLICADORES_TAMANIO[tamanio], 2)
+
+
+def poblar_resumen_clientes(apps, schema_editor):
+    PedidoCafe = apps.get_model('pedidos_cafe', 'PedidoCafe')
+    ResumenCliente = apps.get_model('pedidos_cafe', 'ResumenCliente')
+
+    # Acumula en memoria por clave de cliente y crea los resúmenes en bloques
+    resumenes = {}
+    filas = PedidoCafe.objects.order_by('id').values_list(
+        'cliente_busqueda', 'cliente', 'tipo_base', 'ingredientes', 'tamanio'
+    )
+    for clave, cliente, tipo_base, ingredientes, tamanio in filas.iterator(chunk_size=2000):
+        resumen = resumenes.get(clave)
+        if resumen is None:
+            resumen = resumenes[clave] = ResumenCliente(clave=clave, cliente=cliente)
+        resumen.total_pedidos += 1
+        resumen.gasto_total += Decimal(str(calcular_precio(tipo_base, ingredientes, tamanio)))
+        columna = f'pedidos_{tipo_base}'
+        setattr(resumen, columna, getattr(resumen, columna) + 1)
+
+    ResumenCliente.objects.bulk_create(resumenes.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0007_indices_filtros_lista'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenCliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=100, unique=True)),
+                ('cliente', models.CharField(max_length=100)),
+                ('total_pedidos', models.PositiveIntegerField(default=0)),
+                ('gasto_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('pedidos_espresso', models.PositiveIntegerField(default=0)),
+                ('pedidos_americano', models.PositiveIntegerField(default=0)),
+                ('pedidos_latte', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen de Cliente',
+                'verbose_name_plural': 'Resúmenes de Clientes',
+            },
+        ),
+        migrations.RunPython(poblar_resumen_clientes, migrations.RunPython.noop),
+    ]
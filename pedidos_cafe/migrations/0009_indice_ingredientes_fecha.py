@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0008_resumen_cliente'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pedidocafe',
+            name='ingredientes_mascara',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='pedidocafe',
+            index=models.Index(fields=['ingredientes_mascara', 'fecha'], name='pedido_ingred_fecha_idx'),
+        ),
+    ]
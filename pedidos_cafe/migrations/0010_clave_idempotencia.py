@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 23:09
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0009_indice_ingredientes_fecha'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveIdempotencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=64, unique=True)),
+                ('huella', models.CharField(max_length=64)),
+                ('status', models.PositiveSmallIntegerField(null=True)),
+                ('respuesta', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('cabeceras', models.JSONField(default=dict)),
+                ('creada', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Clave de Idempotencia',
+                'verbose_name_plural': 'Claves de Idempotencia',
+            },
+        ),
+    ]
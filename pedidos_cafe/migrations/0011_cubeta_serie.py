@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0010_clave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CubetaSerie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=10)),
+                ('inicio', models.DateTimeField()),
+                ('datos', models.JSONField(null=True)),
+                ('calculada', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cubeta de Serie',
+                'verbose_name_plural': 'Cubetas de Serie',
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'inicio'), name='cubeta_serie_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidos_cafe', '0011_cubeta_serie'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketIngesta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket', models.CharField(max_length=32, unique=True)),
+                ('estado', models.CharField(max_length=12)),
+                ('pedido_id', models.PositiveBigIntegerField(null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('actualizado', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Ticket de Ingesta',
+                'verbose_name_plural': 'Tickets de Ingesta',
+            },
+        ),
+    ]
@@ -1,5 +1,202 @@
-from django.db import models
+import unicodedata
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from pedidos_cafe.codificacion import BITS_INGREDIENTE, calcular_precio, codificar_ingredientes, mascaras_con
+from pedidos_cafe.eventos import publicar_cambios
+from pedidos_cafe.representaciones import CacheRepresentaciones
+
+
+def normalizar_cliente(texto):
+    """
+    Normaliza un nombre de cliente para búsquedas: minúsculas, sin acentos
+    y con los espacios colapsados.
+
+    Args:
+        texto (str): Nombre del cliente
+
+    Returns:
+        str: Clave de búsqueda normalizada
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.casefold().split())
+
+
+def filtro_prefijo(campo, prefijo):
+    """
+    Construye un filtro de prefijo como rango [prefijo, prefijo + U+FFFF).
+    A diferencia de LIKE/startswith, el rango puede resolverse con el índice.
+    """
+    return models.Q(**{f"{campo}__gte": prefijo, f"{campo}__lt": prefijo + "\uffff"})
+
+
+# Campos de un pedido que determinan su aporte a ResumenCliente
+CAMPOS_RESUMEN = frozenset({"cliente", "cliente_busqueda", "tipo_base", "tamanio", "ingredientes"})
+
+# Campos de un pedido que determinan su cubeta en la serie temporal
+CAMPOS_SERIE = frozenset({"fecha", "tipo_base", "tamanio"})
+
+
+def invalidar_series_al_confirmar(fechas, using=None):
+    """
+    Tras confirmar la transacción, invalida las cubetas cerradas de la serie
+    temporal si alguna de las fechas cae en ellas.
+
+    Args:
+        fechas (iterable): Fechas de los pedidos afectados (None si se desconoce)
+        using (str): Alias de la base de datos de la transacción
+    """
+    # series importa este módulo
+    from pedidos_cafe.series import invalidar_si_afecta_cerradas
+
+    fechas = list(fechas)
+    if fechas:
+        transaction.on_commit(lambda: invalidar_si_afecta_cerradas(fechas), using=using)
+
+
+class PedidoCafeQuerySet(models.QuerySet):
+    """QuerySet de pedidos con búsquedas indexadas y altas masivas coherentes"""
+
+    def buscar_cliente(self, texto):
+        """
+        Filtra los pedidos cuyo cliente contiene, como prefijo de alguna de sus
+        palabras, cada una de las palabras buscadas (sin distinguir mayúsculas ni acentos).
+
+        Args:
+            texto (str): Texto buscado, por ejemplo "juan gar"
+
+        Returns:
+            PedidoCafeQuerySet: Pedidos que coinciden
+        """
+        queryset = self
+        for token in normalizar_cliente(texto).split():
+            claves = TokenCliente.objects.filter(filtro_prefijo("token", token)).values("clave")
+            queryset = queryset.filter(cliente_busqueda__in=claves)
+        return queryset
+
+    def con_ingredientes(self, ingredientes):
+        """
+        Filtra los pedidos que incluyen todos los ingredientes indicados.
+        Se compila a un IN sobre la máscara indexada, sin recorrer el JSON.
+
+        Args:
+            ingredientes (list): Ingredientes requeridos
+
+        Returns:
+            PedidoCafeQuerySet: Pedidos que coinciden
+
+        Raises:
+            ValueError: Si algún ingrediente no es válido
+        """
+        requerida = codificar_ingredientes(ingredientes)
+        if not requerida:
+            return self
+        return self.filter(ingredientes_mascara__in=mascaras_con(requerida))
+
+    def conteo_por_ingrediente(self):
+        """
+        Cuenta cuántos pedidos incluyen cada ingrediente con una sola consulta
+        agrupada por máscara (a lo sumo 32 grupos).
+
+        Returns:
+            dict: Ingrediente -> número de pedidos
+        """
+        conteos = dict.fromkeys(BITS_INGREDIENTE, 0)
+        por_mascara = (
+            self.order_by()
+            .values_list("ingredientes_mascara")
+            .annotate(total=models.Count("id"))
+        )
+        for mascara, total in por_mascara:
+            for ingrediente, bit in BITS_INGREDIENTE.items():
+                if mascara & bit:
+                    conteos[ingrediente] += total
+        return conteos
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Calcula los campos derivados antes de insertar, igual que save(),
+        y registra los cambios en la misma transacción.
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.sincronizar_campos_derivados()
+        with transaction.atomic(using=self.db):
+            creados = super().bulk_create(objs, *args, **kwargs)
+            TokenCliente.registrar({obj.cliente_busqueda for obj in objs})
+            CambioPedido.registrar(CambioPedido.CREADO, [obj.pk for obj in creados if obj.pk is not None])
+            ResumenCliente.aplicar(sumar=[ResumenCliente.fila(obj) for obj in creados])
+            invalidar_series_al_confirmar([obj.fecha for obj in creados], using=self.db)
+        return creados
+
+    def update(self, **kwargs):
+        """
+        Actualiza en bloque, aumenta la versión de las filas y registra los cambios.
+        Si se asigna un valor fijo a `cliente` o `ingredientes`, también
+        actualiza sus campos derivados.
+        """
+        kwargs.setdefault("version", models.F("version") + 1)
+        if isinstance(kwargs.get("cliente"), str):
+            kwargs.setdefault("cliente_busqueda", normalizar_cliente(kwargs["cliente"]))
+        if isinstance(kwargs.get("ingredientes"), list):
+            kwargs.setdefault("ingredientes_mascara", codificar_ingredientes(kwargs["ingredientes"]))
+        with transaction.atomic(using=self.db):
+            if CAMPOS_RESUMEN.intersection(kwargs) or CAMPOS_SERIE.intersection(kwargs):
+                anteriores = list(self.values("id", "fecha", *CAMPOS_RESUMEN))
+                pedido_ids = [fila["id"] for fila in anteriores]
+            else:
+                anteriores = None
+                pedido_ids = list(self.values_list("id", flat=True))
+            filas = super().update(**kwargs)
+            if "cliente_busqueda" in kwargs:
+                TokenCliente.registrar({kwargs["cliente_busqueda"]})
+            CambioPedido.registrar(CambioPedido.ACTUALIZADO, pedido_ids)
+            if anteriores and CAMPOS_RESUMEN.intersection(kwargs):
+                ResumenCliente.actualizar_por_cambio(anteriores, kwargs)
+            if anteriores and CAMPOS_SERIE.intersection(kwargs):
+                fechas = [fila["fecha"] for fila in anteriores]
+                if isinstance(kwargs.get("fecha"), models.expressions.Combinable):
+                    # Con una expresión se leen las fechas resultantes
+                    fechas.extend(PedidoCafe.objects.filter(id__in=pedido_ids).values_list("fecha", flat=True))
+                elif "fecha" in kwargs:
+                    fechas.append(kwargs["fecha"])
+                invalidar_series_al_confirmar(fechas, using=self.db)
+            transaction.on_commit(lambda: CacheRepresentaciones().invalidar(*pedido_ids), using=self.db)
+        return filas
+
+    def delete(self):
+        """Elimina en bloque dejando una lápida por pedido en el registro de cambios"""
+        with transaction.atomic(using=self.db):
+            anteriores = list(self.values("id", "fecha", *CAMPOS_RESUMEN))
+            pedido_ids = [fila["id"] for fila in anteriores]
+            resultado = super().delete()
+            CambioPedido.registrar(CambioPedido.ELIMINADO, pedido_ids)
+            ResumenCliente.aplicar(restar=anteriores)
+            invalidar_series_al_confirmar([fila["fecha"] for fila in anteriores], using=self.db)
+            transaction.on_commit(lambda: CacheRepresentaciones().invalidar(*pedido_ids), using=self.db)
+        return resultado
+
+    def archivar(self):
+        """
+        Elimina los pedidos ya copiados al archivo frío. A diferencia de delete(),
+        no son bajas: no se resta su gasto de ResumenCliente, no se registran
+        lápidas en CambioPedido ni se invalidan las cubetas de la serie.
+
+        Returns:
+            int: Número de pedidos eliminados
+        """
+        with transaction.atomic(using=self.db):
+            pedido_ids = list(self.values_list("id", flat=True))
+            eliminados = self.model.objects.filter(id__in=pedido_ids)._raw_delete(self.db)
+            transaction.on_commit(lambda: CacheRepresentaciones().invalidar(*pedido_ids), using=self.db)
+        return eliminados
+
 
 class PedidoCafe(models.Model):
     cliente = models.CharField(max_length=100)
@@ -20,7 +217,16 @@ class PedidoCafe(models.Model):
             ("grande", "Grande"),
         ],
     )
-    fecha = models.DateTimeField(auto_now_add=True)
+    fecha = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Clave normalizada de `cliente` para búsquedas indexadas (índice pedido_cliente_fecha_idx)
+    cliente_busqueda = models.CharField(max_length=100, editable=False, default="")
+    # Máscara de bits de `ingredientes` (ver CafePersonalizadoBuilder.codificar_ingredientes;
+    # índice pedido_ingred_fecha_idx)
+    ingredientes_mascara = models.PositiveSmallIntegerField(editable=False, default=0)
+    # Versión de la fila: aumenta en cada modificación (claves de caché de representaciones)
+    version = models.PositiveIntegerField(editable=False, default=1)
+
+    objects = PedidoCafeQuerySet.as_manager()
 
     def clean(self):
         """Validación de ingredientes permitidos"""
@@ -36,13 +242,354 @@ class PedidoCafe(models.Model):
                         f"Ingredientes válidos: {', '.join(ingredientes_validos)}"
                     )
 
+    def sincronizar_campos_derivados(self):
+        """Recalcula los campos derivados de los datos del pedido"""
+        self.cliente_busqueda = normalizar_cliente(self.cliente)
+        self.ingredientes_mascara = codificar_ingredientes(self.ingredientes)
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        self.sincronizar_campos_derivados()
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'version'}
+        operacion = CambioPedido.CREADO if self._state.adding else CambioPedido.ACTUALIZADO
+        with transaction.atomic(using=kwargs.get('using')):
+            anterior = None
+            if not self._state.adding:
+                anterior = PedidoCafe.objects.filter(pk=self.pk).values("fecha", *CAMPOS_RESUMEN).first()
+            super().save(*args, **kwargs)
+            TokenCliente.registrar({self.cliente_busqueda})
+            CambioPedido.registrar(operacion, [self.pk])
+            ResumenCliente.aplicar(sumar=[ResumenCliente.fila(self)], restar=[anterior] if anterior else [])
+            if anterior is None:
+                invalidar_series_al_confirmar([self.fecha], using=kwargs.get('using'))
+            elif any(anterior[campo] != getattr(self, campo) for campo in CAMPOS_SERIE):
+                invalidar_series_al_confirmar([anterior["fecha"], self.fecha], using=kwargs.get('using'))
+
+    def delete(self, *args, **kwargs):
+        pedido_id = self.pk
+        with transaction.atomic(using=kwargs.get('using')):
+            anterior = PedidoCafe.objects.filter(pk=pedido_id).values("fecha", *CAMPOS_RESUMEN).first()
+            resultado = super().delete(*args, **kwargs)
+            CambioPedido.registrar(CambioPedido.ELIMINADO, [pedido_id])
+            ResumenCliente.aplicar(restar=[anterior] if anterior else [])
+            if anterior:
+                invalidar_series_al_confirmar([anterior["fecha"]], using=kwargs.get('using'))
+        return resultado
 
     def __str__(self):
         return f"Pedido de {self.cliente} - {self.tipo_base} {self.tamanio}"
 
     class Meta:
         verbose_name = "Pedido de Café"
-        verbose_name_plural = "Pedidos de Café"
\ No newline at end of file
+        verbose_name_plural = "Pedidos de Café"
+        # Índices de los filtros de la lista (ver pedidos_cafe/filtros.py):
+        # igualdades como prefijo y la fecha al final para rango y orden
+        indexes = [
+            models.Index(fields=["tipo_base", "fecha"], name="pedido_tipo_fecha_idx"),
+            models.Index(fields=["tamanio", "fecha"], name="pedido_tamanio_fecha_idx"),
+            models.Index(fields=["tipo_base", "tamanio", "fecha"], name="pedido_tipo_tam_fecha_idx"),
+            models.Index(fields=["cliente_busqueda", "fecha"], name="pedido_cliente_fecha_idx"),
+            models.Index(fields=["ingredientes_mascara", "fecha"], name="pedido_ingred_fecha_idx"),
+        ]
+
+
+@contextmanager
+def fechas_explicitas():
+    """
+    Permite insertar pedidos conservando la `fecha` asignada (cargas masivas,
+    importaciones), desactivando auto_now_add dentro del bloque.
+    Modifica el campo para todo el proceso: usar solo en comandos de gestión.
+    """
+    campo = PedidoCafe._meta.get_field("fecha")
+    campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        campo.auto_now_add = True
+
+
+class TokenCliente(models.Model):
+    """
+    Índice invertido de palabras de clientes.
+    Relaciona cada palabra normalizada con la clave de búsqueda del cliente,
+    una sola vez por cliente distinto, para buscar por prefijo de palabra.
+    """
+    token = models.CharField(max_length=100)
+    clave = models.CharField(max_length=100)
+
+    @classmethod
+    def registrar(cls, claves):
+        """
+        Registra las palabras de las claves de búsqueda indicadas.
+
+        Args:
+            claves (iterable): Claves normalizadas de clientes
+        """
+        tokens = [
+            cls(token=token, clave=clave)
+            for clave in claves
+            for token in set(clave.split())
+        ]
+        if tokens:
+            cls.objects.bulk_create(tokens, ignore_conflicts=True, batch_size=500)
+
+    def __str__(self):
+        return f"{self.token} -> {self.clave}"
+
+    class Meta:
+        verbose_name = "Palabra de Cliente"
+        verbose_name_plural = "Palabras de Clientes"
+        constraints = [
+            models.UniqueConstraint(fields=["token", "clave"], name="token_cliente_unico"),
+        ]
+
+
+class CambioPedido(models.Model):
+    """
+    Registro de cambios de pedidos para la sincronización incremental.
+    La secuencia es la clave primaria: SQLite la genera con AUTOINCREMENT,
+    así que crece siempre y nunca se reutiliza. Como SQLite serializa las
+    escrituras, los cambios se confirman en orden de secuencia.
+    Las eliminaciones quedan como lápidas (operación "eliminado").
+    """
+    CREADO = "creado"
+    ACTUALIZADO = "actualizado"
+    ELIMINADO = "eliminado"
+
+    secuencia = models.BigAutoField(primary_key=True)
+    pedido_id = models.BigIntegerField()
+    operacion = models.CharField(
+        max_length=12,
+        choices=[
+            (CREADO, "Creado"),
+            (ACTUALIZADO, "Actualizado"),
+            (ELIMINADO, "Eliminado"),
+        ],
+    )
+    fecha = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    @classmethod
+    def registrar(cls, operacion, pedido_ids):
+        """
+        Registra una operación sobre los pedidos indicados.
+        Debe llamarse dentro de la transacción que modifica los pedidos.
+
+        Args:
+            operacion (str): CREADO, ACTUALIZADO o ELIMINADO
+            pedido_ids (iterable): IDs de los pedidos afectados
+        """
+        cambios = [cls(pedido_id=pedido_id, operacion=operacion) for pedido_id in pedido_ids]
+        if cambios:
+            cambios = cls.objects.bulk_create(cambios, batch_size=500)
+            # Los suscriptores del flujo de eventos solo ven cambios confirmados
+            transaction.on_commit(lambda: publicar_cambios(cambios))
+
+    def __str__(self):
+        return f"#{self.secuencia} {self.operacion} pedido {self.pedido_id}"
+
+    class Meta:
+        verbose_name = "Cambio de Pedido"
+        verbose_name_plural = "Cambios de Pedidos"
+        ordering = ["secuencia"]
+
+
+class ResumenCliente(models.Model):
+    """
+    Agregados por cliente (clave normalizada de búsqueda): cantidad de
+    pedidos, gasto total y pedidos por tipo de café. Se mantienen de forma
+    incremental en la misma transacción que cada alta, modificación o baja
+    de pedidos, de modo que consultarlos no recorre los pedidos del cliente.
+    """
+    clave = models.CharField(max_length=100, unique=True)
+    # Nombre del cliente tal como se escribió en su primer pedido
+    cliente = models.CharField(max_length=100)
+    total_pedidos = models.PositiveIntegerField(default=0)
+    gasto_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    pedidos_espresso = models.PositiveIntegerField(default=0)
+    pedidos_americano = models.PositiveIntegerField(default=0)
+    pedidos_latte = models.PositiveIntegerField(default=0)
+
+    # Tipo de café base -> columna con su conteo
+    COLUMNAS_TIPO = {
+        "espresso": "pedidos_espresso",
+        "americano": "pedidos_americano",
+        "latte": "pedidos_latte",
+    }
+
+    @staticmethod
+    def fila(pedido):
+        """Retorna los campos de un pedido que aportan al resumen"""
+        return {campo: getattr(pedido, campo) for campo in CAMPOS_RESUMEN}
+
+    @classmethod
+    def aplicar(cls, sumar=(), restar=()):
+        """
+        Suma o resta el aporte de pedidos a los resúmenes de sus clientes.
+        Debe llamarse dentro de la transacción que modifica los pedidos.
+        Los incrementos se aplican con expresiones F() y los clientes con el
+        mismo incremento se actualizan con una sola sentencia.
+
+        Args:
+            sumar (iterable): Filas (dict con CAMPOS_RESUMEN) de pedidos nuevos o actuales
+            restar (iterable): Filas de pedidos eliminados o en su estado anterior
+        """
+        deltas = defaultdict(lambda: [0, Decimal("0"), dict.fromkeys(cls.COLUMNAS_TIPO, 0)])
+        nombres = {}
+        for signo, filas in ((1, sumar), (-1, restar)):
+            for fila in filas:
+                delta = deltas[fila["cliente_busqueda"]]
+                delta[0] += signo
+                precio = calcular_precio(fila["tipo_base"], fila["ingredientes"], fila["tamanio"])
+                delta[1] += signo * Decimal(str(precio))
+                delta[2][fila["tipo_base"]] += signo
+                nombres.setdefault(fila["cliente_busqueda"], fila["cliente"])
+        if not deltas:
+            return
+
+        claves = list(deltas)
+        cls.objects.bulk_create(
+            [cls(clave=clave, cliente=nombres[clave]) for clave in claves],
+            ignore_conflicts=True, batch_size=500,
+        )
+
+        grupos = defaultdict(list)
+        for clave, (pedidos, gasto, por_tipo) in deltas.items():
+            if pedidos or gasto or any(por_tipo.values()):
+                grupos[(pedidos, gasto, tuple(por_tipo.items()))].append(clave)
+        for (pedidos, gasto, por_tipo), claves_grupo in grupos.items():
+            cambios = {"total_pedidos": models.F("total_pedidos") + pedidos,
+                       "gasto_total": models.F("gasto_total") + gasto}
+            for tipo, cantidad in por_tipo:
+                if cantidad:
+                    columna = cls.COLUMNAS_TIPO[tipo]
+                    cambios[columna] = models.F(columna) + cantidad
+            for inicio in range(0, len(claves_grupo), 500):
+                cls.objects.filter(clave__in=claves_grupo[inicio:inicio + 500]).update(**cambios)
+
+        for inicio in range(0, len(claves), 500):
+            cls.objects.filter(clave__in=claves[inicio:inicio + 500], total_pedidos=0).delete()
+
+    @classmethod
+    def actualizar_por_cambio(cls, anteriores, cambios):
+        """
+        Ajusta los resúmenes tras un UPDATE en bloque de pedidos.
+
+        Args:
+            anteriores (list): Filas de los pedidos antes de la modificación
+            cambios (dict): Valores asignados por el UPDATE
+        """
+        campos = CAMPOS_RESUMEN.intersection(cambios)
+        expresiones = {campo for campo in campos if isinstance(cambios[campo], models.expressions.Combinable)}
+        if expresiones:
+            # Con expresiones no se conoce el valor nuevo sin volver a leer las filas
+            claves = {fila["cliente_busqueda"] for fila in anteriores}
+            if expresiones & {"cliente", "cliente_busqueda"}:
+                claves.update(
+                    PedidoCafe.objects.filter(id__in=[fila["id"] for fila in anteriores])
+                    .values_list("cliente_busqueda", flat=True)
+                )
+            elif "cliente_busqueda" in cambios:
+                claves.add(cambios["cliente_busqueda"])
+            cls.recalcular(claves)
+            return
+        nuevos = [dict(fila, **{campo: cambios[campo] for campo in campos}) for fila in anteriores]
+        cls.aplicar(sumar=nuevos, restar=anteriores)
+
+    @classmethod
+    def recalcular(cls, claves):
+        """
+        Reconstruye desde los pedidos el resumen de los clientes indicados.
+
+        Args:
+            claves (iterable): Claves normalizadas de clientes
+        """
+        claves = list(claves)
+        for inicio in range(0, len(claves), 500):
+            lote = claves[inicio:inicio + 500]
+            cls.objects.filter(clave__in=lote).delete()
+            cls.aplicar(sumar=PedidoCafe.objects.filter(cliente_busqueda__in=lote).values(*CAMPOS_RESUMEN))
+
+    def base_favorita(self):
+        """Retorna el tipo de café más pedido (el primero del catálogo si hay empate)"""
+        if not self.total_pedidos:
+            return None
+        return max(self.COLUMNAS_TIPO, key=lambda tipo: getattr(self, self.COLUMNAS_TIPO[tipo]))
+
+    def __str__(self):
+        return f"{self.cliente}: {self.total_pedidos} pedidos, ${self.gasto_total}"
+
+    class Meta:
+        verbose_name = "Resumen de Cliente"
+        verbose_name_plural = "Resúmenes de Clientes"
+
+
+class ClaveIdempotencia(models.Model):
+    """
+    Respuesta (o reserva en curso) de una clave Idempotency-Key.
+    La restricción única sobre la clave hace que, entre todos los workers,
+    solo una solicitud pueda reservarla y ejecutar la creación.
+    """
+    # SHA-256 del usuario y la clave recibida
+    clave = models.CharField(max_length=64, unique=True)
+    huella = models.CharField(max_length=64)
+    # None mientras la solicitud original está en curso
+    status = models.PositiveSmallIntegerField(null=True)
+    respuesta = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    cabeceras = models.JSONField(default=dict)
+    creada = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.clave[:12]}… ({self.status or 'en curso'})"
+
+    class Meta:
+        verbose_name = "Clave de Idempotencia"
+        verbose_name_plural = "Claves de Idempotencia"
+
+
+class TicketIngesta(models.Model):
+    """
+    Estado de un pedido aceptado por la cola de ingesta diferida
+    (pedidos_cafe/ingesta.py). Se guarda en la base de datos para que
+    cualquier worker responda por un ticket emitido por otro.
+    """
+    ticket = models.CharField(max_length=32, unique=True)
+    estado = models.CharField(max_length=12)
+    # Sin clave foránea: el pedido puede eliminarse o archivarse después
+    pedido_id = models.PositiveBigIntegerField(null=True)
+    error = models.TextField(blank=True, default="")
+    actualizado = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.ticket} ({self.estado})"
+
+    class Meta:
+        verbose_name = "Ticket de Ingesta"
+        verbose_name_plural = "Tickets de Ingesta"
+
+
+class CubetaSerie(models.Model):
+    """
+    Cubeta cerrada de la serie temporal de pedidos (pedidos_cafe/series.py).
+    Se guarda al calcularla por primera vez y se invalida cuando se escribe un
+    pedido con fecha en ella, de modo que las consultas siguientes no la
+    recalculan en SQL.
+    """
+    bucket = models.CharField(max_length=10)
+    inicio = models.DateTimeField()
+    # Totales de la cubeta (total, por_tipo y por_tamanio); None si se invalidó
+    datos = models.JSONField(null=True)
+    # Inicio del cálculo que guardó los datos, o momento de la invalidación
+    calculada = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.bucket} {self.inicio.isoformat()}"
+
+    class Meta:
+        verbose_name = "Cubeta de Serie"
+        verbose_name_plural = "Cubetas de Serie"
+        constraints = [
+            models.UniqueConstraint(fields=["bucket", "inicio"], name="cubeta_serie_unica"),
+        ]
@@ -0,0 +1,112 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.functional import cached_property
+
+
+def clave_consulta(prefijo, queryset, *extra):
+    """
+    Genera una clave de caché estable a partir del SQL de un queryset.
+
+    Args:
+        prefijo (str): Prefijo de la clave
+        queryset (QuerySet): Consulta a identificar
+        *extra: Valores adicionales que distinguen la clave
+
+    Returns:
+        str: Clave de caché
+    """
+    texto = "|".join([queryset.db, str(queryset.query)] + [repr(valor) for valor in extra])
+    return f"{prefijo}:{hashlib.md5(texto.encode('utf-8')).hexdigest()}"
+
+
+class PaginadorConteoEstimado(Paginator):
+    """
+    Paginador para tablas grandes que evita COUNT(*) en cada listado.
+    Sin filtros usa el número de filas de las estadísticas de SQLite
+    (sqlite_stat1, actualizadas por ANALYZE) si existen y, si no, el rango
+    MAX(id) - MIN(id) + 1, que se lee del índice de la clave primaria. Con
+    filtros cachea el conteo exacto durante unos segundos.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where and not queryset.query.distinct:
+            estimado = filas_estimadas(queryset.model, queryset.db)
+            if estimado is None:
+                estimado = filas_por_rango_de_ids(queryset.model, queryset.db)
+            if estimado is not None:
+                return estimado
+
+        clave = clave_consulta('paginador:conteo', queryset)
+        total = cache.get(clave)
+        if total is None:
+            total = queryset.count()
+            cache.set(clave, total, getattr(settings, 'ADMIN_CACHE_CONTEO_SEGUNDOS', 60))
+        return total
+
+
+def filas_estimadas(modelo, alias):
+    """
+    Lee el número de filas de una tabla desde sqlite_stat1.
+
+    Args:
+        modelo: Modelo cuya tabla se consulta
+        alias (str): Alias de la base de datos
+
+    Returns:
+        int: Filas según el último ANALYZE, o None si no hay estadísticas
+    """
+    conexion = connections[alias]
+    if conexion.vendor != 'sqlite':
+        return None
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [modelo._meta.db_table])
+        fila = cursor.fetchone()
+    # El primer número de stat es la cantidad de filas de la tabla
+    return int(fila[0].split()[0]) if fila else None
+
+
+def filas_por_rango_de_ids(modelo, alias):
+    """
+    Estima el número de filas por el rango de la clave primaria. Cuenta de
+    más las filas eliminadas, pero no recorre la tabla.
+
+    Args:
+        modelo: Modelo con clave primaria entera autoincremental
+        alias (str): Alias de la base de datos
+
+    Returns:
+        int: MAX(id) - MIN(id) + 1, 0 si la tabla está vacía, o None si la
+            clave primaria no es entera
+    """
+    if modelo._meta.pk.get_internal_type() not in ('AutoField', 'BigAutoField', 'SmallAutoField'):
+        return None
+    rango = modelo._base_manager.using(alias).aggregate(minimo=Min('pk'), maximo=Max('pk'))
+    if rango['minimo'] is None:
+        return 0
+    return rango['maximo'] - rango['minimo'] + 1
+
+
+def actualizar_estadisticas(modelo, alias='default'):
+    """
+    Ejecuta ANALYZE sobre la tabla de un modelo para que sqlite_stat1 refleje
+    su tamaño. Se llama tras las cargas masivas (sembrar_pedidos, importar_pedidos).
+
+    Args:
+        modelo: Modelo cuya tabla se analiza
+        alias (str): Alias de la base de datos
+    """
+    conexion = connections[alias]
+    if conexion.vendor != 'sqlite':
+        return
+    with conexion.cursor() as cursor:
+        cursor.execute(f"ANALYZE {conexion.ops.quote_name(modelo._meta.db_table)}")
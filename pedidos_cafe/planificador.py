@@ -0,0 +1,259 @@
+"""
+Planificación de la cola de preparación en estaciones de barista.
+
+Estima el tiempo de preparación de cada pedido a partir de su tipo, tamaño e
+ingredientes y simula su asignación a N estaciones con una política
+intercambiable: FIFO, el trabajo más corto primero (SJF) o lotes de recetas
+idénticas, donde cada bebida adicional del lote cuesta solo una fracción.
+"""
+
+import heapq
+
+from pedidos_cafe.codificacion import codificar_ingredientes
+
+# Segundos de preparación por tipo de café base
+TIEMPOS_BASE = {
+    "espresso": 45,
+    "americano": 60,
+    "latte": 120,
+}
+
+# Segundos adicionales por ingrediente
+TIEMPOS_INGREDIENTE = {
+    "canela": 5,
+    "chocolate": 20,
+    "vainilla": 10,
+    "azucar": 3,
+    "leche extra": 25,
+}
+
+FACTORES_TAMANIO = {
+    "pequeño": 1.0,
+    "mediano": 1.2,
+    "grande": 1.5,
+}
+
+# Costo de cada bebida adicional de un lote respecto de la primera
+FRACCION_LOTE = 0.35
+
+
+def estimar_preparacion(tipo_base, tamanio, ingredientes):
+    """
+    Estima el tiempo de preparación de un pedido.
+
+    Args:
+        tipo_base (str): Tipo de café base
+        tamanio (str): Tamaño del café
+        ingredientes (list): Ingredientes adicionales
+
+    Returns:
+        float: Segundos estimados de preparación
+    """
+    segundos = TIEMPOS_BASE[tipo_base] + sum(TIEMPOS_INGREDIENTE[i] for i in ingredientes or ())
+    return round(segundos * FACTORES_TAMANIO[tamanio], 1)
+
+
+def percentil(valores, p):
+    """Retorna el percentil p (0-100) de una lista de valores"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+class TrabajoPreparacion:
+    """Pedido en la cola de preparación con su estimación y su asignación"""
+
+    __slots__ = ("pedido_id", "llegada", "receta", "duracion", "estacion", "inicio", "fin")
+
+    def __init__(self, pedido_id, llegada, tipo_base, tamanio, ingredientes):
+        """
+        Args:
+            pedido_id (int): ID del pedido
+            llegada (float): Segundos desde el inicio de la simulación
+            tipo_base (str): Tipo de café base
+            tamanio (str): Tamaño del café
+            ingredientes (list): Ingredientes adicionales
+        """
+        self.pedido_id = pedido_id
+        self.llegada = llegada
+        # Dos pedidos con la misma receta los construye igual CafeDirector
+        self.receta = (tipo_base, codificar_ingredientes(ingredientes), tamanio)
+        self.duracion = estimar_preparacion(tipo_base, tamanio, ingredientes)
+        self.estacion = None
+        self.inicio = None
+        self.fin = None
+
+    @property
+    def espera(self):
+        """Segundos entre la llegada y el inicio de la preparación"""
+        return self.inicio - self.llegada
+
+
+class PoliticaFIFO:
+    """Atiende los pedidos en orden de llegada"""
+    nombre = "fifo"
+
+    def seleccionar(self, cola):
+        return [cola.pop(0)]
+
+
+class PoliticaTrabajoMasCorto:
+    """
+    Atiende primero el pedido listo de menor duración (SJF).
+    Minimiza la espera media, aunque los pedidos largos pueden esperar mucho
+    si la cola nunca se vacía.
+    """
+    nombre = "sjf"
+
+    def seleccionar(self, cola):
+        indice = min(range(len(cola)), key=lambda i: (cola[i].duracion, cola[i].llegada))
+        return [cola.pop(indice)]
+
+
+class PoliticaLotes:
+    """
+    Toma el pedido más antiguo y agrupa con él los pedidos listos con la
+    misma receta, hasta el tamaño máximo de lote.
+    """
+    nombre = "lotes"
+
+    def __init__(self, lote_maximo=4):
+        self.lote_maximo = lote_maximo
+
+    def seleccionar(self, cola):
+        primero = cola.pop(0)
+        lote = [primero]
+        indice = 0
+        while indice < len(cola) and len(lote) < self.lote_maximo:
+            if cola[indice].receta == primero.receta:
+                lote.append(cola.pop(indice))
+            else:
+                indice += 1
+        return lote
+
+
+class PlanPreparacion:
+    """Resultado de una planificación: trabajos asignados y métricas"""
+
+    def __init__(self, trabajos, estaciones, politica):
+        self.trabajos = trabajos
+        self.estaciones = estaciones
+        self.politica = politica
+
+    def por_estacion(self):
+        """Retorna los trabajos agrupados por estación en orden de inicio"""
+        estaciones = [[] for _ in range(self.estaciones)]
+        for trabajo in sorted(self.trabajos, key=lambda t: (t.inicio, t.pedido_id)):
+            estaciones[trabajo.estacion].append(trabajo)
+        return estaciones
+
+    def metricas(self):
+        """
+        Calcula rendimiento, ocupación y percentiles de espera.
+
+        Returns:
+            dict: Métricas de la planificación (tiempos en segundos)
+        """
+        if not self.trabajos:
+            return {"pedidos": 0, "politica": self.politica, "estaciones": self.estaciones}
+        esperas = [trabajo.espera for trabajo in self.trabajos]
+        inicio = min(trabajo.llegada for trabajo in self.trabajos)
+        fin = max(trabajo.fin for trabajo in self.trabajos)
+        duracion = max(fin - inicio, 1e-9)
+        ocupado = sum(fin_lote - inicio_lote for inicio_lote, fin_lote in self._lotes())
+        return {
+            "pedidos": len(self.trabajos),
+            "politica": self.politica,
+            "estaciones": self.estaciones,
+            "duracion_total": round(duracion, 1),
+            "pedidos_por_hora": round(len(self.trabajos) * 3600 / duracion, 1),
+            "ocupacion": round(ocupado / (duracion * self.estaciones), 3),
+            "espera_media": round(sum(esperas) / len(esperas), 1),
+            "espera_p50": round(percentil(esperas, 50), 1),
+            "espera_p95": round(percentil(esperas, 95), 1),
+            "espera_p99": round(percentil(esperas, 99), 1),
+            "espera_maxima": round(max(esperas), 1),
+        }
+
+    def _lotes(self):
+        # Los trabajos de un mismo lote comparten estación, inicio y fin
+        return {(t.estacion, t.inicio, t.fin): (t.inicio, t.fin) for t in self.trabajos}.values()
+
+
+class Planificador:
+    """
+    Asigna pedidos a estaciones de barista simulando la cola por eventos:
+    cada vez que una estación queda libre, la política elige qué preparar
+    entre los pedidos que ya llegaron.
+    """
+
+    # Registro de políticas disponibles
+    _politicas = {
+        PoliticaFIFO.nombre: PoliticaFIFO,
+        PoliticaTrabajoMasCorto.nombre: PoliticaTrabajoMasCorto,
+        PoliticaLotes.nombre: PoliticaLotes,
+    }
+
+    def __init__(self, estaciones=2, politica="fifo"):
+        """
+        Args:
+            estaciones (int): Número de estaciones de barista
+            politica (str): Nombre de la política ("fifo", "sjf" o "lotes")
+
+        Raises:
+            ValueError: Si la política no existe o no hay estaciones
+        """
+        if politica not in self._politicas:
+            raise ValueError(
+                f"Política '{politica}' no válida. Políticas válidas: {list(self._politicas)}"
+            )
+        if estaciones < 1:
+            raise ValueError("Debe haber al menos una estación")
+        self.estaciones = estaciones
+        self.nombre_politica = politica
+        self.politica = self._politicas[politica]()
+
+    @classmethod
+    def registrar_politica(cls, politica):
+        """Registra una nueva política (clase con atributo `nombre` y método seleccionar)"""
+        cls._politicas[politica.nombre] = politica
+
+    @classmethod
+    def politicas_disponibles(cls):
+        """Retorna los nombres de las políticas registradas"""
+        return list(cls._politicas)
+
+    def planificar(self, trabajos):
+        """
+        Asigna estación, inicio y fin a cada trabajo.
+
+        Args:
+            trabajos (list): Instancias de TrabajoPreparacion
+
+        Returns:
+            PlanPreparacion: Trabajos asignados y sus métricas
+        """
+        pendientes = sorted(trabajos, key=lambda t: (t.llegada, t.pedido_id))
+        libres = [(0.0, estacion) for estacion in range(self.estaciones)]
+        cola = []
+        siguiente = 0
+
+        while siguiente < len(pendientes) or cola:
+            reloj, estacion = heapq.heappop(libres)
+            if not cola:
+                reloj = max(reloj, pendientes[siguiente].llegada)
+            while siguiente < len(pendientes) and pendientes[siguiente].llegada <= reloj:
+                cola.append(pendientes[siguiente])
+                siguiente += 1
+
+            lote = self.politica.seleccionar(cola)
+            fin = reloj + lote[0].duracion + sum(t.duracion * FRACCION_LOTE for t in lote[1:])
+            for trabajo in lote:
+                trabajo.estacion = estacion
+                trabajo.inicio = reloj
+                trabajo.fin = fin
+            heapq.heappush(libres, (fin, estacion))
+
+        return PlanPreparacion(pendientes, self.estaciones, self.nombre_politica)
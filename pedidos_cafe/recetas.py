@@ -0,0 +1,162 @@
+"""
+Recetas con nombre construidas por CafeDirector (paquetes especiales).
+
+Cada receta se precompila al arrancar para todos los tipos de café base:
+se ejecuta una vez el Director con un Builder real y se guardan el precio,
+los ingredientes y el tamaño resultantes. El catálogo se sirve desde memoria
+con un ETag estable, y los pedidos pueden crearse indicando solo el nombre
+de la receta.
+"""
+
+import hashlib
+import json
+from threading import Lock
+
+from api_patrones.logger import Logger
+from api_patrones.renderers import FragmentoJSON
+from pedidos_cafe.builder import CafeDirector, CafePersonalizadoBuilder
+from pedidos_cafe.factory import CafeFactory
+
+
+class Receta:
+    """Receta con nombre: una función que construye el café con el Director"""
+
+    def __init__(self, nombre, descripcion, construir):
+        """
+        Args:
+            nombre (str): Nombre de la receta (p. ej. "paquete_1")
+            descripcion (str): Descripción para el menú
+            construir (callable): Recibe un CafeDirector y construye el café
+        """
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.construir = construir
+
+
+class CatalogoRecetas:
+    """
+    Patrón Singleton con el registro de recetas y sus resultados precompilados
+    para cada tipo de café base.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(CatalogoRecetas, cls).__new__(cls)
+                    instancia._recetas = {}
+                    instancia._compilado = None
+                    instancia._lock_compilacion = Lock()
+                    for receta in RECETAS_PREDEFINIDAS:
+                        instancia._recetas[receta.nombre] = receta
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def registrar(self, receta):
+        """
+        Registra una receta nueva y descarta la compilación anterior.
+
+        Args:
+            receta (Receta): Receta a registrar
+        """
+        with self._lock_compilacion:
+            self._recetas[receta.nombre] = receta
+            self._compilado = None
+        Logger().registrar(f"Recetas: Registrada receta '{receta.nombre}'")
+
+    def precompilar(self):
+        """
+        Construye cada receta sobre cada tipo de café base.
+        Se vuelve a compilar si cambian los tipos registrados en el Factory.
+
+        Returns:
+            dict: Catálogo compilado {"paquetes", "tipos", "etag", "respuesta"}
+                donde "respuesta" es el cuerpo de GET /api/pedidos/paquetes/ precodificado
+        """
+        tipos = tuple(CafeFactory.obtener_tipos_disponibles())
+        compilado = self._compilado
+        if compilado is not None and compilado["tipos"] == tipos:
+            return compilado
+
+        with self._lock_compilacion:
+            if self._compilado is not None and self._compilado["tipos"] == tipos:
+                return self._compilado
+            paquetes = [self._compilar(receta, tipos) for receta in self._recetas.values()]
+            contenido = json.dumps(paquetes, sort_keys=True, ensure_ascii=False)
+            self._compilado = {
+                "paquetes": paquetes,
+                "tipos": tipos,
+                "etag": '"' + hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:32] + '"',
+                "respuesta": FragmentoJSON({"paquetes": paquetes, "total_paquetes": len(paquetes)}),
+            }
+        Logger().registrar(f"Recetas: Precompiladas {len(paquetes)} recetas para {len(tipos)} tipos de café")
+        return self._compilado
+
+    @staticmethod
+    def _compilar(receta, tipos):
+        precios = {}
+        ingredientes = tamanio = None
+        for tipo in tipos:
+            cafe_base = CafeFactory.obtener_base(tipo)
+            builder = CafePersonalizadoBuilder(cafe_base)
+            receta.construir(CafeDirector(builder))
+            agregados = builder.obtener_ingredientes_finales()[len(cafe_base.obtener_ingredientes_base()):]
+            # Los ingredientes y el tamaño de la receta no dependen del café base
+            ingredientes, tamanio = agregados, builder.obtener_tamanio()
+            precios[tipo] = {
+                "precio": builder.obtener_precio(),
+                "ingredientes_finales": builder.obtener_ingredientes_finales(),
+            }
+        return {
+            "nombre": receta.nombre,
+            "descripcion": receta.descripcion,
+            "ingredientes": ingredientes,
+            "tamanio": tamanio,
+            "por_tipo": precios,
+        }
+
+    def obtener(self, nombre):
+        """
+        Retorna una receta compilada por nombre.
+
+        Raises:
+            ValueError: Si la receta no existe
+        """
+        for paquete in self.precompilar()["paquetes"]:
+            if paquete["nombre"] == nombre:
+                return paquete
+        raise ValueError(f"Receta '{nombre}' no válida. Recetas válidas: {list(self._recetas)}")
+
+    def expandir_pedido(self, datos):
+        """
+        Completa los ingredientes y el tamaño de un pedido que indica una receta.
+
+        Args:
+            datos (dict): Datos del pedido con la clave "receta"
+
+        Returns:
+            dict: Copia de los datos con ingredientes y tamaño de la receta
+
+        Raises:
+            ValueError: Si la receta no existe o el pedido también indica
+                ingredientes o tamaño
+        """
+        paquete = self.obtener(datos["receta"])
+        conflictos = [campo for campo in ("ingredientes", "tamanio") if campo in datos]
+        if conflictos:
+            raise ValueError(f"Un pedido con receta no puede indicar también: {', '.join(conflictos)}")
+        expandido = {clave: valor for clave, valor in datos.items() if clave != "receta"}
+        expandido["ingredientes"] = list(paquete["ingredientes"])
+        expandido["tamanio"] = paquete["tamanio"]
+        return expandido
+
+
+RECETAS_PREDEFINIDAS = [
+    Receta("paquete_1", "Canela + Chocolate, tamaño mediano", CafeDirector.construir_paquete_1),
+    Receta("paquete_2", "Vainilla + Azúcar, tamaño grande", CafeDirector.construir_paquete_2),
+    Receta("paquete_3", "Leche extra + Canela, tamaño pequeño", CafeDirector.construir_paquete_3),
+    Receta("premium", "Chocolate, vainilla, canela y leche extra, tamaño grande",
+           CafeDirector.construir_cafe_premium),
+]
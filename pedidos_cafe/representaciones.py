@@ -0,0 +1,111 @@
+import json
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+
+
+class CacheRepresentaciones:
+    """
+    Patrón Singleton que cachea la salida de PedidoCafeSerializer por pedido.
+    Cada entrada guarda la versión de fila con la que se generó: una versión
+    distinta en la base de datos es un fallo, de modo que las escrituras hechas
+    en otros procesos nunca sirven datos obsoletos. Se desaloja por LRU al
+    superar el tope de memoria estimada.
+    """
+    _instancia = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instancia is None:
+            with cls._lock:
+                if cls._instancia is None:
+                    instancia = super(CacheRepresentaciones, cls).__new__(cls)
+                    instancia.max_bytes = getattr(settings, 'CACHE_REPRESENTACIONES_MAX_BYTES', 16 * 1024 * 1024)
+                    instancia._entradas = OrderedDict()  # pedido_id -> (version, datos, bytes)
+                    instancia._lock_entradas = Lock()
+                    instancia._reiniciar_contadores()
+                    cls._instancia = instancia
+        return cls._instancia
+
+    def _reiniciar_contadores(self):
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def obtener(self, pedido_id, version):
+        """
+        Retorna la representación cacheada de un pedido si coincide la versión.
+        El diccionario retornado es compartido: no debe modificarse.
+
+        Args:
+            pedido_id (int): ID del pedido
+            version (int): Versión actual de la fila
+
+        Returns:
+            dict: Representación serializada, o None si no está cacheada
+        """
+        with self._lock_entradas:
+            entrada = self._entradas.get(pedido_id)
+            if entrada is None or entrada[0] != version:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(pedido_id)
+            self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, pedido_id, version, datos):
+        """
+        Guarda la representación de un pedido en una versión dada.
+
+        Args:
+            pedido_id (int): ID del pedido
+            version (int): Versión de la fila serializada
+            datos (dict): Salida del serializer
+        """
+        datos = dict(datos)
+        tamanio = len(json.dumps(datos, default=str))
+        if tamanio > self.max_bytes:
+            return
+        with self._lock_entradas:
+            anterior = self._entradas.pop(pedido_id, None)
+            if anterior is not None:
+                self.bytes -= anterior[2]
+            self._entradas[pedido_id] = (version, datos, tamanio)
+            self.bytes += tamanio
+            while self.bytes > self.max_bytes:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self.bytes -= liberado
+                self.desalojos += 1
+
+    def invalidar(self, *pedido_ids):
+        """Descarta las representaciones de los pedidos indicados"""
+        with self._lock_entradas:
+            for pedido_id in pedido_ids:
+                entrada = self._entradas.pop(pedido_id, None)
+                if entrada is not None:
+                    self.bytes -= entrada[2]
+                    self.invalidaciones += 1
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock_entradas:
+            self._entradas.clear()
+            self._reiniciar_contadores()
+
+    def estadisticas(self):
+        """Retorna los contadores de uso de la caché"""
+        with self._lock_entradas:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+                "desalojos": self.desalojos,
+                "invalidaciones": self.invalidaciones,
+            }
@@ -3,6 +3,7 @@ from pedidos_cafe.models import PedidoCafe
 from pedidos_cafe.factory import CafeFactory
 from pedidos_cafe.builder import CafePersonalizadoBuilder, CafeDirector
 from api_patrones.logger import Logger
+from api_patrones.tracing import trazar, anotar
 
 class PedidoCafeSerializer(serializers.ModelSerializer):
     """
@@ -26,6 +27,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
             "resumen_construccion",
         ]
 
+    @trazar("Serializer.get_precio_total", detalle=True)
     def get_precio_total(self, obj):
         """
         Calcula el precio total del pedido usando los patrones Factory y Builder.
@@ -36,6 +38,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
         Returns:
             float: Precio total calculado
         """
+        anotar(pedido_id=obj.id)
         try:
             # Patrón Factory: Crear el café base
             cafe_base = CafeFactory.obtener_base(obj.tipo_base)
@@ -63,6 +66,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
             logger.registrar(f"ERROR en cálculo de precio para pedido {obj.id}: {str(e)}")
             return 0.0
 
+    @trazar("Serializer.get_ingredientes_finales", detalle=True)
     def get_ingredientes_finales(self, obj):
         """
         Obtiene la lista completa de ingredientes finales del pedido.
@@ -73,6 +77,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
         Returns:
             list: Lista de ingredientes finales
         """
+        anotar(pedido_id=obj.id)
         try:
             # Patrón Factory: Crear el café base
             cafe_base = CafeFactory.obtener_base(obj.tipo_base)
@@ -100,6 +105,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
             logger.registrar(f"ERROR en obtención de ingredientes para pedido {obj.id}: {str(e)}")
             return []
 
+    @trazar("Serializer.get_resumen_construccion", detalle=True)
     def get_resumen_construccion(self, obj):
         """
         Obtiene un resumen completo de la construcción del café.
@@ -110,6 +116,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
         Returns:
             dict: Resumen de la construcción
         """
+        anotar(pedido_id=obj.id)
         try:
             # Patrón Factory: Crear el café base
             cafe_base = CafeFactory.obtener_base(obj.tipo_base)
@@ -189,6 +196,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
         
         return value
 
+    @trazar("Serializer.create")
     def create(self, validated_data):
         """
         Crea un nuevo pedido y registra la operación.
@@ -209,6 +217,7 @@ class PedidoCafeSerializer(serializers.ModelSerializer):
         
         return pedido
 
+    @trazar("Serializer.update")
     def update(self, instance, validated_data):
         """
         Actualiza un pedido existente y registra la operación.
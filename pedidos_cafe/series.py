@@ -0,0 +1,211 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute
+from django.utils import timezone
+
+from pedidos_cafe.models import CubetaSerie, PedidoCafe
+
+# Granularidades admitidas: función de truncado y duración de cada cubeta
+CUBETAS = {
+    "minute": (TruncMinute, timedelta(minutes=1)),
+    "hour": (TruncHour, timedelta(hours=1)),
+    "day": (TruncDay, timedelta(days=1)),
+}
+
+# Filas por sentencia al leer, guardar o invalidar cubetas
+TAMANIO_LOTE = 500
+
+
+def alinear(fecha, bucket):
+    """
+    Trunca una fecha al inicio de su cubeta en UTC.
+
+    Args:
+        fecha (datetime): Fecha con zona horaria
+        bucket (str): "minute", "hour" o "day"
+
+    Returns:
+        datetime: Inicio de la cubeta
+    """
+    fecha = fecha.astimezone(dt_timezone.utc)
+    if bucket == "minute":
+        return fecha.replace(second=0, microsecond=0)
+    if bucket == "hour":
+        return fecha.replace(minute=0, second=0, microsecond=0)
+    return fecha.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _margen_cierre():
+    # Margen para pedidos que llegan con retraso (p. ej. la cola de ingesta)
+    return timedelta(seconds=getattr(settings, "SERIE_MARGEN_CIERRE_SEGUNDOS", 60))
+
+
+def invalidar_series():
+    """Invalida todas las cubetas cerradas guardadas"""
+    CubetaSerie.objects.update(datos=None, calculada=timezone.now())
+
+
+def invalidar_si_afecta_cerradas(fechas):
+    """
+    Invalida las cubetas cerradas que contienen la fecha de algún pedido
+    creado, modificado o eliminado. La llaman los métodos de escritura de
+    PedidoCafe al confirmar la transacción.
+
+    Cada cubeta afectada queda como lápida (datos None) con la hora de la
+    invalidación, aunque todavía no estuviera guardada: así un cálculo que
+    leyó los pedidos antes de esta escritura no puede guardar datos viejos.
+
+    Args:
+        fechas (iterable): Fechas de los pedidos (None si se desconoce)
+    """
+    ahora = timezone.now()
+    fechas = list(fechas)
+    if any(fecha is None for fecha in fechas):
+        invalidar_series()
+        return
+    # Las fechas posteriores al límite solo pueden caer en cubetas abiertas
+    limite = ahora - _margen_cierre()
+    afectadas = sorted({
+        (bucket, alinear(fecha, bucket)) for fecha in fechas if fecha < limite for bucket in CUBETAS
+    })
+    if afectadas:
+        CubetaSerie.objects.bulk_create(
+            [CubetaSerie(bucket=bucket, inicio=inicio, datos=None, calculada=ahora) for bucket, inicio in afectadas],
+            batch_size=TAMANIO_LOTE,
+            update_conflicts=True,
+            unique_fields=["bucket", "inicio"],
+            update_fields=["datos", "calculada"],
+        )
+
+
+def _cubeta_vacia(inicio):
+    tipos = [valor for valor, _ in PedidoCafe._meta.get_field("tipo_base").choices]
+    tamanios = [valor for valor, _ in PedidoCafe._meta.get_field("tamanio").choices]
+    return {
+        "inicio": inicio.isoformat(),
+        "total": 0,
+        "por_tipo": dict.fromkeys(tipos, 0),
+        "por_tamanio": dict.fromkeys(tamanios, 0),
+    }
+
+
+def _consultar(bucket, desde, hasta):
+    truncar, _ = CUBETAS[bucket]
+    filas = (
+        PedidoCafe.objects
+        .filter(fecha__gte=desde, fecha__lt=hasta)
+        .annotate(cubeta=truncar("fecha", tzinfo=dt_timezone.utc))
+        .values("cubeta", "tipo_base", "tamanio")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    cubetas = {}
+    for fila in filas:
+        inicio = fila["cubeta"]
+        cubeta = cubetas.setdefault(inicio, _cubeta_vacia(inicio))
+        cubeta["total"] += fila["total"]
+        cubeta["por_tipo"][fila["tipo_base"]] = cubeta["por_tipo"].get(fila["tipo_base"], 0) + fila["total"]
+        cubeta["por_tamanio"][fila["tamanio"]] = cubeta["por_tamanio"].get(fila["tamanio"], 0) + fila["total"]
+    return cubetas
+
+
+def calcular_serie(bucket, desde, hasta):
+    """
+    Calcula la serie de pedidos por cubeta de tiempo, por tipo y por tamaño.
+    Las cubetas cerradas se guardan en CubetaSerie por SERIE_CACHE_TTL segundos
+    y se eliminan cuando se escribe un pedido con fecha en ellas; solo las
+    cubetas abiertas o no guardadas se consultan en SQL.
+
+    Args:
+        bucket (str): "minute", "hour" o "day"
+        desde (datetime): Inicio del rango (se alinea a la cubeta)
+        hasta (datetime): Fin del rango (exclusivo, se alinea a la cubeta siguiente)
+
+    Returns:
+        tuple: (lista de cubetas en orden, número de cubetas servidas desde caché)
+
+    Raises:
+        ValueError: Si la granularidad no es válida o el rango es demasiado grande
+    """
+    if bucket not in CUBETAS:
+        raise ValueError(f"Bucket '{bucket}' no válido. Buckets válidos: {list(CUBETAS)}")
+    _, paso = CUBETAS[bucket]
+
+    inicio = alinear(desde, bucket)
+    fin = alinear(hasta, bucket)
+    if fin < hasta:
+        fin += paso
+    numero = int((fin - inicio) / paso)
+    maximo = getattr(settings, "SERIE_MAX_CUBETAS", 2000)
+    if numero <= 0:
+        raise ValueError("El parámetro 'desde' debe ser anterior a 'hasta'")
+    if numero > maximo:
+        raise ValueError(f"El rango solicitado tiene {numero} cubetas; el máximo es {maximo}")
+
+    # Se toma antes de leer los pedidos: ver _guardar()
+    ahora = timezone.now()
+    limite_cerradas = ahora - _margen_cierre()
+    # El TTL acota la desactualización por escrituras fuera del ORM (SQL directo)
+    vigencia = ahora - timedelta(seconds=getattr(settings, "SERIE_CACHE_TTL", 86400))
+
+    inicios = [inicio + paso * i for i in range(numero)]
+    cerradas = {actual for actual in inicios if actual + paso <= limite_cerradas}
+    guardadas = {}
+    if cerradas:
+        filas = CubetaSerie.objects.filter(
+            bucket=bucket, inicio__gte=min(cerradas), inicio__lte=max(cerradas),
+            calculada__gte=vigencia, datos__isnull=False,
+        ).values_list("inicio", "datos")
+        guardadas = {actual: datos for actual, datos in filas}
+
+    faltantes = [actual for actual in inicios if actual not in guardadas]
+    consultadas = {}
+    if faltantes:
+        consultadas = _consultar(bucket, faltantes[0], faltantes[-1] + paso)
+
+    serie = []
+    nuevas = []
+    for actual in inicios:
+        if actual in guardadas:
+            cubeta = guardadas[actual]
+        else:
+            cubeta = consultadas.get(actual) or _cubeta_vacia(actual)
+            if actual in cerradas:
+                nuevas.append(CubetaSerie(bucket=bucket, inicio=actual, datos=cubeta, calculada=ahora))
+        serie.append(dict(cubeta, cerrada=actual in cerradas))
+
+    if nuevas:
+        _guardar(nuevas, vigencia)
+    return serie, len(guardadas)
+
+
+def _guardar(cubetas, vigencia):
+    """
+    Guarda cubetas cerradas con un solo INSERT ... ON CONFLICT preparado y
+    elimina las que superaron SERIE_CACHE_TTL, en una sola transacción.
+
+    Una fila existente solo se reemplaza si es anterior al cálculo (su campo
+    calculada es la hora en que empezó): una lápida escrita por una
+    invalidación posterior a la lectura de los pedidos se conserva.
+    """
+    alias = router.db_for_write(CubetaSerie)
+    conexion = connections[alias]
+    tabla = conexion.ops.quote_name(CubetaSerie._meta.db_table)
+    campos = [CubetaSerie._meta.get_field(nombre) for nombre in ("bucket", "inicio", "datos", "calculada")]
+    sql = (
+        f"INSERT INTO {tabla} (bucket, inicio, datos, calculada) VALUES (%s, %s, %s, %s) "
+        f"ON CONFLICT (bucket, inicio) DO UPDATE SET datos = excluded.datos, calculada = excluded.calculada "
+        f"WHERE {tabla}.calculada < excluded.calculada"
+    )
+    filas = [
+        [campo.get_db_prep_save(getattr(cubeta, campo.attname), conexion) for campo in campos]
+        for cubeta in cubetas
+    ]
+    with transaction.atomic(using=alias):
+        with conexion.cursor() as cursor:
+            for i in range(0, len(filas), TAMANIO_LOTE):
+                cursor.executemany(sql, filas[i:i + TAMANIO_LOTE])
+        CubetaSerie.objects.using(alias).filter(calculada__lt=vigencia).delete()
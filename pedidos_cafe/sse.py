@@ -0,0 +1,128 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api_patrones.logger import Logger
+from pedidos_cafe.eventos import BusEventos, eventos_desde
+
+# Eventos leídos del registro de cambios por consulta al reanudar
+LOTE_REANUDACION = 500
+
+
+def _formatear(evento):
+    datos = json.dumps(evento, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {evento['secuencia']}\nevent: {evento['operacion']}\ndata: {datos}\n\n".encode("utf-8")
+
+
+def _primera_secuencia():
+    from pedidos_cafe.models import CambioPedido
+
+    return CambioPedido.objects.values_list("secuencia", flat=True).first()
+
+
+class FlujoEventosPedidos:
+    """
+    Aplicación ASGI que emite los cambios de pedidos como Server-Sent Events.
+    Reanuda desde la cabecera Last-Event-ID (o ?ultimo_evento=) reenviando los
+    cambios registrados y luego transmite los nuevos en vivo. Envía latidos
+    periódicos y cierra el flujo si el cliente no consume su buffer a tiempo.
+    """
+    RUTA = "/api/pedidos/eventos/"
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] != "GET":
+            await send({
+                "type": "http.response.start",
+                "status": 405,
+                "headers": [(b"allow", b"GET"), (b"content-type", b"application/json")],
+            })
+            cuerpo = json.dumps({"error": "Método no permitido"}).encode("utf-8")
+            await send({"type": "http.response.body", "body": cuerpo})
+            return
+
+        ultimo = self._ultimo_evento(scope)
+        bus = BusEventos()
+        # Se suscribe antes de leer el historial para no perder eventos intermedios
+        suscriptor = bus.suscribir(asyncio.get_running_loop())
+        vigilancia = asyncio.ensure_future(self._esperar_desconexion(receive, suscriptor))
+        logger = Logger()
+        logger.registrar(f"Eventos: Cliente conectado (último evento: {ultimo})")
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream; charset=utf-8"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            })
+            reintento = getattr(settings, "EVENTOS_REINTENTO_MS", 3000)
+            await self._enviar(send, f"retry: {reintento}\n\n".encode("utf-8"))
+
+            if ultimo is not None:
+                ultimo = await self._reanudar(send, ultimo, suscriptor)
+
+            latido = getattr(settings, "EVENTOS_LATIDO_SEGUNDOS", 15)
+            while not suscriptor.cerrado:
+                eventos = await suscriptor.siguientes(latido)
+                if suscriptor.lento:
+                    await self._enviar(send, b"event: desconectado\ndata: {\"motivo\": \"cliente lento\"}\n\n")
+                    break
+                if not eventos and not suscriptor.cerrado:
+                    await self._enviar(send, b": latido\n\n")
+                    continue
+                for evento in eventos:
+                    # Los eventos ya enviados al reanudar llegan también por el bus
+                    if ultimo is not None and evento["secuencia"] <= ultimo:
+                        continue
+                    await self._enviar(send, _formatear(evento))
+                    ultimo = evento["secuencia"]
+            await self._enviar(send, b"", final=True)
+        except OSError:
+            # El cliente cerró la conexión mientras se escribía
+            pass
+        finally:
+            vigilancia.cancel()
+            bus.cancelar(suscriptor)
+            logger.registrar(f"Eventos: Cliente desconectado (último evento: {ultimo})")
+
+    @staticmethod
+    def _ultimo_evento(scope):
+        valor = dict(scope.get("headers", [])).get(b"last-event-id", b"").decode("latin-1")
+        if not valor:
+            consulta = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            valor = consulta.get("ultimo_evento", [""])[0]
+        return int(valor) if valor.isdigit() else None
+
+    async def _reanudar(self, send, ultimo, suscriptor):
+        primera = await sync_to_async(_primera_secuencia)()
+        if primera is not None and ultimo < primera - 1:
+            # Los cambios intermedios ya se purgaron: el cliente debe recargar el listado
+            await self._enviar(send, b"event: reiniciar\ndata: {}\n\n")
+            return None
+        while not suscriptor.cerrado:
+            eventos = await sync_to_async(eventos_desde)(ultimo, LOTE_REANUDACION)
+            for evento in eventos:
+                await self._enviar(send, _formatear(evento))
+                ultimo = evento["secuencia"]
+            if len(eventos) < LOTE_REANUDACION:
+                break
+        return ultimo
+
+    @staticmethod
+    async def _esperar_desconexion(receive, suscriptor):
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "http.disconnect":
+                suscriptor.cerrar()
+                return
+
+    @staticmethod
+    async def _enviar(send, cuerpo, final=False):
+        await send({"type": "http.response.body", "body": cuerpo, "more_body": not final})
@@ -1,3 +1,298 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import Value
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from pedidos_cafe.archivo import ArchivoPedidos
+from pedidos_cafe.codificacion import calcular_precio
+from pedidos_cafe.idempotencia import AlmacenIdempotencia
+from pedidos_cafe.models import (
+    CambioPedido, ClaveIdempotencia, CubetaSerie, PedidoCafe, PedidoCafeQuerySet, ResumenCliente,
+)
+from pedidos_cafe.series import alinear, calcular_serie
+
+
+def crear_pedido(cliente, tipo_base="espresso", ingredientes=None, tamanio="mediano"):
+    """Crea un pedido con save(), como lo hace la API"""
+    return PedidoCafe.objects.create(
+        cliente=cliente, tipo_base=tipo_base, ingredientes=ingredientes or [], tamanio=tamanio
+    )
+
+
+class ResumenClienteTests(TestCase):
+    """Los agregados de ResumenCliente coinciden con los pedidos tras cada escritura"""
+
+    def assertResumenConsistente(self):
+        """Compara cada resumen con el que resulta de recorrer todos los pedidos"""
+        esperados = {}
+        for pedido in PedidoCafe.objects.all():
+            total, gasto, tipos = esperados.get(pedido.cliente_busqueda, (0, Decimal("0"), {}))
+            precio = Decimal(str(calcular_precio(pedido.tipo_base, pedido.ingredientes, pedido.tamanio)))
+            tipos[pedido.tipo_base] = tipos.get(pedido.tipo_base, 0) + 1
+            esperados[pedido.cliente_busqueda] = (total + 1, gasto + precio, tipos)
+
+        obtenidos = {}
+        for resumen in ResumenCliente.objects.all():
+            tipos = {
+                tipo: getattr(resumen, columna)
+                for tipo, columna in ResumenCliente.COLUMNAS_TIPO.items()
+                if getattr(resumen, columna)
+            }
+            obtenidos[resumen.clave] = (resumen.total_pedidos, resumen.gasto_total, tipos)
+        self.assertEqual(obtenidos, esperados)
+
+    def resumen(self, clave):
+        return ResumenCliente.objects.get(clave=clave)
+
+    def test_bulk_create_suma_a_cada_cliente(self):
+        PedidoCafe.objects.bulk_create([
+            PedidoCafe(cliente="Ana", tipo_base="espresso", ingredientes=[], tamanio="mediano"),
+            PedidoCafe(cliente="ana ", tipo_base="latte", ingredientes=["canela"], tamanio="grande"),
+            PedidoCafe(cliente="Bruno", tipo_base="americano", ingredientes=[], tamanio="pequeño"),
+        ])
+
+        ana = self.resumen("ana")
+        self.assertEqual(ana.total_pedidos, 2)
+        self.assertEqual(ana.gasto_total, Decimal("36.50"))
+        self.assertEqual(ana.base_favorita(), "espresso")
+        self.assertEqual(self.resumen("bruno").gasto_total, Decimal("12.00"))
+        self.assertResumenConsistente()
+
+    def test_update_de_tipo_y_tamanio(self):
+        for _ in range(3):
+            crear_pedido("Ana")
+        crear_pedido("Bruno")
+
+        PedidoCafe.objects.filter(cliente="Ana").update(tipo_base="latte", tamanio="grande")
+
+        ana = self.resumen("ana")
+        self.assertEqual((ana.pedidos_espresso, ana.pedidos_latte), (0, 3))
+        self.assertEqual(ana.gasto_total, Decimal("67.50"))
+        self.assertResumenConsistente()
+
+    def test_update_de_cliente_mueve_los_pedidos(self):
+        primero = crear_pedido("Ana")
+        crear_pedido("Ana", tipo_base="latte")
+        crear_pedido("Bruno")
+
+        PedidoCafe.objects.filter(pk=primero.pk).update(cliente="Bruno")
+        self.assertEqual(self.resumen("ana").total_pedidos, 1)
+        self.assertEqual(self.resumen("bruno").total_pedidos, 2)
+        self.assertResumenConsistente()
+
+        # El cliente sin pedidos se queda sin resumen
+        PedidoCafe.objects.filter(cliente="Ana").update(cliente="Carla")
+        self.assertFalse(ResumenCliente.objects.filter(clave="ana").exists())
+        self.assertResumenConsistente()
+
+    def test_update_con_expresion_recalcula(self):
+        crear_pedido("Ana")
+        crear_pedido("Ana", tipo_base="americano", tamanio="pequeño")
+
+        PedidoCafe.objects.filter(cliente="Ana").update(tamanio=Value("grande"))
+
+        self.assertEqual(self.resumen("ana").gasto_total, Decimal("33.00"))
+        self.assertResumenConsistente()
+
+    def test_update_sin_campos_del_resumen(self):
+        crear_pedido("Ana")
+        PedidoCafe.objects.update(fecha=timezone.now() - timedelta(days=1))
+        self.assertEqual(self.resumen("ana").total_pedidos, 1)
+        self.assertResumenConsistente()
+
+    def test_delete_en_bloque(self):
+        crear_pedido("Ana")
+        crear_pedido("Ana", tipo_base="latte")
+        crear_pedido("Bruno")
+
+        PedidoCafe.objects.filter(tipo_base="espresso").delete()
+
+        self.assertEqual(self.resumen("ana").total_pedidos, 1)
+        self.assertFalse(ResumenCliente.objects.filter(clave="bruno").exists())
+        self.assertResumenConsistente()
+
+    def test_save_de_instancia(self):
+        pedido = crear_pedido("Ana")
+        self.assertEqual(self.resumen("ana").gasto_total, Decimal("12.50"))
+
+        pedido.ingredientes = ["chocolate", "canela"]
+        pedido.save()
+        self.assertEqual(self.resumen("ana").gasto_total, Decimal("16.25"))
+
+        pedido.cliente = "Bruno"
+        pedido.save()
+        self.assertFalse(ResumenCliente.objects.filter(clave="ana").exists())
+        self.assertEqual(self.resumen("bruno").total_pedidos, 1)
+        self.assertResumenConsistente()
+
+    def test_delete_de_instancia(self):
+        pedido = crear_pedido("Ana")
+        crear_pedido("Ana", tipo_base="latte")
+
+        pedido.delete()
+
+        ana = self.resumen("ana")
+        self.assertEqual((ana.total_pedidos, ana.pedidos_espresso), (1, 0))
+        self.assertResumenConsistente()
+
+
+class ClienteAPITests(APITestCase):
+    """Endpoints /api/clientes/{cliente}/ y /api/clientes/{cliente}/pedidos/"""
+
+    def test_resumen_del_cliente(self):
+        crear_pedido("María José")
+        crear_pedido("maria jose", tipo_base="latte", tamanio="grande")
+
+        respuesta = self.client.get("/api/clientes/MARÍA JOSÉ/")
+
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(respuesta.data["cliente"], "María José")
+        self.assertEqual(respuesta.data["total_pedidos"], 2)
+        self.assertEqual(respuesta.data["gasto_total"], 35.0)
+        self.assertEqual(respuesta.data["ticket_promedio"], 17.5)
+
+    def test_cliente_sin_pedidos(self):
+        respuesta = self.client.get("/api/clientes/nadie/pedidos/")
+        self.assertEqual(respuesta.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_recorre_todos_los_pedidos_una_vez(self):
+        pedidos = [crear_pedido("Ana") for _ in range(7)]
+        crear_pedido("Bruno")
+        # Varios pedidos con la misma fecha: el cursor desempata por id
+        fecha = timezone.now()
+        PedidoCafe.objects.filter(pk__in=[p.pk for p in pedidos[:5]]).update(fecha=fecha)
+        PedidoCafe.objects.filter(pk__in=[p.pk for p in pedidos[5:]]).update(fecha=fecha - timedelta(hours=1))
+
+        vistos = []
+        parametros = {"limite": 2}
+        while True:
+            respuesta = self.client.get("/api/clientes/ana/pedidos/", parametros)
+            self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(respuesta.data["pedidos"]), 2)
+            vistos.extend(pedido["id"] for pedido in respuesta.data["pedidos"])
+            if respuesta.data["siguiente"] is None:
+                break
+            parametros["despues"] = respuesta.data["siguiente"]
+
+        esperados = list(
+            PedidoCafe.objects.filter(cliente="Ana").order_by("-fecha", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(vistos, esperados)
+        self.assertEqual(len(vistos), 7)
+
+    def test_parametros_invalidos(self):
+        crear_pedido("Ana")
+        for parametros in ({"limite": "x"}, {"limite": 0}, {"despues": "no-es-un-cursor"}):
+            respuesta = self.client.get("/api/clientes/ana/pedidos/", parametros)
+            self.assertEqual(respuesta.status_code, status.HTTP_400_BAD_REQUEST, parametros)
+
+
+class SerieTests(TestCase):
+    """Cubetas cerradas de la serie temporal guardadas en CubetaSerie"""
+
+    def setUp(self):
+        self.hasta = timezone.now()
+        self.desde = self.hasta - timedelta(minutes=300)
+        for minutos in (10, 20, 20, 200):
+            pedido = crear_pedido("Ana")
+            PedidoCafe.objects.filter(pk=pedido.pk).update(fecha=self.hasta - timedelta(minutes=minutos))
+
+    def total(self, serie):
+        return sum(cubeta["total"] for cubeta in serie)
+
+    def test_segunda_consulta_usa_las_cubetas_guardadas(self):
+        serie, guardadas = calcular_serie("minute", self.desde, self.hasta)
+        self.assertEqual((self.total(serie), guardadas), (4, 0))
+
+        with self.assertNumQueries(2):
+            serie, guardadas = calcular_serie("minute", self.desde, self.hasta)
+        cerradas = sum(cubeta["cerrada"] for cubeta in serie)
+        self.assertEqual(guardadas, cerradas)
+        self.assertEqual(self.total(serie), 4)
+
+    def test_escrituras_invalidan_las_cubetas_afectadas(self):
+        calcular_serie("minute", self.desde, self.hasta)
+
+        # La invalidación corre al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            pedido = crear_pedido("Bruno")
+            pedido.fecha = self.hasta - timedelta(minutes=100)
+            pedido.save()
+        serie, _ = calcular_serie("minute", self.desde, self.hasta)
+        self.assertEqual(self.total(serie), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PedidoCafe.objects.filter(cliente="Ana").delete()
+        serie, _ = calcular_serie("minute", self.desde, self.hasta)
+        self.assertEqual(self.total(serie), 1)
+
+    def test_invalidacion_conserva_la_lapida(self):
+        calcular_serie("minute", self.desde, self.hasta)
+        fecha = self.hasta - timedelta(minutes=20)
+        with self.captureOnCommitCallbacks(execute=True):
+            PedidoCafe.objects.filter(fecha=fecha).update(tamanio="grande")
+
+        cubeta = CubetaSerie.objects.get(bucket="minute", inicio=alinear(fecha, "minute"))
+        self.assertIsNone(cubeta.datos)
+
+
+class ArchivarPedidosTests(TestCase):
+    """Comando archivar_pedidos"""
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+        for cliente in ("Ana", "Ana", "Bruno"):
+            crear_pedido(cliente)
+        PedidoCafe.objects.update(fecha=timezone.now() - timedelta(days=400))
+        crear_pedido("Ana", tipo_base="latte")
+
+    def archivar(self):
+        call_command("archivar_pedidos", dias=365, directorio=self.directorio, stdout=open(os.devnull, "w"))
+
+    def test_archivar_no_es_una_baja(self):
+        resumen = ResumenCliente.objects.get(clave="ana")
+        self.archivar()
+
+        self.assertEqual(PedidoCafe.objects.count(), 1)
+        self.assertEqual(ResumenCliente.objects.get(clave="ana").total_pedidos, resumen.total_pedidos)
+        self.assertFalse(CambioPedido.objects.filter(operacion=CambioPedido.ELIMINADO).exists())
+
+    def test_reintento_tras_fallo_no_duplica_el_segmento(self):
+        with mock.patch.object(PedidoCafeQuerySet, "archivar", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.archivar()
+        self.assertEqual(PedidoCafe.objects.count(), 4)
+
+        self.archivar()
+        segmentos = ArchivoPedidos(self.directorio).leer_indice()
+        self.assertEqual([segmento["total"] for segmento in segmentos], [3])
+        self.assertEqual(PedidoCafe.objects.count(), 1)
+
+
+class IdempotenciaTests(TestCase):
+    """Purga de AlmacenIdempotencia por TTL y por número de claves"""
+
+    def test_purga_acota_las_claves(self):
+        almacen = AlmacenIdempotencia()
+        ahora = timezone.now()
+        ClaveIdempotencia.objects.create(clave="vencida", huella="h", status=201, creada=ahora - timedelta(days=2))
+        # Reserva en curso más antigua que las completadas, pero dentro de la reserva máxima
+        ClaveIdempotencia.objects.create(clave="en-curso", huella="h", creada=ahora - timedelta(seconds=50))
+        for i in range(5):
+            ClaveIdempotencia.objects.create(clave=f"c{i}", huella="h", status=201, creada=ahora - timedelta(seconds=10 - i))
+
+        with mock.patch.object(almacen, "max_entradas", 3), mock.patch.object(almacen, "reserva_maxima", 60):
+            almacen.purgar(ahora)
 
-# Create your tests here.
+        restantes = set(ClaveIdempotencia.objects.values_list("clave", flat=True))
+        self.assertEqual(restantes, {"c2", "c3", "c4", "en-curso"})
@@ -1,25 +1,41 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from pedidos_cafe.views import PedidoCafeViewSet
+from pedidos_cafe.views import ClienteViewSet, PedidoCafeViewSet
 
 # Crear el router para las APIs REST
 router = DefaultRouter()
 router.register(r'pedidos', PedidoCafeViewSet, basename='pedidos')
+router.register(r'clientes', ClienteViewSet, basename='clientes')
 
 urlpatterns = [
     path('api/', include(router.urls)),
 ]
 
 # URLs disponibles:
-# GET /api/pedidos/ - Lista todos los pedidos
+# GET /api/pedidos/?tipo_base=&tamanio=&desde=&hasta=&ordenar= - Lista los pedidos (filtros con índice)
 # POST /api/pedidos/ - Crea un nuevo pedido
 # GET /api/pedidos/{id}/ - Obtiene un pedido específico
 # PUT /api/pedidos/{id}/ - Actualiza un pedido específico
 # DELETE /api/pedidos/{id}/ - Elimina un pedido específico
+# PATCH /api/pedidos/lote/?tipo_base=&id= - Actualiza en bloque los pedidos filtrados (solo staff)
+# DELETE /api/pedidos/lote/?tipo_base=&id= - Elimina en bloque los pedidos filtrados (solo staff)
 # GET /api/pedidos/tipos_cafe/ - Lista tipos de café disponibles
 # GET /api/pedidos/ingredientes_disponibles/ - Lista ingredientes disponibles
 # GET /api/pedidos/tamanios_disponibles/ - Lista tamaños disponibles
+# GET /api/pedidos/paquetes/ - Recetas del Director precompiladas por tipo de café
 # GET /api/pedidos/{id}/calcular_precio/ - Recalcula precio de un pedido
 # GET /api/pedidos/logs_sistema/ - Obtiene logs del sistema
 # POST /api/pedidos/limpiar_logs/ - Limpia los logs del sistema
-# GET /api/pedidos/estadisticas/ - Obtiene estadísticas generales
\ No newline at end of file
+# GET /api/pedidos/estadisticas/ - Obtiene estadísticas generales
+# GET /api/pedidos/estadisticas/serie/?bucket=hour&desde=&hasta= - Serie temporal de pedidos
+# GET /api/pedidos/cola_preparacion/ - Planificación de la cola de preparación por estaciones
+# GET /api/pedidos/trazas/ - Obtiene las trazas recientes (solo staff)
+# GET /api/pedidos/cambios/?cursor= - Cambios de pedidos posteriores a un cursor (sincronización incremental)
+# GET /api/pedidos/eventos/ - Flujo Server-Sent Events de cambios (servido por api_patrones/asgi.py)
+# GET /api/pedidos/cache_representaciones/ - Contadores de la caché de representaciones (solo staff)
+# GET /api/pedidos/admision/ - Contadores del control de admisión (solo staff)
+# GET /api/pedidos/ingesta/{ticket}/ - Estado de un pedido en la cola de ingesta diferida
+# GET /api/pedidos/archivo/?desde=&hasta=&limite= - Pedidos archivados en frío por rango de fechas
+# GET /api/pedidos/archivo/{id}/ - Pedido archivado por id
+# GET /api/clientes/{cliente}/ - Agregados precalculados de un cliente (pedidos, gasto, base favorita)
+# GET /api/clientes/{cliente}/pedidos/?limite=&despues= - Historial del cliente paginado por cursor
\ No newline at end of file
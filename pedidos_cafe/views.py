@@ -1,11 +1,37 @@
+import base64
+import binascii
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from pedidos_cafe.models import PedidoCafe
+from django.utils.http import parse_etags
+from pedidos_cafe.models import CambioPedido, PedidoCafe, ResumenCliente, normalizar_cliente
 from pedidos_cafe.serializers import PedidoCafeSerializer, LoggerSerializer
-from pedidos_cafe.factory import CafeFactory
+from pedidos_cafe.ingesta import ColaIngesta
+from pedidos_cafe.idempotencia import AlmacenIdempotencia
+from pedidos_cafe.archivo import ArchivoPedidos, interpretar_fecha
+from pedidos_cafe.series import CUBETAS, calcular_serie
+from pedidos_cafe.representaciones import CacheRepresentaciones
+from pedidos_cafe.planificador import Planificador, TrabajoPreparacion
+from pedidos_cafe.recetas import CatalogoRecetas
+from pedidos_cafe.catalogo import CatalogoRespuestas
+from pedidos_cafe.cache_ttl import CacheConTTL
+from pedidos_cafe.filtros import filtrar_pedidos, filtros_activos
+from django.utils import timezone
 from api_patrones.logger import Logger
+from api_patrones.tracing import Tracer
+from api_patrones.routers import lecturas_en_replica
+from api_patrones.admision import ControlAdmision
+
+# Campos que admite PATCH /api/pedidos/lote/
+CAMPOS_LOTE = ('cliente', 'tipo_base', 'ingredientes', 'tamanio')
 
 
 class PedidoCafeViewSet(viewsets.ModelViewSet):
@@ -16,9 +42,68 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
     queryset = PedidoCafe.objects.all()
     serializer_class = PedidoCafeSerializer
 
+    # Acciones de solo lectura que pueden servirse desde la réplica
+    acciones_replica = {
+        'list', 'retrieve', 'calcular_precio', 'estadisticas', 'estadisticas_serie', 'cambios',
+        'cola_preparacion', 'paquetes',
+    }
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Envuelve cada solicitud en un span raíz para el trazado y envía
+        las acciones de solo lectura a la réplica.
+        
+        Returns:
+            Response: Respuesta generada por la acción correspondiente
+        """
+        accion = self.action_map.get(request.method.lower())
+        replica = lecturas_en_replica() if accion in self.acciones_replica else nullcontext()
+        with replica, Tracer().span(f"API {request.method} {request.path}") as span:
+            response = super().dispatch(request, *args, **kwargs)
+            if span is not None:
+                span.establecer_atributo("accion", self.action)
+                span.establecer_atributo("status", response.status_code)
+            return response
+
+    def get_queryset(self):
+        """
+        Aplica los filtros y el orden de la lista de pedidos (ver pedidos_cafe/filtros.py).
+        ?tipo_base=, ?tamanio=, ?desde=/?hasta= y ?ordenar= se resuelven con
+        índices compuestos terminados en fecha.
+        ?cliente= busca por prefijo de palabra en la clave normalizada e indexada.
+        ?ingrediente= (repetible) exige cada ingrediente, usando la máscara indexada.
+        
+        Returns:
+            QuerySet: Pedidos filtrados
+            
+        Raises:
+            ValidationError: Si algún valor no es válido o la combinación no tiene índice
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            try:
+                queryset = filtrar_pedidos(queryset, self.request.query_params)
+            except ValueError as e:
+                raise ValidationError({"error": str(e)})
+        return queryset
+
     def create(self, request, *args, **kwargs):
         """
         Crea un nuevo pedido de café.
+        Si la solicitud incluye la cabecera Idempotency-Key, los reintentos
+        se responden desde el almacén de idempotencia.
+        
+        Returns:
+            Response: Respuesta con el pedido creado o errores de validación
+        """
+        clave = request.headers.get('Idempotency-Key')
+        if clave:
+            return self._crear_idempotente(request, clave)
+        return self._crear_pedido(request)
+
+    def _crear_pedido(self, request):
+        """
+        Valida y crea el pedido (o lo encola en modo de ingesta diferida).
         
         Returns:
             Response: Respuesta con el pedido creado o errores de validación
@@ -26,8 +111,19 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
         logger = Logger()
         logger.registrar(f"API: Recibida solicitud de creación de pedido")
         
-        serializer = self.get_serializer(data=request.data)
+        datos = request.data
+        if isinstance(datos, dict) and 'receta' in datos:
+            # Pedido por nombre de receta: ingredientes y tamaño salen del catálogo precompilado
+            try:
+                datos = CatalogoRecetas().expandir_pedido(datos)
+            except ValueError as e:
+                logger.registrar(f"API: Error en validación de pedido: {e}")
+                return Response({"receta": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(data=datos)
         if serializer.is_valid():
+            if getattr(settings, 'INGESTA_ASINCRONA', False):
+                return self._encolar_pedido(serializer)
             self.perform_create(serializer)
             headers = self.get_success_headers(serializer.data)
             logger.registrar(f"API: Pedido creado exitosamente ID: {serializer.data['id']}")
@@ -36,6 +132,112 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
             logger.registrar(f"API: Error en validación de pedido: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def _crear_idempotente(self, request, clave):
+        """
+        Ejecuta la creación una sola vez por clave de idempotencia, aunque las
+        repeticiones lleguen a otros workers. Las repeticiones, incluidas las
+        concurrentes, reciben la respuesta almacenada sin volver a validar,
+        calcular precios ni insertar.
+        
+        Args:
+            clave (str): Valor de la cabecera Idempotency-Key
+            
+        Returns:
+            Response: Respuesta original o repetida
+        """
+        logger = Logger()
+        almacen = AlmacenIdempotencia()
+        usuario = request.user.pk if request.user.is_authenticated else 'anonimo'
+        clave_almacen = almacen.calcular_clave(usuario, clave)
+        huella = almacen.calcular_huella(request.method, request.path, request.data)
+        
+        entrada, propietario = almacen.reservar(clave_almacen, huella)
+        if entrada.huella != huella:
+            logger.registrar(f"API: Idempotency-Key '{clave}' reutilizada con otra solicitud")
+            return Response(
+                {"error": "La Idempotency-Key ya se usó con una solicitud diferente"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        
+        if not propietario:
+            entrada = almacen.esperar(entrada, getattr(settings, 'IDEMPOTENCIA_ESPERA_SEGUNDOS', 10))
+            if entrada.status is None:
+                return Response(
+                    {"error": "Hay una solicitud con la misma Idempotency-Key en curso"},
+                    status=status.HTTP_409_CONFLICT
+                )
+            logger.registrar(f"API: Respuesta repetida para Idempotency-Key '{clave}'")
+            headers = dict(entrada.cabeceras, **{'Idempotent-Replayed': 'true'})
+            return Response(entrada.respuesta, status=entrada.status, headers=headers)
+        
+        try:
+            # El pedido y su respuesta almacenada se confirman juntos
+            with transaction.atomic():
+                response = self._crear_pedido(request)
+                if response.status_code < 500:
+                    headers = {k: v for k, v in response.items() if k == 'Location'}
+                    almacen.completar(clave_almacen, response.status_code, response.data, headers)
+        except Exception:
+            almacen.abandonar(clave_almacen)
+            raise
+        
+        if response.status_code >= 500:
+            almacen.abandonar(clave_almacen)
+        return response
+
+    def _encolar_pedido(self, serializer):
+        """
+        Encola un pedido validado en la cola de ingesta diferida.
+        
+        Returns:
+            Response: Respuesta 202 con el ticket para consultar el estado
+        """
+        logger = Logger()
+        ticket = ColaIngesta().encolar(serializer.validated_data)
+        logger.registrar(f"API: Pedido aceptado para ingesta diferida, ticket: {ticket}")
+        
+        return Response({
+            "ticket": ticket,
+            "estado": ColaIngesta.ESTADO_EN_COLA,
+            "estado_url": self.reverse_action('estado-ingesta', kwargs={'ticket': ticket})
+        }, status=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Obtiene un pedido, sirviendo su representación desde la caché
+        mientras la versión de la fila no cambie.
+        
+        Returns:
+            Response: Pedido serializado
+        """
+        return Response(self._representar(self.get_object()))
+
+    def _representar(self, pedido):
+        """
+        Serializa un pedido usando la caché de representaciones.
+        
+        Args:
+            pedido (PedidoCafe): Pedido a serializar
+            
+        Returns:
+            dict: Salida de PedidoCafeSerializer (no debe modificarse)
+        """
+        cache_representaciones = CacheRepresentaciones()
+        datos = cache_representaciones.obtener(pedido.id, pedido.version)
+        if datos is None:
+            datos = self.get_serializer(pedido).data
+            cache_representaciones.guardar(pedido.id, pedido.version, datos)
+        return datos
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        CacheRepresentaciones().invalidar(serializer.instance.id)
+
+    def perform_destroy(self, instance):
+        pedido_id = instance.id
+        super().perform_destroy(instance)
+        CacheRepresentaciones().invalidar(pedido_id)
+
     def update(self, request, *args, **kwargs):
         """
         Actualiza un pedido existente.
@@ -75,40 +277,88 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
         
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['patch', 'delete'], permission_classes=[IsAdminUser])
+    def lote(self, request):
+        """
+        Actualiza (PATCH) o elimina (DELETE) en bloque los pedidos que cumplen
+        los filtros de la consulta: los mismos de la lista (tipo_base, tamanio,
+        cliente, ingrediente, desde, hasta) y/o ?id= repetible. Solo staff.
+        El cuerpo del PATCH se valida una sola vez y se aplica con un único
+        UPDATE; el DELETE es un único DELETE. PedidoCafeQuerySet los ejecuta
+        en una transacción que también registra los cambios.
+        
+        Returns:
+            Response: Cantidad de pedidos actualizados o eliminados
+            
+        Raises:
+            ValidationError: Si faltan filtros, son inválidos o el cuerpo no es válido
+        """
+        logger = Logger()
+        queryset = self._filtrar_lote(request)
+        
+        if request.method == 'DELETE':
+            eliminados = queryset.delete()[1].get(PedidoCafe._meta.label, 0)
+            self._cache_estadisticas().invalidar()
+            logger.registrar(f"API: Eliminados en bloque {eliminados} pedidos")
+            return Response({"eliminados": eliminados})
+        
+        if not isinstance(request.data, dict):
+            raise ValidationError({"error": "El cuerpo debe ser un objeto con los campos a modificar"})
+        desconocidos = set(request.data) - set(CAMPOS_LOTE)
+        if desconocidos:
+            raise ValidationError({
+                "error": f"Campos no modificables en bloque: {', '.join(sorted(desconocidos))}. "
+                         f"Campos válidos: {', '.join(CAMPOS_LOTE)}"
+            })
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        if not serializer.validated_data:
+            raise ValidationError({"error": "Indique al menos un campo a modificar"})
+        
+        actualizados = queryset.update(**serializer.validated_data)
+        self._cache_estadisticas().invalidar()
+        logger.registrar(
+            f"API: Actualizados en bloque {actualizados} pedidos ({', '.join(serializer.validated_data)})"
+        )
+        return Response({"actualizados": actualizados})
+
+    def _filtrar_lote(self, request):
+        """
+        Construye el queryset de una operación en bloque.
+        
+        Returns:
+            QuerySet: Pedidos afectados
+            
+        Raises:
+            ValidationError: Si no hay filtros o alguno no es válido
+        """
+        parametros = request.query_params
+        ids = parametros.getlist('id')
+        if not (ids or filtros_activos(parametros) or parametros.get('desde') or parametros.get('hasta')):
+            raise ValidationError({"error": "Indique al menos un filtro (id, tipo_base, tamanio, cliente, "
+                                            "ingrediente, desde o hasta)"})
+        try:
+            queryset = filtrar_pedidos(PedidoCafe.objects.all(), parametros)
+            if ids:
+                if not all(pedido_id.isdigit() for pedido_id in ids):
+                    raise ValueError("Los valores de 'id' deben ser enteros")
+                queryset = queryset.filter(id__in=[int(pedido_id) for pedido_id in ids])
+        except ValueError as e:
+            raise ValidationError({"error": str(e)})
+        return queryset.order_by()
+
     @action(detail=False, methods=['get'])
     def tipos_cafe(self, request):
         """
         Endpoint para obtener los tipos de café disponibles.
-        Demuestra el uso del patrón Factory.
+        Demuestra el uso del patrón Factory; la respuesta se precompila al
+        arrancar (ver pedidos_cafe/catalogo.py).
         
         Returns:
             Response: Lista de tipos de café disponibles
         """
-        logger = Logger()
-        logger.registrar("API: Consultando tipos de café disponibles")
-        
-        tipos = CafeFactory.obtener_tipos_disponibles()
-        
-        # Obtener información detallada de cada tipo
-        tipos_detallados = []
-        for tipo in tipos:
-            try:
-                cafe_base = CafeFactory.obtener_base(tipo)
-                tipos_detallados.append({
-                    "nombre": tipo,
-                    "nombre_display": cafe_base.obtener_nombre(),
-                    "precio_base": cafe_base.precio_base(),
-                    "ingredientes_base": cafe_base.obtener_ingredientes_base()
-                })
-            except Exception as e:
-                logger.registrar(f"ERROR al obtener info de {tipo}: {str(e)}")
-        
-        logger.registrar(f"API: Enviando información de {len(tipos_detallados)} tipos de café")
-        
-        return Response({
-            "tipos_disponibles": tipos_detallados,
-            "total_tipos": len(tipos_detallados)
-        })
+        Logger().registrar("API: Consultando tipos de café disponibles")
+        return Response(CatalogoRespuestas().obtener('tipos_cafe'))
 
     @action(detail=False, methods=['get'])
     def ingredientes_disponibles(self, request):
@@ -118,29 +368,8 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
         Returns:
             Response: Lista de ingredientes disponibles con precios
         """
-        logger = Logger()
-        logger.registrar("API: Consultando ingredientes disponibles")
-        
-        # Obtener precios de ingredientes del builder
-        from pedidos_cafe.builder import CafePersonalizadoBuilder
-        from pedidos_cafe.factory import CafeFactory
-        
-        cafe_base = CafeFactory.obtener_base("espresso")  # Usar uno cualquiera para obtener precios
-        builder = CafePersonalizadoBuilder(cafe_base)
-        
-        ingredientes = []
-        for ingrediente, precio in builder.precios_ingredientes.items():
-            ingredientes.append({
-                "nombre": ingrediente,
-                "precio_adicional": precio
-            })
-        
-        logger.registrar(f"API: Enviando información de {len(ingredientes)} ingredientes")
-        
-        return Response({
-            "ingredientes_disponibles": ingredientes,
-            "total_ingredientes": len(ingredientes)
-        })
+        Logger().registrar("API: Consultando ingredientes disponibles")
+        return Response(CatalogoRespuestas().obtener('ingredientes_disponibles'))
 
     @action(detail=False, methods=['get'])
     def tamanios_disponibles(self, request):
@@ -150,29 +379,31 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
         Returns:
             Response: Lista de tamaños disponibles con multiplicadores
         """
-        logger = Logger()
-        logger.registrar("API: Consultando tamaños disponibles")
-        
-        # Obtener multiplicadores del builder
-        from pedidos_cafe.builder import CafePersonalizadoBuilder
-        from pedidos_cafe.factory import CafeFactory
-        
-        cafe_base = CafeFactory.obtener_base("espresso")
-        builder = CafePersonalizadoBuilder(cafe_base)
-        
-        tamanios = []
-        for tamanio, multiplicador in builder.multiplicadores_tamanio.items():
-            tamanios.append({
-                "nombre": tamanio,
-                "multiplicador": multiplicador
-            })
-        
-        logger.registrar(f"API: Enviando información de {len(tamanios)} tamaños")
+        Logger().registrar("API: Consultando tamaños disponibles")
+        return Response(CatalogoRespuestas().obtener('tamanios_disponibles'))
+
+    @action(detail=False, methods=['get'])
+    def paquetes(self, request):
+        """
+        Endpoint con las recetas del Director (paquetes especiales) precompiladas
+        para cada tipo de café base. Se sirve desde memoria con un ETag estable,
+        por lo que los clientes pueden revalidar con If-None-Match.
         
-        return Response({
-            "tamanios_disponibles": tamanios,
-            "total_tamanios": len(tamanios)
-        })
+        Returns:
+            Response: Recetas con ingredientes, tamaño y precio por tipo (o 304)
+        """
+        catalogo = CatalogoRecetas().precompilar()
+        cabeceras = {
+            "ETag": catalogo["etag"],
+            "Cache-Control": f"public, max-age={getattr(settings, 'PAQUETES_MAX_AGE', 300)}",
+        }
+        # La compresión gzip entrega el ETag como débil (W/"...")
+        etags = {etag.removeprefix('W/') for etag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if catalogo["etag"] in etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+        
+        # Cuerpo codificado una sola vez al compilar el catálogo
+        return Response(catalogo["respuesta"], headers=cabeceras)
 
     @action(detail=True, methods=['get'])
     def calcular_precio(self, request, pk=None):
@@ -188,17 +419,17 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
         logger.registrar(f"API: Recalculando precio para pedido ID: {pedido.id}")
         
         try:
-            # Usar el serializer para obtener los datos calculados
-            serializer = self.get_serializer(pedido)
+            # Usar el serializer (o su representación cacheada) para obtener los datos calculados
+            representacion = self._representar(pedido)
             datos_calculados = {
                 "pedido_id": pedido.id,
                 "cliente": pedido.cliente,
                 "tipo_base": pedido.tipo_base,
                 "ingredientes_solicitados": pedido.ingredientes,
                 "tamanio": pedido.tamanio,
-                "precio_total": serializer.data['precio_total'],
-                "ingredientes_finales": serializer.data['ingredientes_finales'],
-                "resumen_construccion": serializer.data['resumen_construccion']
+                "precio_total": representacion['precio_total'],
+                "ingredientes_finales": representacion['ingredientes_finales'],
+                "resumen_construccion": representacion['resumen_construccion']
             }
             
             logger.registrar(f"API: Precio recalculado exitosamente para pedido ID: {pedido.id}")
@@ -248,13 +479,45 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
     def estadisticas(self, request):
         """
         Endpoint para obtener estadísticas generales.
+        Los conteos se sirven desde un caché de TTL corto: al vencer, una sola
+        solicitud los recalcula y las demás reciben el valor anterior.
         
         Returns:
-            Response: Estadísticas del sistema
+            Response: Estadísticas del sistema con la edad del caché
         """
         logger = Logger()
         logger.registrar("API: Consultando estadísticas del sistema")
         
+        conteos, edad, estado = self._cache_estadisticas().obtener(self._calcular_estadisticas)
+        
+        return Response(dict(
+            conteos,
+            total_logs=logger.contar_logs(),
+            edad_cache_segundos=round(edad, 3),
+            estado_cache=estado,
+        ))
+
+    @staticmethod
+    def _cache_estadisticas():
+        """Retorna el caché de TTL corto de las estadísticas generales"""
+        return CacheConTTL(
+            'estadisticas:generales',
+            ttl=getattr(settings, 'ESTADISTICAS_CACHE_TTL', 5),
+            gracia=getattr(settings, 'ESTADISTICAS_CACHE_GRACIA', 60),
+            anticipacion=getattr(settings, 'ESTADISTICAS_REFRESCO_ANTICIPADO', 0),
+            alias=getattr(settings, 'ESTADISTICAS_CACHE_ALIAS', 'default'),
+        )
+
+    @staticmethod
+    def _calcular_estadisticas():
+        """
+        Calcula los conteos de las estadísticas sobre toda la tabla.
+        
+        Returns:
+            dict: Conteos totales, por tipo, por tamaño y por ingrediente
+        """
+        logger = Logger()
+        
         # Estadísticas básicas
         total_pedidos = PedidoCafe.objects.count()
         
@@ -270,11 +533,467 @@ class PedidoCafeViewSet(viewsets.ModelViewSet):
             count = PedidoCafe.objects.filter(tamanio=tamanio).count()
             tamanios_stats[tamanio] = count
         
+        # Estadísticas por ingrediente (agrupadas por la máscara indexada)
+        ingredientes_stats = PedidoCafe.objects.conteo_por_ingrediente()
+        
         logger.registrar(f"API: Estadísticas generadas - Total pedidos: {total_pedidos}")
         
-        return Response({
+        return {
             "total_pedidos": total_pedidos,
             "estadisticas_por_tipo": tipos_stats,
             "estadisticas_por_tamanio": tamanios_stats,
-            "total_logs": logger.contar_logs()
-        })
\ No newline at end of file
+            "estadisticas_por_ingrediente": ingredientes_stats,
+        }
+
+    @action(detail=False, methods=['get'], url_path='estadisticas/serie')
+    def estadisticas_serie(self, request):
+        """
+        Endpoint para obtener la serie temporal de pedidos por minuto, hora o día,
+        desglosada por tipo de café y tamaño.
+        
+        Parámetros:
+            bucket: "minute", "hour" (por defecto) o "day"
+            desde, hasta: Rango en formato AAAA-MM-DD o ISO 8601
+        
+        Returns:
+            Response: Serie de cubetas con los vacíos completados
+        """
+        logger = Logger()
+        bucket = request.query_params.get('bucket', 'hour')
+        if bucket not in CUBETAS:
+            return Response(
+                {"error": f"Bucket '{bucket}' no válido. Buckets válidos: {list(CUBETAS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            hasta = interpretar_fecha(request.query_params.get('hasta'), fin_de_dia=True) or timezone.now()
+            desde = interpretar_fecha(request.query_params.get('desde')) or hasta - 24 * CUBETAS[bucket][1]
+            serie, cacheadas = calcular_serie(bucket, desde, hasta)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        logger.registrar(f"API: Serie de estadísticas por '{bucket}' con {len(serie)} cubetas")
+        
+        return Response({
+            "bucket": bucket,
+            "desde": serie[0]["inicio"],
+            "hasta": (datetime.fromisoformat(serie[-1]["inicio"]) + CUBETAS[bucket][1]).isoformat(),
+            "total_pedidos": sum(cubeta["total"] for cubeta in serie),
+            "cubetas_cacheadas": cacheadas,
+            "serie": serie
+        })
+
+    @action(detail=False, methods=['get'])
+    def cola_preparacion(self, request):
+        """
+        Endpoint para planificar la preparación de los pedidos recientes
+        en estaciones de barista.
+        
+        Parámetros:
+            estaciones: Número de estaciones (por defecto PLANIFICADOR_ESTACIONES,
+                        como máximo PLANIFICADOR_MAX_ESTACIONES)
+            politica: "fifo", "sjf" o "lotes" (por defecto PLANIFICADOR_POLITICA)
+            minutos: Ventana de pedidos recientes a planificar (1 a PLANIFICADOR_MAX_VENTANA_MINUTOS)
+        
+        Returns:
+            Response: Pedidos asignados por estación con inicio y fin estimados, y métricas
+        """
+        logger = Logger()
+        parametros = request.query_params
+        try:
+            estaciones = int(parametros.get('estaciones', getattr(settings, 'PLANIFICADOR_ESTACIONES', 2)))
+            minutos = int(parametros.get('minutos', getattr(settings, 'PLANIFICADOR_VENTANA_MINUTOS', 30)))
+        except ValueError:
+            return Response(
+                {"error": "Los parámetros 'estaciones' y 'minutos' deben ser números enteros"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_minutos = getattr(settings, 'PLANIFICADOR_MAX_VENTANA_MINUTOS', 1440)
+        if not 1 <= minutos <= max_minutos:
+            return Response(
+                {"error": f"El parámetro 'minutos' debe estar entre 1 y {max_minutos}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        estaciones = min(estaciones, getattr(settings, 'PLANIFICADOR_MAX_ESTACIONES', 32))
+        try:
+            politica = parametros.get('politica', getattr(settings, 'PLANIFICADOR_POLITICA', 'fifo'))
+            planificador = Planificador(estaciones=estaciones, politica=politica)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        pedidos = list(
+            PedidoCafe.objects
+            .filter(fecha__gte=timezone.now() - timedelta(minutes=minutos))
+            .order_by('fecha')
+            .values('id', 'tipo_base', 'tamanio', 'ingredientes', 'fecha')
+            [:getattr(settings, 'PLANIFICADOR_MAX_PEDIDOS', 500)]
+        )
+        inicio = pedidos[0]['fecha'] if pedidos else timezone.now()
+        trabajos = [
+            TrabajoPreparacion(
+                pedido['id'], (pedido['fecha'] - inicio).total_seconds(),
+                pedido['tipo_base'], pedido['tamanio'], pedido['ingredientes']
+            )
+            for pedido in pedidos
+        ]
+        plan = planificador.planificar(trabajos)
+        logger.registrar(
+            f"API: Planificados {len(trabajos)} pedidos en {estaciones} estaciones "
+            f"con política '{planificador.nombre_politica}'"
+        )
+        
+        return Response({
+            "desde": inicio,
+            "metricas": plan.metricas(),
+            "estaciones": [
+                {
+                    "estacion": numero + 1,
+                    "pedidos": [
+                        {
+                            "pedido_id": trabajo.pedido_id,
+                            "duracion_estimada": trabajo.duracion,
+                            "inicio": inicio + timedelta(seconds=trabajo.inicio),
+                            "fin": inicio + timedelta(seconds=trabajo.fin),
+                            "espera_segundos": round(trabajo.espera, 1),
+                        }
+                        for trabajo in trabajos_estacion
+                    ]
+                }
+                for numero, trabajos_estacion in enumerate(plan.por_estacion())
+            ]
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def trazas(self, request):
+        """
+        Endpoint para obtener las trazas recientes del sistema.
+        Solo disponible para usuarios staff.
+        
+        Returns:
+            Response: Trazas más recientes con sus spans anidados
+        """
+        try:
+            limite = int(request.query_params.get('limite', 20))
+        except ValueError:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser un número entero"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limite <= 0:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser positivo"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        trazas = Tracer().obtener_trazas(limite)
+        return Response({
+            "trazas": trazas,
+            "total_trazas": len(trazas)
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_representaciones(self, request):
+        """
+        Endpoint para consultar los contadores de la caché de representaciones.
+        Solo disponible para usuarios staff.
+        
+        Returns:
+            Response: Entradas, memoria usada, aciertos, fallos y desalojos
+        """
+        return Response(CacheRepresentaciones().estadisticas())
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def admision(self, request):
+        """
+        Endpoint para consultar el control de admisión del proceso.
+        Solo disponible para usuarios staff.
+        
+        Returns:
+            Response: Solicitudes en curso, admitidas, limitadas (429) y
+                descartadas (503) por clase, con sus límites
+        """
+        return Response({
+            "habilitada": getattr(settings, 'ADMISION_HABILITADA', False),
+            "clases": ControlAdmision().estadisticas(),
+        })
+
+    @action(detail=False, methods=['get'])
+    def cambios(self, request):
+        """
+        Endpoint de sincronización incremental: retorna los pedidos creados,
+        actualizados o eliminados después de un cursor del registro de cambios.
+        Cada pedido aparece una sola vez por página, con su último cambio;
+        las eliminaciones se informan como lápidas sin datos del pedido.
+        
+        Parámetros:
+            cursor: Última secuencia recibida (0 para sincronizar desde el inicio)
+            limite: Máximo de cambios leídos del registro (por defecto 500)
+        
+        Returns:
+            Response: Cambios, cursor siguiente e indicador de más páginas,
+                      o 410 si el cursor es anterior a los cambios retenidos
+        """
+        try:
+            cursor = int(request.query_params.get('cursor', 0))
+            limite = int(request.query_params.get('limite', 500))
+        except ValueError:
+            return Response(
+                {"error": "Los parámetros 'cursor' y 'limite' deben ser números enteros"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if cursor < 0 or limite <= 0:
+            return Response(
+                {"error": "Los parámetros 'cursor' y 'limite' deben ser positivos"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limite = min(limite, getattr(settings, 'CAMBIOS_MAX_LIMITE', 1000))
+        
+        primera = CambioPedido.objects.values_list('secuencia', flat=True).first()
+        if primera is not None and cursor < primera - 1:
+            return Response(
+                {"error": "El cursor es anterior a los cambios retenidos; sincronice desde el listado completo"},
+                status=status.HTTP_410_GONE
+            )
+        
+        registros = list(CambioPedido.objects.filter(secuencia__gt=cursor)[:limite + 1])
+        hay_mas = len(registros) > limite
+        registros = registros[:limite]
+        
+        # Compacta la página: solo el último cambio de cada pedido, en orden de secuencia
+        ultimos = {}
+        for cambio in registros:
+            ultimos.pop(cambio.pedido_id, None)
+            ultimos[cambio.pedido_id] = cambio
+        vigentes = PedidoCafe.objects.in_bulk([
+            pedido_id for pedido_id, cambio in ultimos.items()
+            if cambio.operacion != CambioPedido.ELIMINADO
+        ])
+        
+        cambios = []
+        for pedido_id, cambio in ultimos.items():
+            pedido = vigentes.get(pedido_id)
+            cambios.append({
+                "secuencia": cambio.secuencia,
+                "operacion": cambio.operacion,
+                "pedido_id": pedido_id,
+                "fecha": cambio.fecha,
+                # Un pedido eliminado en una página posterior llega sin datos y luego como lápida
+                "pedido": self._representar(pedido) if pedido is not None else None,
+            })
+        
+        return Response({
+            "cambios": cambios,
+            "cursor": registros[-1].secuencia if registros else cursor,
+            "hay_mas": hay_mas
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'ingesta/(?P<ticket>[0-9a-f]+)')
+    def estado_ingesta(self, request, ticket=None):
+        """
+        Endpoint para consultar el estado de un pedido en la cola de ingesta.
+        
+        Returns:
+            Response: Estado del ticket (en_cola, confirmado o error)
+        """
+        estado = ColaIngesta().obtener_estado(ticket)
+        if estado is None:
+            return Response(
+                {"error": f"Ticket '{ticket}' no encontrado"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(estado)
+
+    @action(detail=False, methods=['get'])
+    def archivo(self, request):
+        """
+        Endpoint para consultar pedidos archivados en frío por rango de fechas.
+        Lee directamente de los segmentos comprimidos sin restaurarlos.
+        
+        Parámetros:
+            desde, hasta: Rango de fechas (AAAA-MM-DD o ISO 8601)
+            limite: Máximo de pedidos (por defecto 1000, hasta ARCHIVO_MAX_LIMITE)
+        
+        Returns:
+            Response: Pedidos archivados dentro del rango solicitado
+        """
+        logger = Logger()
+        try:
+            desde = interpretar_fecha(request.query_params.get('desde'))
+            hasta = interpretar_fecha(request.query_params.get('hasta'), fin_de_dia=True)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limite = int(request.query_params.get('limite', 1000))
+        except ValueError:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser un número entero"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limite <= 0:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser positivo"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limite = min(limite, getattr(settings, 'ARCHIVO_MAX_LIMITE', 1000))
+        
+        pedidos = list(ArchivoPedidos().buscar_por_rango(desde, hasta, limite))
+        logger.registrar(f"API: Consultados {len(pedidos)} pedidos archivados")
+        
+        return Response({
+            "pedidos": pedidos,
+            "total": len(pedidos)
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'archivo/(?P<pedido_id>[0-9]+)')
+    def archivo_detalle(self, request, pedido_id=None):
+        """
+        Endpoint para obtener un pedido archivado por su id.
+        
+        Returns:
+            Response: Pedido archivado o 404 si no existe en el archivo
+        """
+        pedido = ArchivoPedidos().buscar_por_id(int(pedido_id))
+        if pedido is None:
+            return Response(
+                {"error": f"El pedido {pedido_id} no está archivado"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(pedido)
+
+class ClienteViewSet(viewsets.GenericViewSet):
+    """
+    ViewSet de solo lectura con el historial y los agregados de cada cliente.
+    El cliente se identifica por su nombre; se compara con la clave
+    normalizada (sin mayúsculas ni acentos) que usan los pedidos.
+    """
+    serializer_class = PedidoCafeSerializer
+    lookup_field = 'cliente'
+    lookup_value_regex = '[^/]+'
+
+    # Mismo formato de salida que GET /api/pedidos/{id}/, con su caché
+    _representar = PedidoCafeViewSet._representar
+
+    def dispatch(self, request, *args, **kwargs):
+        """Envía las lecturas a la réplica dentro de un span raíz para el trazado"""
+        with lecturas_en_replica(), Tracer().span(f"API {request.method} {request.path}"):
+            return super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def _respuesta_no_encontrado(cliente):
+        """Respuesta 404 para un cliente sin pedidos"""
+        return Response(
+            {"error": f"El cliente '{cliente}' no tiene pedidos"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    @staticmethod
+    def _datos_resumen(resumen):
+        """Convierte un ResumenCliente en la salida de la API"""
+        total = resumen.total_pedidos
+        return {
+            "total_pedidos": total,
+            "gasto_total": float(resumen.gasto_total),
+            "ticket_promedio": round(float(resumen.gasto_total) / total, 2) if total else 0.0,
+            "base_favorita": resumen.base_favorita(),
+            "pedidos_por_tipo": {
+                tipo: getattr(resumen, columna) for tipo, columna in ResumenCliente.COLUMNAS_TIPO.items()
+            },
+        }
+
+    def retrieve(self, request, cliente=None):
+        """
+        Obtiene los agregados de un cliente: pedidos, gasto total, ticket
+        promedio y café base favorito, mantenidos al escribir los pedidos.
+        
+        Returns:
+            Response: Resumen del cliente o 404 si no tiene pedidos
+        """
+        resumen = ResumenCliente.objects.filter(clave=normalizar_cliente(cliente)).first()
+        if resumen is None:
+            return self._respuesta_no_encontrado(cliente)
+        return Response({"cliente": resumen.cliente, **self._datos_resumen(resumen)})
+
+    @action(detail=True, methods=['get'])
+    def pedidos(self, request, cliente=None):
+        """
+        Endpoint con el historial de pedidos de un cliente, del más reciente
+        al más antiguo, paginado por cursor sobre el índice (cliente, fecha).
+        
+        Parámetros:
+            limite: Pedidos por página (por defecto 50)
+            despues: Cursor "siguiente" de la página anterior
+        
+        Returns:
+            Response: Resumen del cliente, pedidos de la página y cursor siguiente
+        """
+        try:
+            limite = int(request.query_params.get('limite', 50))
+        except ValueError:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser un número entero"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limite <= 0:
+            return Response(
+                {"error": "El parámetro 'limite' debe ser positivo"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limite = min(limite, getattr(settings, 'CLIENTES_MAX_LIMITE', 200))
+        
+        resumen = ResumenCliente.objects.filter(clave=normalizar_cliente(cliente)).first()
+        if resumen is None:
+            return self._respuesta_no_encontrado(cliente)
+        pedidos = PedidoCafe.objects.filter(cliente_busqueda=resumen.clave).order_by('-fecha', '-id')
+        
+        despues = request.query_params.get('despues')
+        if despues:
+            try:
+                fecha, pedido_id = self._leer_cursor(despues)
+            except ValueError:
+                return Response(
+                    {"error": "El parámetro 'despues' no es un cursor válido"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # fecha__lte acota el rango del índice; el resto desempata por id
+            pedidos = pedidos.filter(Q(fecha__lt=fecha) | Q(id__lt=pedido_id), fecha__lte=fecha)
+        
+        pagina = list(pedidos[:limite + 1])
+        siguiente = self._crear_cursor(pagina[limite - 1]) if len(pagina) > limite else None
+        pagina = pagina[:limite]
+        
+        return Response({
+            "cliente": resumen.cliente,
+            "resumen": self._datos_resumen(resumen),
+            "pedidos": [self._representar(pedido) for pedido in pagina],
+            "siguiente": siguiente,
+        })
+
+    @staticmethod
+    def _crear_cursor(pedido):
+        """Codifica la posición (fecha, id) del último pedido de una página"""
+        posicion = f"{pedido.fecha.isoformat()}|{pedido.id}"
+        return base64.urlsafe_b64encode(posicion.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _leer_cursor(cursor):
+        """
+        Decodifica un cursor creado por _crear_cursor.
+        
+        Returns:
+            tuple: (fecha, id) del último pedido de la página anterior
+        
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        try:
+            posicion = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise ValueError(cursor)
+        fecha, _, pedido_id = posicion.partition("|")
+        fecha = datetime.fromisoformat(fecha)
+        if timezone.is_naive(fecha) or not pedido_id.isdigit():
+            raise ValueError(cursor)
+        return fecha, int(pedido_id)